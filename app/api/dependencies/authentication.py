@@ -1,8 +1,7 @@
 from starlette.status import HTTP_403_FORBIDDEN
-from app.models.user_type_model import UserType
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from app.api.dependencies.db import get_db
+from app.api.dependencies.db import get_async_db
 from app.core.errors.error_strings import (
     AUTHENTICATION_REQUIRED,
     INACTIVE_USER_ERROR,
@@ -18,12 +17,15 @@ from app.core.settings.config import settings
 from app.models.user_model import User
 from app.repositories.user_repo import user_repo
 from app.core.services.jwt import get_id_from_token
+from app.core.services.principal_cache import acache_principal, aget_cached_principal
+from app.core.services.user_type_registry import user_type_registry
+from app.schemas.user_schema import Principal
 from fastapi import Depends, HTTPException, Security
 from fastapi.security import (
     APIKeyHeader as DefaultAPIKeyHeader,
 )
 from loguru import logger
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import requests
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
@@ -68,21 +70,29 @@ def _extract_jwt_from_header(
     return token
 
 
-def get_currently_authenticated_user(
+async def get_currently_authenticated_user(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(_extract_jwt_from_header),
-) -> User:
+) -> Principal:
     try:
         id = get_id_from_token(token)
-        user = user_repo.get(db, id=id)
-        check_if_user_is_valid(user)
+        principal = await aget_cached_principal(id)
+        if principal is None:
+            user = await user_repo.aget(db, id=id)
+            if not user:
+                raise InvalidTokenException(detail=MALFORMED_PAYLOAD)
+            user_type = await user_type_registry.aget_by_id(db, user.user_type_id)
+            if not user_type:
+                raise InvalidTokenException(detail=MALFORMED_PAYLOAD)
+            principal = await acache_principal(user, user_type_name=user_type.name)
+        check_if_user_is_valid(principal)
     except ValueError:
         raise InvalidTokenException(detail=MALFORMED_PAYLOAD)
-    return user
+    return principal
 
 
-def check_if_user_is_valid(user: User):
+def check_if_user_is_valid(user: Union[User, Principal]):
     if not user:
         raise InvalidTokenException(detail=MALFORMED_PAYLOAD)
     if not user.is_active:
@@ -93,11 +103,10 @@ class PermissionChecker:
     def __init__(self, *, allowed_user_types: List[str]):
         self.allowed_user_types = allowed_user_types
 
-    def __call__(self, user: User = Depends(get_currently_authenticated_user)):
-        current_user_type: UserType = user.user_type
-        if current_user_type.name not in self.allowed_user_types:
+    def __call__(self, user: Principal = Depends(get_currently_authenticated_user)):
+        if user.user_type_name not in self.allowed_user_types:
             logger.debug(
-                f"User with type {current_user_type.name} not in {self.allowed_user_types}"
+                f"User with type {user.user_type_name} not in {self.allowed_user_types}"
             )
             raise HTTPException(
                 status_code=HTTP_403_FORBIDDEN, detail=error_strings.UNAUTHORIZED_ACTION
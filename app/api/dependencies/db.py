@@ -1,8 +1,13 @@
-from app.database.session import SessionLocal
+from app.database.session import AsyncSessionLocal, SessionLocal
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
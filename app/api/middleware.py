@@ -0,0 +1,42 @@
+from loguru import logger
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database.query_counter import count_queries
+
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+
+class QueryCountMiddleware:
+    """Debug aid: report how many SQL statements each request ran, in the
+    X-Query-Count response header, and log requests that run more than
+    ``warn_above``. A plain ASGI middleware so the route runs in this
+    middleware's context and its statements land in the counter."""
+
+    def __init__(self, app: ASGIApp, *, warn_above: int) -> None:
+        self.app = app
+        self.warn_above = warn_above
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as counter:
+
+            async def send_with_count(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    # Statements issued after the response starts (background
+                    # tasks) are not reported.
+                    MutableHeaders(scope=message).append(
+                        QUERY_COUNT_HEADER, str(counter.count)
+                    )
+                    if counter.count > self.warn_above:
+                        logger.warning(
+                            f"{scope['method']} {scope['path']} ran "
+                            f"{counter.count} SQL statements"
+                        )
+                await send(message)
+
+            await self.app(scope, receive, send_with_count)
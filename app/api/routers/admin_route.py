@@ -0,0 +1,374 @@
+import datetime
+from collections import Counter
+from typing import List, Optional, Tuple, Type
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+from starlette.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    HTTP_503_SERVICE_UNAVAILABLE,
+)
+
+from app.api.dependencies.authentication import superuser_permission_dependency
+from app.api.dependencies.db import get_async_db
+from app.core.errors import error_strings
+from app.core.errors.exceptions import AlreadyExistsException
+from app.core.services.export import EXPORT_ENCODERS, EXPORT_MEDIA_TYPES
+from app.core.services.user_type_registry import user_type_registry
+from app.core.settings.config import settings
+from app.database.session import AsyncSessionLocal
+from app.repositories.document_repo import document_repo
+from app.repositories.document_ref_repo import document_ref_repo
+from app.repositories.user_repo import user_repo
+from app.schemas.admin_schema import BulkImportResult, RefPool, RefPoolStatus
+from app.schemas.document_schema import (
+    AttestedDocumentExport,
+    DocumentExport,
+    DocumentImport,
+)
+from app.schemas.user_schema import (
+    UserCreate,
+    UserCreateForm,
+    UserExport,
+    UserInResponse,
+    UserPage,
+    is_active_value,
+)
+from app.schemas.user_type_schema import UserTypeInDB
+from commonLib.ndjson import NDJSON_MEDIA_TYPE, LineModelType, parse_ndjson
+from commonLib.repositories.pagination import decode_cursor, paginate
+from commonLib.schemas.serializers import JSONSerializer
+
+
+router = APIRouter(dependencies=[Depends(superuser_permission_dependency)])
+
+user_page_serializer = JSONSerializer(UserPage)
+
+
+def ndjson_body(model: Type) -> dict:
+    """openapi_extra documenting an NDJSON request body of ``model`` lines."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {NDJSON_MEDIA_TYPE: {"schema": model.model_json_schema()}},
+        }
+    }
+
+
+def invalid_lines(errors: List[dict]) -> HTTPException:
+    return HTTPException(
+        status_code=HTTP_400_BAD_REQUEST,
+        detail={"message": error_strings.INVALID_IMPORT_LINES, "lines": errors},
+    )
+
+
+async def read_import(
+    request: Request, model: Type[LineModelType], *, max_rows: int
+) -> List[Tuple[int, LineModelType]]:
+    items, errors = parse_ndjson(await request.body(), model)
+    if errors:
+        raise invalid_lines(errors)
+    if not items:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail=error_strings.EMPTY_IMPORT
+        )
+    if len(items) > max_rows:
+        raise HTTPException(
+            status_code=HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=error_strings.IMPORT_TOO_LARGE.format(max_rows),
+        )
+    return items
+
+
+@router.post(
+    "/users/import",
+    response_model=BulkImportResult,
+    openapi_extra=ndjson_body(UserCreateForm),
+)
+async def import_users(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create users from an NDJSON body, one UserCreateForm per line.
+    Every line is validated before anything is written. Every password is
+    hashed within the request, so at most USER_IMPORT_MAX_ROWS lines are
+    taken at once.
+    """
+    items = await read_import(
+        request, UserCreateForm, max_rows=settings.USER_IMPORT_MAX_ROWS
+    )
+
+    user_types = {
+        user_type.name: user_type.id
+        for user_type in await user_type_registry.aget_all(db)
+    }
+    errors = [
+        {
+            "line": number,
+            "errors": [
+                {
+                    "loc": ["user_type"],
+                    "msg": error_strings.DOES_NOT_EXIST.format(user_in.user_type),
+                }
+            ],
+        }
+        for number, user_in in items
+        if user_in.user_type not in user_types
+    ]
+    if errors:
+        raise invalid_lines(errors)
+
+    emails = Counter(user_in.email for _, user_in in items)
+    taken = await user_repo.aget_existing_emails(db, emails=emails)
+    taken.update(email for email, count in emails.items() if count > 1)
+    if taken:
+        raise AlreadyExistsException(
+            entity_name="users with emails {}".format(", ".join(sorted(taken)))
+        )
+
+    users = await user_repo.acreate_many(
+        db,
+        objs_in=[
+            UserCreate(
+                **user_in.dict(exclude={"user_type"}),
+                user_type_id=user_types[user_in.user_type],
+            )
+            for _, user_in in items
+        ],
+        batch_size=settings.BULK_BATCH_SIZE,
+    )
+    return BulkImportResult(created=len(users), ids=[user.id for user in users])
+
+
+@router.post(
+    "/documents/import",
+    response_model=BulkImportResult,
+    openapi_extra=ndjson_body(DocumentImport),
+)
+async def import_documents(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create documents from an NDJSON body, one DocumentImport per line.
+    Every line is validated, and must name an existing user, before anything
+    is written.
+    """
+    items = await read_import(
+        request, DocumentImport, max_rows=settings.BULK_IMPORT_MAX_ROWS
+    )
+
+    known_users = await user_repo.aget_existing_ids(
+        db, ids=[document_in.user_id for _, document_in in items]
+    )
+    errors = [
+        {
+            "line": number,
+            "errors": [
+                {
+                    "loc": ["user_id"],
+                    "msg": error_strings.DOES_NOT_EXIST.format(document_in.user_id),
+                }
+            ],
+        }
+        for number, document_in in items
+        if document_in.user_id not in known_users
+    ]
+    if errors:
+        raise invalid_lines(errors)
+
+    documents = await document_repo.acreate_many(
+        db,
+        objs_in=[document_in for _, document_in in items],
+        batch_size=settings.BULK_BATCH_SIZE,
+    )
+    return BulkImportResult(
+        created=len(documents), ids=[document.id for document in documents]
+    )
+
+
+@router.get("/document_refs", response_model=RefPoolStatus)
+async def document_ref_pool(db: AsyncSession = Depends(get_async_db)):
+    """How many pre-allocated document refs are left unclaimed."""
+    return RefPoolStatus(available=await document_ref_repo.acount_available(db))
+
+
+@router.post("/document_refs/reserve", response_model=RefPool)
+async def reserve_document_refs(
+    count: int = Query(..., ge=1, le=settings.REF_RESERVE_MAX),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Pre-allocate ``count`` document refs ahead of a busy issuance day. Issuing
+    a ref then takes one from the pool instead of drawing a fresh one.
+    """
+    reserved = await document_ref_repo.areserve(
+        db,
+        count=count,
+        batch_size=settings.BULK_BATCH_SIZE,
+        attempts=settings.REF_ALLOCATION_ATTEMPTS,
+    )
+    if not reserved:
+        raise HTTPException(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            detail=error_strings.REF_ALLOCATION_FAILED,
+        )
+    return RefPool(
+        reserved=reserved, available=await document_ref_repo.acount_available(db)
+    )
+
+
+EXPORT_FORMAT = Query("ndjson", pattern="^(ndjson|csv)$")
+
+
+def export_response(
+    repo, query, schema, *, format: str, name: str
+) -> StreamingResponse:
+    async def rows():
+        # The stream outlives the request handler, so it holds its own session
+        # rather than the request-scoped one from get_async_db.
+        async with AsyncSessionLocal() as db:
+            async for row in repo.astream(
+                db, query, batch_size=settings.EXPORT_BATCH_SIZE
+            ):
+                yield row
+
+    body = EXPORT_ENCODERS[format](rows(), schema, chunk_rows=settings.EXPORT_BATCH_SIZE)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'},
+    )
+
+
+@router.get("/documents/export", response_class=StreamingResponse)
+async def export_documents(
+    format: str = EXPORT_FORMAT,
+    created_from: Optional[datetime.datetime] = None,
+    created_to: Optional[datetime.datetime] = None,
+    status: Optional[str] = None,
+):
+    """
+    Streams every document created in [created_from, created_to), optionally
+    with the given status, oldest first, as NDJSON or CSV.
+    """
+    query = document_repo.export_query(
+        created_from=created_from, created_to=created_to, status=status
+    )
+    return export_response(
+        document_repo, query, DocumentExport, format=format, name="documents"
+    )
+
+
+@router.get("/attested_documents/export", response_class=StreamingResponse)
+async def export_attested_documents(
+    format: str = EXPORT_FORMAT,
+    created_from: Optional[datetime.datetime] = None,
+    created_to: Optional[datetime.datetime] = None,
+):
+    """
+    Streams every attestation record created in [created_from, created_to),
+    oldest first, as NDJSON or CSV.
+    """
+    query = document_repo.attested_export_query(
+        created_from=created_from, created_to=created_to
+    )
+    return export_response(
+        document_repo,
+        query,
+        AttestedDocumentExport,
+        format=format,
+        name="attested_documents",
+    )
+
+
+async def user_listing_filters(
+    user_type: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    email_prefix: Optional[str] = None,
+    created_from: Optional[datetime.datetime] = None,
+    created_to: Optional[datetime.datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> List[ColumnElement]:
+    user_type_id = None
+    if user_type is not None:
+        registered = await user_type_registry.aget_by_name(db, user_type)
+        if registered is None:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=error_strings.DOES_NOT_EXIST.format("user type " + user_type),
+            )
+        user_type_id = registered.id
+    return user_repo.listing_filters(
+        user_type_id=user_type_id,
+        is_active=is_active,
+        email_prefix=email_prefix,
+        created_from=created_from,
+        created_to=created_to,
+    )
+
+
+@router.get("/users", response_model=UserPage)
+async def list_users(
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    filters: List[ColumnElement] = Depends(user_listing_filters),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Lists users newest first, one page at a time, optionally only those of
+    a user type (by name), active or inactive ones, those whose email starts
+    with email_prefix, or those created in [created_from, created_to).
+    Pass the returned next_cursor back as cursor to fetch the following page.
+    include_total=true adds the number of users matching the filters, at
+    the cost of a count query.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail=error_strings.INVALID_CURSOR
+        )
+    rows = await user_repo.aget_page(db, filters=filters, limit=limit, after=after)
+    users, next_cursor = paginate(rows, limit)
+    # aget_by_id also finds a type created since the snapshot was loaded;
+    # the foreign key on user_type_id means every one is found.
+    registered = {
+        user_type_id: await user_type_registry.aget_by_id(db, user_type_id)
+        for user_type_id in {user.user_type_id for user in users}
+    }
+    user_types = {
+        user_type_id: UserTypeInDB(id=user_type.id, name=user_type.name)
+        for user_type_id, user_type in registered.items()
+    }
+    total = await user_repo.acount(db, filters=filters) if include_total else None
+    return user_page_serializer.response(
+        UserPage(
+            items=[
+                UserInResponse(
+                    id=user.id,
+                    first_name=user.first_name,
+                    last_name=user.last_name,
+                    email=user.email,
+                    is_active=is_active_value(user.is_active),
+                    image=user.image,
+                    user_type=user_types[user.user_type_id],
+                )
+                for user in users
+            ],
+            next_cursor=next_cursor,
+            total=total,
+        )
+    )
+
+
+@router.get("/users/export", response_class=StreamingResponse)
+async def export_users(
+    format: str = EXPORT_FORMAT,
+    filters: List[ColumnElement] = Depends(user_listing_filters),
+):
+    """
+    Streams every user matching the /users filters, oldest first, as NDJSON
+    or CSV. Password hashes are never included.
+    """
+    query = user_repo.export_query(filters=filters)
+    return export_response(user_repo, query, UserExport, format=format, name="users")
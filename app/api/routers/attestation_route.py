@@ -16,11 +16,13 @@ from app.core.errors.exceptions import (
     DisallowedLoginException,
     IncorrectLoginException,
 )
+from app.core.services.object_store import image_url, inline_image, store_base64_image
 from app.repositories.attesatation_repo import attestation_repo
 
 from app.repositories.user_repo import user_repo
 from app.schemas.attestation_schema import (
     AttestationBase,
+    AttestationCreate,
     AttestationInResponse,
 )
 from app.schemas.user_schema import UserInLogin, UserWithToken
@@ -35,6 +37,24 @@ SUPERUSER_USER_TYPE = settings.SUPERUSER_USER_TYPE
 router = APIRouter()
 
 
+def store_attestation_images(attestation_in: AttestationBase) -> dict:
+    attestation_data = attestation_in.dict()
+    for field in ("signature", "stamp"):
+        if attestation_data[field] is not None:
+            attestation_data[field] = store_base64_image(attestation_data[field])
+    return attestation_data
+
+
+def attestation_response(attestation) -> AttestationInResponse:
+    return AttestationInResponse(
+        user_id=attestation.user_id,
+        signature=inline_image(attestation.signature),
+        stamp=inline_image(attestation.stamp),
+        signature_url=image_url(attestation.signature),
+        stamp_url=image_url(attestation.stamp),
+    )
+
+
 @router.post(
     "/attestation_create",
     name="Attestation Create",
@@ -47,22 +67,19 @@ def create_attestation(
 ):
     try:
         attestation_exist = attestation_repo.get_by_user_id(db, user_id=current_user.id)
+        attestation_data = store_attestation_images(attestation_in)
 
         if attestation_exist:
             new_attestation = attestation_repo.update(
-                db, db_obj=attestation_exist, obj_in=attestation_in
+                db, db_obj=attestation_exist, obj_in=attestation_data
             )
         else:
-            attestation_obj = AttestationInResponse(
-                user_id=current_user.id, **attestation_in.dict()
+            attestation_obj = AttestationCreate(
+                user_id=current_user.id, **attestation_data
             )
             new_attestation = attestation_repo.create(db, obj_in=attestation_obj)
 
-        return AttestationInResponse(
-            user_id=new_attestation.user_id,
-            signature=new_attestation.signature,
-            stamp=new_attestation.stamp,
-        )
+        return attestation_response(new_attestation)
     except Exception as e:
         raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
@@ -85,8 +102,4 @@ def get_attestation(
             detail="You do not have any signature or stamp saved",
         )
 
-    return AttestationInResponse(
-        user_id=attestation_exist.user_id,
-        signature=attestation_exist.signature,
-        stamp=attestation_exist.stamp,
-    )
+    return attestation_response(attestation_exist)
@@ -1,18 +1,22 @@
 from app.core.settings.config import settings
 from starlette.exceptions import HTTPException
 from starlette.status import HTTP_403_FORBIDDEN
-from app.api.dependencies.db import get_db
+from app.api.dependencies.db import get_async_db
 from app.core.errors import error_strings
 from app.core.errors.exceptions import (
     DisallowedLoginException,
     IncorrectLoginException,
+    ServiceUnavailableException,
 )
 
+from app.core.services.user_type_registry import user_type_registry
+from app.database.session import AsyncSessionLocal
 from app.repositories.user_repo import user_repo
-from app.schemas.user_schema import UserInLogin, UserWithToken
+from app.schemas.user_schema import UserInLogin, UserWithToken, is_active_value
 from app.schemas.user_type_schema import UserTypeInDB
-from fastapi import APIRouter, Body, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Body, Depends
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 SUPERUSER_USER_TYPE = settings.SUPERUSER_USER_TYPE
@@ -21,13 +25,25 @@ SUPERUSER_USER_TYPE = settings.SUPERUSER_USER_TYPE
 router = APIRouter()
 
 
+async def rehash_password(user_id: str, old_hash: str, password: str) -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            await user_repo.arehash_password(
+                db, user_id=user_id, old_hash=old_hash, password=password
+            )
+    except ServiceUnavailableException:
+        # Hashing pool is saturated; the next login will try again.
+        logger.info(f"Skipped password rehash for user {user_id}: hasher busy")
+
+
 @router.post(
     "/login",
     response_model=UserWithToken,
     name="Login",
 )
-def login(
-    db: Session = Depends(get_db),
+async def login(
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
     user_login: UserInLogin = Body(..., alias="user"),
 ) -> UserWithToken:
     """
@@ -35,9 +51,12 @@ def login(
     Only superusers,agent's managers and agent's supervisors are allowed to log in.
     """
 
-    user = user_repo.get_by_email(db, email=user_login.email)
+    # bcrypt runs in the hashing worker pool, off the event loop.
+    user, needs_rehash = await user_repo.aauthenticate(
+        db, email=user_login.email, password=user_login.password
+    )
 
-    if user is None or not user.verify_password(user_login.password):
+    if user is None:
         raise IncorrectLoginException()
 
     # if user.user_type.name not in [SUPERUSER_USER_TYPE]:
@@ -45,14 +64,25 @@ def login(
     #         status_code=HTTP_403_FORBIDDEN, detail=error_strings.UNAUTHORIZED_ACTION
     #     )
 
-    if not user.is_active:
+    if not is_active_value(user.is_active):
         raise DisallowedLoginException(detail=error_strings.INACTIVE_USER_ERROR)
 
+    if needs_rehash:
+        background_tasks.add_task(
+            rehash_password, user.id, user.hashed_password, user_login.password
+        )
+
+    user_type = await user_type_registry.aget_by_id(db, user.user_type_id)
+    if user_type is None:
+        logger.error(f"User {user.id} has unknown user type {user.user_type_id}")
+        raise DisallowedLoginException(
+            detail=error_strings.DOES_NOT_EXIST.format("this account's user type")
+        )
     token = user.generate_jwt()
     return UserWithToken(
         first_name=user.first_name,
         last_name=user.last_name,
         email=user.email,
         token=token,
-        user_type=UserTypeInDB(id=user.user_type_id, name=user.user_type.name),
+        user_type=UserTypeInDB(id=user_type.id, name=user_type.name),
     )
@@ -1,35 +1,53 @@
-import string
-import json
-import random
-from typing import List
-import qrcode
+from typing import List, Optional, Union
 from app.api.dependencies.authentication import (
     get_currently_authenticated_user,
     commissioner_permission_dependency,
 )
-from fastapi import APIRouter, HTTPException, Depends
-from starlette.status import HTTP_404_NOT_FOUND, HTTP_403_FORBIDDEN
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Query
+from starlette.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+    HTTP_403_FORBIDDEN,
+    HTTP_409_CONFLICT,
+    HTTP_503_SERVICE_UNAVAILABLE,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.models.document_model import DocumentStatus
 from app.repositories.document_repo import document_repo
+from app.repositories.document_ref_repo import document_ref_repo
+from app.core.errors import error_strings
 from app.core.errors.exceptions import (
     ObjectNotFoundException,
     UnauthorizedEndpointException,
 )
-from io import BytesIO
 import logging
 from app.api.dependencies.authentication import get_currently_authenticated_user
 
-from app.core.settings import security
+from app.core.services.object_store import (
+    discard_image,
+    image_url,
+    inline_image,
+    store_image,
+)
+from app.core.services.qr_renderer import render_qr_code
 from app.schemas.document_schema import (
     AttestDocument,
     AttestDocumentCreate,
     DocumentBase,
     DocumentCreate,
+    DocumentFields,
     DocumentInResponse,
-    DocumentQRCode,
+    DocumentSummary,
     DocumentUpdate,
+    DOCUMENT_FIELDS,
+    DOCUMENT_SUMMARY_FIELDS,
 )
-from app.api.dependencies.db import get_db
+from app.api.dependencies.db import get_async_db
+from app.core.settings.config import settings
+from commonLib.repositories.pagination import decode_cursor, paginate
+from commonLib.schemas.response_model import CursorPage
+from commonLib.schemas.serializers import JSONSerializer
 
 # Your own security module where convert_to_base_64 function resides
 # from your_security_module import convert_to_base_64
@@ -39,239 +57,326 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+document_serializer = JSONSerializer(DocumentInResponse)
+document_page_serializer = JSONSerializer(CursorPage[DocumentInResponse])
+summary_page_serializer = JSONSerializer(CursorPage[DocumentSummary])
+fields_page_serializer = JSONSerializer(CursorPage[DocumentFields])
 
-def generate_random_string(length: int) -> str:
-    try:
-        letters = string.ascii_lowercase
-        return "".join(random.sample(letters, length))
-    except Exception as e:
-        logger.error(f"Failed to generate random string: {e}")
-        raise HTTPException(status_code=400, detail="Failed to generate random string")
+
+def document_in_response(document) -> DocumentInResponse:
+    return DocumentInResponse(
+        id=document.id,
+        document=document.document,
+        template_name=document.template_name,
+        document_ref=document.document_ref,
+        user_id=document.user_id,
+        status=document.status,
+        document_data=document.document_data,
+        created_at=document.created_at,
+        qr_code=inline_image(document.qr_code),
+        qr_code_url=image_url(document.qr_code),
+    )
 
 
-def generate_qr_code(data: str) -> BytesIO:
+async def generate_qr_code(data: str) -> bytes:
     try:
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(data.upper())
-        qr.make(fit=True)
-        img = qr.make_image(fill="black", back_color="white")
-        buffered = BytesIO()
-        img.save(buffered)
-        return buffered
+        return await render_qr_code(data.upper())
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to generate QR code: {e}")
         raise HTTPException(status_code=400, detail="Failed to generate QR code")
 
 
-@router.post("/document_ref")
-def generate_document_ref(
-    document_id: str,
-    current_user=Depends(get_currently_authenticated_user),
-    db: Session = Depends(get_db),
-):
-    document = document_repo.get(db, id=document_id)
+async def ensure_own_document(db: AsyncSession, document_id: str, user_id: str):
+    """Raise the reason a transition on this document matched no row, if it
+    was a missing or foreign document; return the document otherwise."""
+    document = await document_repo.aget(db, id=document_id)
     if not document:
         raise ObjectNotFoundException(detail="this document was not found")
-    if document.user_id != current_user.id:
+    if document.user_id != user_id:
         raise UnauthorizedEndpointException(
             detail="You are not the creator of this document"
         )
+    return document
 
+
+def ensure_ref_can_be_issued(document) -> None:
     if document.document_ref:
-        raise UnauthorizedEndpointException(detail="This document already has a ref ID")
-    if document.status != "PAID":
+        raise UnauthorizedEndpointException(
+            detail="This document already has a ref ID"
+        )
+    if document.status != DocumentStatus.PAID.value:
         raise UnauthorizedEndpointException(
             detail="You cannot generate a document ref without payment"
         )
-    try:
-        document_ref = generate_random_string(9)
-        buffered = generate_qr_code(
-            f"https://qr-searchDocument/{document_ref.upper()}"
+
+
+async def release_ref(
+    db: AsyncSession, document_ref: str, qr_code: Optional[str] = None
+) -> None:
+    """Hand back a ref, and the QR code stored for it, that no document took."""
+    await document_ref_repo.arelease(db, ref=document_ref)
+    if qr_code is not None:
+        await run_in_threadpool(discard_image, qr_code)
+
+
+@router.post("/document_ref", response_model=DocumentInResponse)
+async def generate_document_ref(
+    document_id: str,
+    current_user=Depends(get_currently_authenticated_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Cheap checks first: a rejected request should neither use up a ref nor
+    # render a QR code. aissue_ref below still decides atomically.
+    document = await ensure_own_document(db, document_id, current_user.id)
+    ensure_ref_can_be_issued(document)
+
+    document_ref = await document_ref_repo.aallocate(
+        db, attempts=settings.REF_ALLOCATION_ATTEMPTS
+    )
+    if document_ref is None:
+        raise HTTPException(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            detail=error_strings.REF_ALLOCATION_FAILED,
         )
-        img_str = security.convert_to_base_64(buffered.getvalue())
-        document_repo.update(
-            db,
-            db_obj=document,
-            obj_in=DocumentQRCode(document_ref=document_ref.upper(), qr_code=img_str),
+    try:
+        qr_image = await generate_qr_code(
+            f"https://qr-searchDocument/{document_ref}"
         )
+        qr_code = await run_in_threadpool(store_image, qr_image)
+    except HTTPException:
+        await release_ref(db, document_ref)
+        raise
     except Exception as e:
-        print(e)
+        await release_ref(db, document_ref)
         logger.error(f"Failed to generate document reference: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
-    return DocumentInResponse(
-        id=document.id,
-        document=document.document,
-        template_name=document.template_name,
-        document_ref=document.document_ref,
-        user_id=document.user_id,
-        status=document.status,
-        document_data=json.loads(document.document_data),
-        created_at=document.created_at,
-        qr_code=document.qr_code,
+
+    issued = await document_repo.aissue_ref(
+        db,
+        document_id=document_id,
+        user_id=current_user.id,
+        document_ref=document_ref,
+        qr_code=qr_code,
     )
+    if not issued:
+        # Another request got there between the check and the update.
+        await release_ref(db, document_ref, qr_code)
+        await db.refresh(document)
+        ensure_ref_can_be_issued(document)
+        raise HTTPException(
+            status_code=HTTP_409_CONFLICT, detail=error_strings.DOCUMENT_CHANGED
+        )
+    return document_serializer.response(document_in_response(issued))
 
 
-@router.post("/create_document")
-def document_create(
+@router.post("/create_document", response_model=DocumentInResponse)
+async def document_create(
     document: DocumentBase,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_currently_authenticated_user),
 ):
     document_in = document.dict()
-    document_in["document_data"] = json.dumps(document_in["document_data"])
     document_in = dict(**document_in, user_id=current_user.id)
-    document_obj = document_repo.create(db, obj_in=document_in)
-    return document_obj
+    document_obj = await document_repo.acreate(db, obj_in=document_in)
+    return document_serializer.response(document_in_response(document_obj))
+
 
+def parse_document_fields(view: Optional[str], fields: Optional[str]):
+    if fields is not None:
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        if not requested:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST, detail=error_strings.NO_FIELDS
+            )
+        unknown = sorted(set(requested) - set(DOCUMENT_FIELDS))
+        if unknown:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=error_strings.UNKNOWN_FIELDS.format(", ".join(unknown)),
+            )
+        return requested
+    if view == "summary":
+        return list(DOCUMENT_SUMMARY_FIELDS)
+    return None
 
-@router.get("/my_documents")
-def get_documents(
-    db: Session = Depends(get_db),
+
+def select_document_fields(document, fields: List[str]) -> dict:
+    selected = {field: getattr(document, field) for field in fields}
+    if "qr_code" in selected:
+        selected["qr_code"] = inline_image(document.qr_code)
+        selected["qr_code_url"] = image_url(document.qr_code)
+    return selected
+
+
+@router.get(
+    "/my_documents",
+    response_model=Union[
+        CursorPage[DocumentInResponse],
+        CursorPage[DocumentSummary],
+        CursorPage[DocumentFields],
+    ],
+)
+async def get_documents(
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    view: Optional[str] = Query(None, pattern="^(full|summary)$"),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_currently_authenticated_user),
 ):
-    documents = document_repo.get_by_user(db, user_id=current_user.id)
-    return [
-        DocumentInResponse(
-            id=document.id,
-            document=document.document,
-            template_name=document.template_name,
-            document_ref=document.document_ref,
-            user_id=document.user_id,
-            status=document.status,
-            document_data=json.loads(document.document_data),
-            created_at=document.created_at,
-            qr_code=document.qr_code,
+    """
+    Returns the caller's documents newest first, one page at a time.
+    Pass the returned next_cursor back as cursor to fetch the following page.
+    Use view=summary, or fields=a,b,c, to fetch only those columns; the
+    document body, document data and QR code are then never read from the
+    database unless asked for.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST, detail=error_strings.INVALID_CURSOR
+        )
+    selected_fields = parse_document_fields(view, fields)
+    rows = await document_repo.aget_page_by_user(
+        db,
+        user_id=current_user.id,
+        limit=limit,
+        after=after,
+        status=status,
+        columns=selected_fields,
+    )
+    documents, next_cursor = paginate(rows, limit)
+    if view == "summary" and fields is None:
+        summaries = [
+            DocumentSummary(
+                id=document.id,
+                template_name=document.template_name,
+                status=document.status,
+                document_ref=document.document_ref,
+                created_at=document.created_at,
+            )
+            for document in documents
+        ]
+        return summary_page_serializer.response(
+            CursorPage[DocumentSummary](items=summaries, next_cursor=next_cursor)
         )
-        for document in documents
-    ]
+    if selected_fields is not None:
+        return fields_page_serializer.response(
+            CursorPage[DocumentFields](
+                items=[
+                    DocumentFields(**select_document_fields(document, selected_fields))
+                    for document in documents
+                ],
+                next_cursor=next_cursor,
+            )
+        )
+    items = [document_in_response(document) for document in documents]
+    return document_page_serializer.response(
+        CursorPage[DocumentInResponse](items=items, next_cursor=next_cursor)
+    )
 
 
-@router.get("/document")
-def get_document(
+@router.get("/document", response_model=DocumentInResponse)
+async def get_document(
     document_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_currently_authenticated_user),
 ):
-    document = document_repo.get(db, id=document_id)
+    document = await document_repo.aget(db, id=document_id)
     if not document:
         raise ObjectNotFoundException(detail="this document was not found")
     if document.user_id != current_user.id:
         raise UnauthorizedEndpointException(
             detail="You are not the creator of this document"
         )
-    return DocumentInResponse(
-        id=document.id,
-        document=document.document,
-        template_name=document.template_name,
-        document_ref=document.document_ref,
-        user_id=document.user_id,
-        status=document.status,
-        qr_code=document.qr_code,
-        document_data=json.loads(document.document_data),
-        created_at=document.created_at,
-    )
+    return document_serializer.response(document_in_response(document))
 
 
 @router.get("/pay_for_document")
-def pay_for_document(
+async def pay_for_document(
     document_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_currently_authenticated_user),
 ):
-    document = document_repo.get(db, id=document_id)
-    if not document:
-        raise ObjectNotFoundException(detail="this document was not found")
-    if document.user_id != current_user.id:
-        raise UnauthorizedEndpointException(
-            detail="You are not the creator of this document"
-        )
-    document_repo.update_field(
-        db, db_obj=document, field_name="status", field_value="PAID"
+    document = await document_repo.amark_paid(
+        db, document_id=document_id, user_id=current_user.id
     )
+    if not document:
+        # Paying for a document that is already paid for (or further along)
+        # is a no-op rather than a step back to PAID.
+        document = await ensure_own_document(db, document_id, current_user.id)
     return {"document_id": document.id}
 
 
 @router.post("/attest_document")
-def attest_document(
+async def attest_document(
     document_attest: AttestDocument,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_currently_authenticated_user),
 ):
-    document_attested = document_repo.get_attested_document(
-        db, document_ref=document_attest.document_ref
+    document = await document_repo.aattest(
+        db,
+        document_ref=document_attest.document_ref,
+        document=document_attest.document,
+        commissioner_id=current_user.id,
     )
-    if document_attested:
-        raise HTTPException(
-            status_code=HTTP_403_FORBIDDEN,
-            detail="This Document has already been attested",
-        )
-    document = document_repo.get_by_ref(db, ref=document_attest.document_ref)
     if not document:
-        raise ObjectNotFoundException(detail="this document was not found")
-    if document.status == "SAVED":
+        document = await document_repo.aget_by_ref(
+            db, ref=document_attest.document_ref
+        )
+        if not document:
+            raise ObjectNotFoundException(detail="this document was not found")
+        if document.status == DocumentStatus.ATTESTED:
+            raise HTTPException(
+                status_code=HTTP_403_FORBIDDEN,
+                detail="This Document has already been attested",
+            )
         raise UnauthorizedEndpointException(
             detail="You have to pay for this document to attest it"
         )
-    document_in = {"document": document_attest.document, "status": "ATTESTED"}
-    document_repo.update(db, db_obj=document, obj_in=document_in)
-    attest_document_in = {**document_attest.dict(), "commissioner_id": current_user.id}
-    document_repo.create_attested_document(db, obj_in=attest_document_in)
     return {"document_id": document.id}
 
 
 @router.get(
     "/search_by_ref",
+    response_model=DocumentInResponse,
     dependencies=[Depends(commissioner_permission_dependency)],
 )
-def search_document_by_ref(
+async def search_document_by_ref(
     document_ref: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_currently_authenticated_user),
 ):
     
     
-    document = document_repo.get_by_ref(db, ref=document_ref)
+    document = await document_repo.aget_by_ref(db, ref=document_ref)
     if not document:
         raise ObjectNotFoundException(detail="this document was not found")
 
-    return DocumentInResponse(
-        id=document.id,
-        document=document.document,
-        template_name=document.template_name,
-        document_ref=document.document_ref,
-        user_id=document.user_id,
-        status=document.status,
-        qr_code=document.qr_code,
-        document_data=json.loads(document.document_data),
-        created_at=document.created_at,
-    )
+    return document_serializer.response(document_in_response(document))
 
 
-@router.put("/document_update")
-def update_document(
+@router.put("/document_update", response_model=DocumentInResponse)
+async def update_document(
     document: DocumentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_currently_authenticated_user),
 ):
-    document_obj = document_repo.get(db, id=document.id)
+    document_obj = await document_repo.aget(db, id=document.id)
     if not document_obj:
         raise ObjectNotFoundException(detail="this document was not found")
     if document_obj.user_id != current_user.id:
         raise UnauthorizedEndpointException(
             detail="You are not the creator of this document"
         )
-    document_in = document.dict()
-    document_in["document_data"] = json.dumps(document_in["document_data"])
-    updated_document = document_repo.update(db, db_obj=document_obj, obj_in=document_in)
-
-    return DocumentInResponse(
-        id=updated_document.id,
-        document=updated_document.document,
-        template_name=updated_document.template_name,
-        document_ref=updated_document.document_ref,
-        user_id=updated_document.user_id,
-        status=updated_document.status,
-        qr_code=updated_document.qr_code,
-        document_data=json.loads(updated_document.document_data),
-        created_at=updated_document.created_at,
+    # Status and ref only change through the transitions above.
+    document_in = document.dict(exclude={"id", "user_id", "status", "document_ref"})
+    updated_document = await document_repo.aupdate(
+        db, db_obj=document_obj, obj_in=document_in
     )
+
+    return document_serializer.response(document_in_response(updated_document))
@@ -0,0 +1,22 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends
+
+from app.api.dependencies.authentication import superuser_permission_dependency
+from app.database.pool import pool_metrics
+
+
+router = APIRouter(dependencies=[Depends(superuser_permission_dependency)])
+
+
+@router.get(
+    "/db-pool",
+    name="Database Pool Metrics",
+    include_in_schema=False,
+)
+def get_db_pool_metrics() -> List[Dict[str, Any]]:
+    """
+    Internal, superuser-only endpoint exposing connection-pool counters for the sync and async
+    engines: checkout wait times, connections in use, overflow and timeouts.
+    """
+    return [metrics.snapshot() for metrics in pool_metrics.values()]
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import FileResponse
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from app.api.dependencies.authentication import get_currently_authenticated_user
+from app.api.dependencies.db import get_async_db
+from app.core.errors.exceptions import ObjectNotFoundException
+from app.core.services.object_store import is_object_key, object_store, sniff_media_type
+from app.core.settings.config import settings
+from app.repositories.attesatation_repo import attestation_repo
+from app.repositories.document_repo import document_repo
+from app.schemas.user_schema import Principal
+
+
+router = APIRouter()
+
+# Keys are content hashes, so an object can never change under its URL.
+OBJECT_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+async def can_read_object(db: AsyncSession, key: str, user: Principal) -> bool:
+    """The same people who can read the row holding the key: a document's QR
+    code is its owner's and, as with search by ref, any commissioner's; a
+    signature or stamp only its commissioner's."""
+    if user.user_type_name == settings.COMMISSIONER_USER_TYPE:
+        if await document_repo.ahas_qr_code(db, key=key):
+            return True
+    elif await document_repo.ahas_qr_code(db, key=key, user_id=user.id):
+        return True
+    return await attestation_repo.ahas_image(db, key=key, user_id=user.id)
+
+
+def read_head(path) -> bytes:
+    with open(path, "rb") as obj:
+        return obj.read(16)
+
+
+@router.get("/{key}", name="Get Object")
+async def get_object(
+    key: str,
+    request: Request,
+    current_user: Principal = Depends(get_currently_authenticated_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Streams a stored image (QR code, signature or stamp) by its content key.
+    Responds 304 when the client already holds the object. Objects the caller
+    may not see are reported as missing, so keys cannot be probed.
+    """
+    if not is_object_key(key) or not await can_read_object(db, key, current_user):
+        raise ObjectNotFoundException(detail="this object was not found")
+    path = object_store.path(key)
+    if path is None:
+        raise ObjectNotFoundException(detail="this object was not found")
+
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": OBJECT_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+    media_type = sniff_media_type(await run_in_threadpool(read_head, path))
+    return FileResponse(path, media_type=media_type, headers=headers)
@@ -5,6 +5,10 @@ from app.api.routers import (
     user_type_routes,
     attestation_route,
     document_route,
+    metrics_route,
+    object_route,
+    admin_route,
+    verify_route,
 )
 
 router = APIRouter()
@@ -19,6 +23,10 @@ router.include_router(
     attestation_route.router, tags=["Attestations"], prefix="/attestation"
 )
 router.include_router(document_route.router, tags=["Documents"], prefix="/document")
+router.include_router(metrics_route.router, tags=["Metrics"], prefix="/metrics")
+router.include_router(object_route.router, tags=["Objects"], prefix="/objects")
+router.include_router(admin_route.router, tags=["Admin"], prefix="/admin")
+router.include_router(verify_route.router, tags=["Verification"], prefix="/verify")
 
 
 
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.dependencies.authentication import get_currently_authenticated_user
-from app.api.dependencies.db import get_db
+from app.api.dependencies.db import get_async_db
 from app.core.errors.exceptions import AlreadyExistsException, ServerException
 from app.repositories.user_repo import user_repo
-from app.repositories.user_type_repo import user_type_repo
-from app.core.settings.config import Settings
+from app.core.services.user_type_registry import user_type_registry
+from app.core.settings.config import get_settings
 from app.schemas.user_schema import (
     UserCreate,
     UserInResponse,
@@ -13,18 +13,21 @@ from app.schemas.user_schema import (
     UserUpdate,
 )
 from app.schemas.user_type_schema import UserTypeInDB
+from commonLib.schemas.serializers import JSONSerializer
 
 
 router = APIRouter()
 
-settings = Settings()
+user_serializer = JSONSerializer(UserInResponse)
+
+settings = get_settings()
 COMMISSIONER_USER_TYPE = settings.COMMISSIONER_USER_TYPE
 REGULAR_USER_TYPE = settings.REGULAR_USER_TYPE
 VERIFIER_USER_TYPE = settings.VERIFIER_USER_TYPE
 
 
-def check_unique_user(db: Session, user_in: UserCreateForm):
-    user_with_same_email = user_repo.get_by_email(db, email=user_in.email)
+async def check_unique_user(db: AsyncSession, user_in: UserCreateForm):
+    user_with_same_email = await user_repo.aget_by_email(db, email=user_in.email)
     if user_with_same_email:
         raise AlreadyExistsException(
             entity_name="user with email {}".format(user_in.email)
@@ -44,40 +47,42 @@ def user_default(current_user=Depends(get_currently_authenticated_user)):
     return {"msg": "User default"}
 
 
-@router.post("/user_create")
-def user_create(
+@router.post("/user_create", response_model=UserInResponse)
+async def user_create(
     user_in: UserCreateForm,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    check_unique_user(db, user_in)
-    user_type = user_type_repo.get_by_name(db, name=REGULAR_USER_TYPE)
+    await check_unique_user(db, user_in)
+    user_type = await user_type_registry.aget_by_name(db, REGULAR_USER_TYPE)
 
     if not user_type:
         raise ServerException()
-    user = user_repo.create(
+    user = await user_repo.acreate(
         db,
         obj_in=UserCreate(**user_in.dict(), user_type_id=user_type.id),
     )
 
-    return UserInResponse(
-        id=user.id,
-        email=user_in.email,
-        first_name=user_in.first_name,
-        last_name=user_in.last_name,
-        is_active=user.is_active,
-        image=user.image,
-        user_type=UserTypeInDB(id=user_type.id, name=user_type.name),
+    return user_serializer.response(
+        UserInResponse(
+            id=user.id,
+            email=user_in.email,
+            first_name=user_in.first_name,
+            last_name=user_in.last_name,
+            is_active=user.is_active,
+            image=user.image,
+            user_type=UserTypeInDB(id=user_type.id, name=user_type.name),
+        )
     )
 
 
-@router.post("/user_update")
-def user_update(
+@router.post("/user_update", response_model=UserInResponse)
+async def user_update(
     user_in: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_currently_authenticated_user),
 ):
     # check_unique_user(db, user_in)
-    user_type = user_type_repo.get(db, id=current_user.user_type_id)
+    user_type = await user_type_registry.aget_by_id(db, current_user.user_type_id)
 
     if not user_type:
         raise ServerException()
@@ -85,68 +90,74 @@ def user_update(
     #     db,
     #     obj_in=UserCreate(**user_in.dict(), user_type_id=user_type.id),
     # )
-    user_obj = user_repo.get(db, id=current_user.id)
-    user_response = user_repo.update(db, db_obj=user_obj, obj_in=user_in)
-    return UserInResponse(
-        id=user_response.id,
-        email=user_response.email,
-        first_name=user_response.first_name,
-        last_name=user_response.last_name,
-        is_active=user_response.is_active,
-        image=user_response.image,
-        user_type=UserTypeInDB(id=user_type.id, name=user_type.name),
+    user_obj = await user_repo.aget(db, id=current_user.id)
+    user_response = await user_repo.aupdate(db, db_obj=user_obj, obj_in=user_in)
+    return user_serializer.response(
+        UserInResponse(
+            id=user_response.id,
+            email=user_response.email,
+            first_name=user_response.first_name,
+            last_name=user_response.last_name,
+            is_active=user_response.is_active,
+            image=user_response.image,
+            user_type=UserTypeInDB(id=user_type.id, name=user_type.name),
+        )
     )
 
 
-@router.post("/commissioner_create")
-def commissioner_create(
+@router.post("/commissioner_create", response_model=UserInResponse)
+async def commissioner_create(
     user_in: UserCreateForm,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    check_unique_user(db, user_in)
-    user_type = user_type_repo.get_by_name(db, name=COMMISSIONER_USER_TYPE)
+    await check_unique_user(db, user_in)
+    user_type = await user_type_registry.aget_by_name(db, COMMISSIONER_USER_TYPE)
 
     if not user_type:
         raise ServerException()
-    user = user_repo.create(
+    user = await user_repo.acreate(
         db,
         obj_in=UserCreate(**user_in.dict(), user_type_id=user_type.id),
     )
 
-    return UserInResponse(
-        id=user.id,
-        email=user_in.email,
-        first_name=user_in.first_name,
-        last_name=user_in.last_name,
-        is_active=user.is_active,
-        image=user.image,
-        user_type=UserTypeInDB(id=user_type.id, name=user_type.name),
+    return user_serializer.response(
+        UserInResponse(
+            id=user.id,
+            email=user_in.email,
+            first_name=user_in.first_name,
+            last_name=user_in.last_name,
+            is_active=user.is_active,
+            image=user.image,
+            user_type=UserTypeInDB(id=user_type.id, name=user_type.name),
+        )
     )
 
 
-@router.post("/verifier_create")
-def verifier_create(
+@router.post("/verifier_create", response_model=UserInResponse)
+async def verifier_create(
     user_in: UserCreateForm,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    check_unique_user(db, user_in)
-    user_type = user_type_repo.get_by_name(db, name=VERIFIER_USER_TYPE)
+    await check_unique_user(db, user_in)
+    user_type = await user_type_registry.aget_by_name(db, VERIFIER_USER_TYPE)
 
     if not user_type:
         raise ServerException()
-    user = user_repo.create(
+    user = await user_repo.acreate(
         db,
         obj_in=UserCreate(**user_in.dict(), user_type_id=user_type.id),
     )
 
-    return UserInResponse(
-        id=user.id,
-        email=user_in.email,
-        first_name=user_in.first_name,
-        last_name=user_in.last_name,
-        is_active=user.is_active,
-        image=user.image,
-        user_type=UserTypeInDB(id=user_type.id, name=user_type.name),
+    return user_serializer.response(
+        UserInResponse(
+            id=user.id,
+            email=user_in.email,
+            first_name=user_in.first_name,
+            last_name=user_in.last_name,
+            is_active=user.is_active,
+            image=user.image,
+            user_type=UserTypeInDB(id=user_type.id, name=user_type.name),
+        )
     )
 
 
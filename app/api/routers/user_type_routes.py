@@ -15,14 +15,16 @@ from app.core.errors.exceptions import (
 )
 from app.core.settings.config import settings
 from app.models.user_model import User
+from app.models.user_type_model import UserType
 
+from app.core.services.user_type_registry import user_type_registry
 from app.repositories.user_type_repo import user_type_repo
 
 from app.schemas.user_type_schema import UserTypeCreate, UserTypeInDB
 from app.schemas.user_schema import UserInResponse
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.core.errors import error_strings
 
 
@@ -85,6 +87,7 @@ def create_user_type(
         )
 
     user_type = user_type_repo.create(db, obj_in=user_type_in)
+    user_type_registry.refresh(db)
     return UserTypeInDB(id=user_type.id, name=user_type.name)
 
 
@@ -94,7 +97,7 @@ def create_user_type(
     # dependencies=[Depends(superuser_permission_dependency)],
 )
 def update_user_type(
-    user_type_id: int,
+    user_type_id: str,
     *,
     db: Session = Depends(get_db),
     user_type_in: UserTypeCreate,
@@ -128,6 +131,7 @@ def update_user_type(
     updated_user_type = user_type_repo.update(
         db, db_obj=target_user_type, obj_in=user_type_in
     )
+    user_type_registry.refresh(db)
     return UserTypeInDB(id=updated_user_type.id, name=updated_user_type.name)
 
 
@@ -137,7 +141,7 @@ def update_user_type(
     # dependencies=[Depends(superuser_permission_dependency)],
 )
 def delete_user_type(
-    user_type_id: int,
+    user_type_id: str,
     *,
     db: Session = Depends(get_db),
     # current_user: User = Depends(get_currently_authenticated_user),
@@ -158,13 +162,14 @@ def delete_user_type(
             detail=f"you can not delete user type {target_user_type.name} as it is a default user type",
         )
 
-    if len(target_user_type.users) > 0:
+    if user_type_repo.has_users(db, id=target_user_type.id):
         raise HTTPException(
             status_code=HTTP_400_BAD_REQUEST,
             detail="you can not delete this user type because it has users associated to it",
         )
 
     deleted_user_type = user_type_repo.remove(db, id=target_user_type.id)
+    user_type_registry.refresh(db)
     return UserTypeInDB(id=deleted_user_type.id, name=deleted_user_type.name)
 
 
@@ -172,21 +177,27 @@ def delete_user_type(
     "/{user_type_id}/all_users",
     # response_model=List[UserInResponse],
     # dependencies=[Depends(superuser_permission_dependency)],
+    deprecated=True,
 )
 def get_all_users_of_user_type(
-    user_type_id: int,
+    user_type_id: str,
     *,
     db: Session = Depends(get_db),
 ) -> List[UserInResponse]:
     """
     This endpoint gets all the users and agent under a particular user type.
     Only superusers have access to this endpoint.
+    It loads every user of the type at once; use the paginated
+    /admin/users?user_type=... listing instead.
     """
-    target_user_type = user_type_repo.get(db, id=user_type_id)
+    target_user_type = user_type_repo.get(
+        db, id=user_type_id, options=[selectinload(UserType.users)]
+    )
 
     if not target_user_type:
         raise ObjectNotFoundException()
 
+    user_type = UserTypeInDB(id=target_user_type.id, name=target_user_type.name)
     return [
         UserInResponse(
             id=user.id,
@@ -195,7 +206,8 @@ def get_all_users_of_user_type(
             address=user.address,
             email=user.email,
             is_active=user.is_active,
-            user_type=UserTypeInDB(id=user.user_type.id, name=user.user_type.name),
+            image=user.image,
+            user_type=user_type,
         )
         for user in target_user_type.users
     ]
@@ -207,7 +219,7 @@ def get_all_users_of_user_type(
 #     dependencies=[Depends(superuser_permission_dependency)],
 # )
 # def get_all_agent_of_user_type(
-#     user_type_id: int,
+#     user_type_id: str,
 #     *,
 #     db: Session = Depends(get_db),
 #     current_user: User = Depends(get_currently_authenticated_user),
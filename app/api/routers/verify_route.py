@@ -0,0 +1,86 @@
+import re
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from app.api.dependencies.db import get_async_db
+from app.core.errors.exceptions import ObjectNotFoundException
+from app.core.services.document_refs import is_valid_ref
+from app.core.services.verification_cache import (
+    acache_verification,
+    aget_cached_verification,
+)
+from app.core.services.verification_signing import verification_signer
+from app.core.settings.config import settings
+from app.repositories.document_repo import document_repo
+from app.schemas.document_schema import SignedDocumentVerification, VerificationKey
+from commonLib.schemas.serializers import JSONSerializer
+
+
+router = APIRouter()
+
+# Refs issued before check characters: nine letters.
+LEGACY_REF = re.compile(r"^[A-Z]{9}$")
+
+VERIFICATION_CACHE_CONTROL = f"public, max-age={settings.VERIFICATION_MAX_AGE_SECONDS}"
+
+verification_key_serializer = JSONSerializer(VerificationKey)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+@router.get(
+    "/signing-key", name="Verification Signing Key", response_model=VerificationKey
+)
+def get_signing_key():
+    """
+    The public key that checks the signature on every verification record:
+    an EdDSA JWT carrying the record's fields with iat and exp.
+    """
+    return Response(
+        verification_key_serializer.dumps(
+            VerificationKey(
+                algorithm=verification_signer.algorithm,
+                key_id=verification_signer.key_id,
+                public_key=verification_signer.public_key_pem,
+            )
+        ),
+        media_type="application/json",
+        headers={"Cache-Control": VERIFICATION_CACHE_CONTROL},
+    )
+
+
+@router.get(
+    "/{document_ref}",
+    name="Verify Document",
+    response_model=SignedDocumentVerification,
+)
+async def verify_document(
+    document_ref: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Public lookup behind an affidavit's QR code: the document's status and,
+    once attested, when and by which commissioner, signed by the server.
+    Responds 304 when the client's ETag is still current.
+    """
+    ref = document_ref.upper()
+    cached = await aget_cached_verification(ref)
+    if cached is None:
+        # A mistyped or made-up ref is turned away without a query.
+        if not (is_valid_ref(ref) or LEGACY_REF.match(ref)):
+            raise ObjectNotFoundException(detail="this document was not found")
+        record = await document_repo.aget_verification(db, ref=ref)
+        if record is None:
+            raise ObjectNotFoundException(detail="this document was not found")
+        cached = await acache_verification(record)
+
+    headers = {"ETag": cached.etag, "Cache-Control": VERIFICATION_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match", ""), cached.etag):
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(cached.body, media_type="application/json", headers=headers)
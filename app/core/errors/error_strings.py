@@ -8,4 +8,13 @@ DOES_NOT_EXIST = '{} does not exist'
 WRONG_TOKEN_PREFIX = "unsupported authorization type"
 UNAUTHORIZED_ACTION = "you can not perform this action"
 MALFORMED_PAYLOAD = "could not validate credentials"
-AUTHENTICATION_REQUIRED = "authentication required"
\ No newline at end of file
+AUTHENTICATION_REQUIRED = "authentication required"
+SERVICE_BUSY = "the server is busy, please try again shortly"
+INVALID_CURSOR = "invalid pagination cursor"
+UNKNOWN_FIELDS = "unknown fields: {}"
+NO_FIELDS = "fields must name at least one field"
+INVALID_IMPORT_LINES = "some lines could not be imported"
+IMPORT_TOO_LARGE = "at most {} rows can be imported at once"
+EMPTY_IMPORT = "nothing to import"
+DOCUMENT_CHANGED = "the document changed while the request was processed, please try again"
+REF_ALLOCATION_FAILED = "could not allocate a document ref, please try again"
@@ -7,6 +7,7 @@ from starlette.status import (
     HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
     HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_503_SERVICE_UNAVAILABLE,
 )
 
 
@@ -18,6 +19,20 @@ class ServerException(HTTPException):
         )
 
 
+class ServiceUnavailableException(HTTPException):
+    def __init__(
+        self,
+        status_code=HTTP_503_SERVICE_UNAVAILABLE,
+        detail=error_strings.SERVICE_BUSY,
+        headers=None,
+    ):
+        super().__init__(
+            status_code,
+            detail=detail,
+            headers=headers or {"Retry-After": "1"},
+        )
+
+
 class IncorrectLoginException(HTTPException):
     def __init__(
         self,
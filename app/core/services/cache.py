@@ -0,0 +1,26 @@
+from typing import Optional
+
+from app.core.settings.config import settings
+from commonLib.cache.backend import Cache
+from commonLib.cache.memory import MemoryCache
+from commonLib.cache.redis_backend import RedisCache
+
+CACHE_BACKENDS = ("memory", "redis")
+
+
+def make_cache(namespace: str, *, max_size: int, ttl: Optional[float] = None) -> Cache:
+    """The cache for one kind of entry, on the configured CACHE_BACKEND.
+
+    Use it for data that other workers can change, so that with the redis
+    backend their invalidations reach this one. ``max_size`` only bounds the
+    in-process backend. Caches of work that is merely expensive to redo
+    (token checks, QR renders) should stay a plain MemoryCache.
+    """
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCache(namespace=namespace, url=settings.CACHE_REDIS_URL, ttl=ttl)
+    if settings.CACHE_BACKEND != "memory":
+        raise ValueError(
+            f"CACHE_BACKEND must be one of {', '.join(CACHE_BACKENDS)}, "
+            f"not {settings.CACHE_BACKEND!r}"
+        )
+    return MemoryCache(max_size=max_size, ttl=ttl)
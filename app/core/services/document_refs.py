@@ -0,0 +1,44 @@
+"""
+Document reference numbers.
+
+A ref is REF_BODY_LENGTH characters from a CSPRNG plus one check character,
+all drawn from Crockford's base32 alphabet (no I, L, O or U, so refs read back
+unambiguously off paper). The check is Crockford's: the body's value mod 37.
+37 is prime, so every single mistyped character and every swap of two
+neighbouring ones changes it, and a mistyped ref can be rejected without a
+database lookup. Crockford spells check values 32-36 with extra symbols
+(*~$=U); bodies with those values are redrawn instead, which keeps refs to
+the plain alphabet at the cost of 5/37 of the space.
+
+Uniqueness is not decided here; see document_ref_repo.
+"""
+import secrets
+
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+REF_BODY_LENGTH = 8
+REF_LENGTH = REF_BODY_LENGTH + 1
+CHECK_MODULUS = 37
+
+_CODES = {character: code for code, character in enumerate(ALPHABET)}
+
+
+def _check_value(body: str) -> int:
+    value = 0
+    for character in body:
+        value = (value * len(ALPHABET) + _CODES[character]) % CHECK_MODULUS
+    return value
+
+
+def generate_ref() -> str:
+    while True:
+        body = "".join(secrets.choice(ALPHABET) for _ in range(REF_BODY_LENGTH))
+        check = _check_value(body)
+        if check < len(ALPHABET):
+            return body + ALPHABET[check]
+
+
+def is_valid_ref(ref: str) -> bool:
+    """Whether ``ref`` is well formed and its check character matches."""
+    if len(ref) != REF_LENGTH or any(character not in _CODES for character in ref):
+        return False
+    return _check_value(ref[:-1]) == _CODES[ref[-1]]
@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Callable, Dict, List, Type
+
+from pydantic import BaseModel
+
+from commonLib.ndjson import NDJSON_MEDIA_TYPE
+
+CSV_MEDIA_TYPE = "text/csv"
+
+EXPORT_MEDIA_TYPES = {"ndjson": NDJSON_MEDIA_TYPE, "csv": CSV_MEDIA_TYPE}
+
+
+async def _chunked(
+    rows: AsyncIterator[object], encode: Callable[[List[object]], bytes], chunk_rows: int
+) -> AsyncIterator[bytes]:
+    # One write per chunk rather than per row; only chunk_rows rows are held.
+    chunk: List[object] = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield encode(chunk)
+            chunk = []
+    if chunk:
+        yield encode(chunk)
+
+
+def ndjson_export(
+    rows: AsyncIterator[object], schema: Type[BaseModel], *, chunk_rows: int
+) -> AsyncIterator[bytes]:
+    """Encode ORM rows as NDJSON, one ``schema`` object per line."""
+
+    def encode(chunk: List[object]) -> bytes:
+        return b"".join(
+            schema.model_validate(row).model_dump_json().encode() + b"\n"
+            for row in chunk
+        )
+
+    return _chunked(rows, encode, chunk_rows)
+
+
+def csv_export(
+    rows: AsyncIterator[object], schema: Type[BaseModel], *, chunk_rows: int
+) -> AsyncIterator[bytes]:
+    """Encode ORM rows as CSV with a header of ``schema``'s fields. Nested
+    values (document_data) are written as JSON text."""
+    columns = list(schema.model_fields)
+
+    def csv_row(row: object) -> List[object]:
+        data: Dict[str, object] = schema.model_validate(row).model_dump(mode="json")
+        return [
+            json.dumps(data[column]) if isinstance(data[column], (dict, list)) else data[column]
+            for column in columns
+        ]
+
+    def encode(chunk: List[object]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(csv_row(row) for row in chunk)
+        return buffer.getvalue().encode()
+
+    async def with_header() -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(columns)
+        yield buffer.getvalue().encode()
+        async for chunk in _chunked(rows, encode, chunk_rows):
+            yield chunk
+
+    return with_header()
+
+
+EXPORT_ENCODERS = {"ndjson": ndjson_export, "csv": csv_export}
@@ -1,27 +1,49 @@
+import hashlib
 import time
 from datetime import datetime
+from typing import Tuple
 from app.core.errors.exceptions import InvalidTokenException
-from app.core.settings.config import Settings
+from app.core.settings.config import get_settings
+from commonLib.cache.memory import MemoryCache
 from pydantic import ValidationError
 
 import jwt
 
 
-settings = Settings()
+settings = get_settings()
 
 JWT_ALGORITHM = settings.JWT_ALGORITHM
 SECRET_KEY = settings.SECRET_KEY
 
+# Maps sha256(token) -> (user id, exp). Each entry lives until the token
+# itself expires, so a repeat request skips the HMAC check and JSON parse.
+verified_token_cache = MemoryCache(max_size=settings.JWT_CACHE_MAX_SIZE)
 
-def get_id_from_token(token: str) -> int:
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def decode_token(token: str) -> Tuple[str, float]:
     try:
         decoded_payload = jwt.decode(token, str(SECRET_KEY), algorithms=[JWT_ALGORITHM])
         if decoded_payload["exp"] <= datetime.now().timestamp():
             raise InvalidTokenException(detail="token has expired.")
-        return decoded_payload["id"]
+        return decoded_payload["id"], decoded_payload["exp"]
     except jwt.PyJWTError as decode_error:
         raise ValueError("unable to decode JWT token") from decode_error
     except KeyError as decode_error:
         raise ValueError("unable to decode JWT token") from decode_error
     except ValidationError as validation_error:
         raise ValueError("malformed payload in token") from validation_error
+
+
+def get_id_from_token(token: str) -> str:
+    digest = _token_digest(token)
+    cached = verified_token_cache.get(digest)
+    if cached is not None:
+        return cached[0]
+
+    id, exp = decode_token(token)
+    verified_token_cache.set(digest, (id, exp), ttl=exp - time.time())
+    return id
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from app.core.settings import security
+from app.core.settings.config import settings
+
+
+OBJECT_KEY_REGEX = re.compile("^[0-9a-f]{64}$")
+OBJECT_STORE_MODE = "object_store"
+
+
+def is_object_key(value: Optional[str]) -> bool:
+    return bool(value) and bool(OBJECT_KEY_REGEX.match(value))
+
+
+def sniff_media_type(head: bytes) -> str:
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.lstrip().startswith((b"<?xml", b"<svg")):
+        return "image/svg+xml"
+    return "application/octet-stream"
+
+
+class LocalObjectStore:
+    """Content-addressed blob store on the local filesystem.
+
+    Objects are keyed by the sha256 of their bytes, so they are immutable,
+    deduplicated and safe to cache forever under their key.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def put(self, data: bytes) -> str:
+        key = hashlib.sha256(data).hexdigest()
+        path = self._path(key)
+        if path.exists():
+            return key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers never observe a partial object.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return key
+
+    def delete(self, key: str) -> None:
+        """Remove an object. Only for keys no row refers to: identical bytes
+        stored for someone else share the key."""
+        path = self.path(key)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def path(self, key: str) -> Optional[Path]:
+        if not is_object_key(key):
+            return None
+        path = self._path(key)
+        return path if path.is_file() else None
+
+
+object_store = LocalObjectStore(Path(settings.OBJECT_STORE_PATH))
+
+
+def store_image(data: bytes) -> str:
+    """Return the column value for ``data`` under the configured storage mode."""
+    if settings.BINARY_STORAGE_MODE == OBJECT_STORE_MODE:
+        return object_store.put(data)
+    return security.convert_to_base_64(data)
+
+
+def store_base64_image(value: str) -> str:
+    if settings.BINARY_STORAGE_MODE == OBJECT_STORE_MODE:
+        return object_store.put(security.convert_to_image(value))
+    return value
+
+
+def discard_image(value: Optional[str]) -> None:
+    """Undo store_image for a value that was never saved to any row."""
+    if is_object_key(value):
+        object_store.delete(value)
+
+
+def inline_image(value: Optional[str]) -> Optional[str]:
+    """The base64 payload of a column value, or None if it lives in the object store."""
+    return None if is_object_key(value) else value
+
+
+def image_url(value: Optional[str]) -> Optional[str]:
+    if not is_object_key(value):
+        return None
+    return f"{settings.API_URL_PREFIX}/objects/{value}"
@@ -0,0 +1,31 @@
+"""
+Recommend a BCRYPT_ROUNDS value for the current host.
+
+    python -m app.core.services.password_calibration [--target-ms 250]
+
+Run it on the production instance type: bcrypt cost is exponential in
+rounds, so the answer depends on the CPU.
+"""
+import argparse
+
+from app.core.settings.config import settings
+from app.core.settings.security import BCRYPT_ROUNDS, calibrate_bcrypt_rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recommend a BCRYPT_ROUNDS value.")
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=settings.BCRYPT_TARGET_VERIFY_MS,
+        help="latency budget for a single password verify",
+    )
+    args = parser.parse_args()
+
+    rounds = calibrate_bcrypt_rounds(args.target_ms)
+    print(f"configured BCRYPT_ROUNDS={BCRYPT_ROUNDS}")
+    print(f"recommended BCRYPT_ROUNDS={rounds} for a {args.target_ms:g}ms budget")
+
+
+if __name__ == "__main__":
+    main()
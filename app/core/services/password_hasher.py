@@ -0,0 +1,29 @@
+from typing import Tuple
+
+from app.core.services.worker_pool import BoundedProcessPool
+from app.core.settings import security
+from app.core.settings.config import settings
+
+
+password_hasher_pool = BoundedProcessPool(
+    max_workers=settings.PASSWORD_HASHER_WORKERS,
+    max_in_flight=settings.PASSWORD_HASHER_MAX_IN_FLIGHT,
+)
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher_pool.run(security.get_password_hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher_pool.run(
+        security.verify_password, plain_password, hashed_password
+    )
+
+
+async def verify_password_and_check_rehash(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, bool]:
+    return await password_hasher_pool.run(
+        security.verify_password_and_check_rehash, plain_password, hashed_password
+    )
@@ -0,0 +1,36 @@
+from typing import Optional
+
+from app.core.services.cache import make_cache
+from app.core.settings.config import settings
+from app.models.user_model import User
+from app.schemas.user_schema import Principal
+
+
+principal_cache = make_cache(
+    "principal",
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+async def aget_cached_principal(user_id: str) -> Optional[Principal]:
+    return await principal_cache.aget(user_id)
+
+
+async def acache_principal(user: User, *, user_type_name: str) -> Principal:
+    principal = Principal(
+        id=user.id,
+        is_active=user.is_active,
+        user_type_id=user.user_type_id,
+        user_type_name=user_type_name,
+    )
+    await principal_cache.aset(user.id, principal)
+    return principal
+
+
+def invalidate_principal(user_id: str) -> None:
+    principal_cache.delete(user_id)
+
+
+async def ainvalidate_principal(user_id: str) -> None:
+    await principal_cache.adelete(user_id)
@@ -0,0 +1,83 @@
+import hashlib
+from io import BytesIO
+from typing import NamedTuple
+
+from app.core.services.worker_pool import BoundedProcessPool
+from app.core.settings.config import settings
+from commonLib.cache.memory import MemoryCache
+
+
+ERROR_CORRECTION_LEVELS = ("L", "M", "Q", "H")
+IMAGE_FORMATS = ("PNG", "SVG")
+MEDIA_TYPES = {"PNG": "image/png", "SVG": "image/svg+xml"}
+
+
+class QRRenderOptions(NamedTuple):
+    image_format: str = "PNG"
+    box_size: int = 10
+    border: int = 5
+    error_correction: str = "M"
+
+
+default_qr_options = QRRenderOptions(
+    image_format=settings.QR_IMAGE_FORMAT.upper(),
+    box_size=settings.QR_BOX_SIZE,
+    border=settings.QR_BORDER,
+    error_correction=settings.QR_ERROR_CORRECTION.upper(),
+)
+
+qr_render_pool = BoundedProcessPool(
+    max_workers=settings.QR_RENDER_WORKERS,
+    max_in_flight=settings.QR_RENDER_MAX_IN_FLIGHT,
+)
+
+# Content addressed: the key covers the payload and every render option,
+# so identical requests are served from memory and never rendered twice.
+qr_render_cache = MemoryCache(max_size=settings.QR_RENDER_CACHE_SIZE)
+
+
+def render_qr_image(data: str, options: QRRenderOptions) -> bytes:
+    """Render ``data`` as a QR image. Runs inside a worker process."""
+    # qrcode and PIL are imported here, in the render worker, so the web
+    # process never loads them.
+    import qrcode
+    import qrcode.image.svg
+    from qrcode import constants
+
+    if options.image_format not in IMAGE_FORMATS:
+        raise ValueError(f"unsupported QR image format {options.image_format}")
+    if options.error_correction not in ERROR_CORRECTION_LEVELS:
+        raise ValueError(f"unsupported QR error correction {options.error_correction}")
+    qr = qrcode.QRCode(
+        version=1,
+        box_size=options.box_size,
+        border=options.border,
+        error_correction=getattr(constants, "ERROR_CORRECT_" + options.error_correction),
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    buffered = BytesIO()
+    if options.image_format == "SVG":
+        img = qr.make_image(image_factory=qrcode.image.svg.SvgImage)
+    else:
+        img = qr.make_image(fill="black", back_color="white")
+    img.save(buffered)
+    return buffered.getvalue()
+
+
+def qr_cache_key(data: str, options: QRRenderOptions) -> str:
+    digest = hashlib.sha256()
+    digest.update(repr(tuple(options)).encode("utf-8"))
+    digest.update(data.encode("utf-8"))
+    return digest.hexdigest()
+
+
+async def render_qr_code(
+    data: str, options: QRRenderOptions = default_qr_options
+) -> bytes:
+    key = qr_cache_key(data, options)
+    image = qr_render_cache.get(key)
+    if image is None:
+        image = await qr_render_pool.run(render_qr_image, data, options)
+        qr_render_cache.set(key, image)
+    return image
@@ -0,0 +1,121 @@
+import time
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, NamedTuple, Optional
+
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.settings.config import settings
+from app.database.session import AsyncSessionLocal
+from app.repositories.user_type_repo import user_type_repo
+
+
+class RegisteredUserType(NamedTuple):
+    id: str
+    name: str
+
+
+class _Snapshot(NamedTuple):
+    by_id: Mapping[str, RegisteredUserType]
+    by_name: Mapping[str, RegisteredUserType]
+    loaded_at: float
+
+
+class UserTypeRegistry:
+    """Every user type, by id and by name, held in memory.
+
+    User types are a handful of rows that almost never change, so routes look
+    them up here instead of querying. Lookups read an immutable snapshot that
+    a refresh replaces whole, so they need no lock.
+
+    The snapshot is loaded at startup and reloaded after every write made
+    through the user type routes. Other workers pick up those writes when a
+    lookup misses or their snapshot is older than ``max_age`` seconds. Either
+    way a worker reloads at most once per ``min_refresh_interval``, so lookups
+    of names that do not exist cannot hammer the database. An id missed
+    inside that interval is looked up on its own instead: ids come from
+    user rows, so a miss means a type created since the last reload.
+    """
+
+    def __init__(self, *, max_age: float, min_refresh_interval: float) -> None:
+        self.max_age = max_age
+        self.min_refresh_interval = min_refresh_interval
+        self._snapshot = _Snapshot(
+            MappingProxyType({}), MappingProxyType({}), float("-inf")
+        )
+        self._refresh_started_at = float("-inf")
+
+    def load(self, user_types: Iterable) -> None:
+        entries = [
+            RegisteredUserType(id=str(user_type.id), name=user_type.name)
+            for user_type in user_types
+        ]
+        self._snapshot = _Snapshot(
+            by_id=MappingProxyType({entry.id: entry for entry in entries}),
+            by_name=MappingProxyType({entry.name: entry for entry in entries}),
+            loaded_at=time.monotonic(),
+        )
+
+    def refresh(self, db: Session) -> None:
+        self._refresh_started_at = time.monotonic()
+        self.load(user_type_repo.get_all(db))
+
+    async def arefresh(self, db: AsyncSession) -> None:
+        self._refresh_started_at = time.monotonic()
+        self.load(await user_type_repo.aget_all(db))
+
+    async def _arefresh_if(self, db: AsyncSession, needed: bool) -> None:
+        now = time.monotonic()
+        stale = now - self._snapshot.loaded_at > self.max_age
+        if (needed or stale) and (
+            now - self._refresh_started_at >= self.min_refresh_interval
+        ):
+            await self.arefresh(db)
+
+    def _add(self, user_type) -> RegisteredUserType:
+        entry = RegisteredUserType(id=str(user_type.id), name=user_type.name)
+        snapshot = self._snapshot
+        self._snapshot = _Snapshot(
+            by_id=MappingProxyType({**snapshot.by_id, entry.id: entry}),
+            by_name=MappingProxyType({**snapshot.by_name, entry.name: entry}),
+            loaded_at=snapshot.loaded_at,
+        )
+        return entry
+
+    async def aget_by_id(self, db: AsyncSession, id: str) -> Optional[RegisteredUserType]:
+        id = str(id)
+        await self._arefresh_if(db, id not in self._snapshot.by_id)
+        entry = self._snapshot.by_id.get(id)
+        if entry is None:
+            user_type = await user_type_repo.aget(db, id)
+            if user_type is not None:
+                entry = self._add(user_type)
+        return entry
+
+    async def aget_by_name(
+        self, db: AsyncSession, name: str
+    ) -> Optional[RegisteredUserType]:
+        await self._arefresh_if(db, name not in self._snapshot.by_name)
+        return self._snapshot.by_name.get(name)
+
+    async def aget_all(self, db: AsyncSession) -> List[RegisteredUserType]:
+        await self._arefresh_if(db, False)
+        return list(self._snapshot.by_id.values())
+
+
+user_type_registry = UserTypeRegistry(
+    max_age=settings.USER_TYPE_REGISTRY_MAX_AGE_SECONDS,
+    min_refresh_interval=settings.USER_TYPE_REGISTRY_MIN_REFRESH_SECONDS,
+)
+
+
+async def load_user_type_registry() -> None:
+    """Startup hook. A database that is down or not migrated yet only delays
+    the load to the first lookup, rather than failing the worker."""
+    try:
+        async with AsyncSessionLocal() as db:
+            await user_type_registry.arefresh(db)
+    except SQLAlchemyError as e:
+        logger.warning(f"User types not preloaded, loading on first use: {e}")
@@ -0,0 +1,48 @@
+import hashlib
+from typing import NamedTuple, Optional
+
+from app.core.services.cache import make_cache
+from app.core.services.verification_signing import verification_signer
+from app.core.settings.config import settings
+from app.schemas.document_schema import (
+    DocumentVerification,
+    SignedDocumentVerification,
+)
+from commonLib.schemas.serializers import JSONSerializer
+
+
+class CachedVerification(NamedTuple):
+    etag: str
+    body: bytes
+
+
+verification_serializer = JSONSerializer(SignedDocumentVerification)
+
+# ref -> the signed, encoded /verify response. Repeat scans of the same
+# affidavit are served from here without touching the database or re-signing.
+verification_cache = make_cache(
+    "verification",
+    max_size=settings.VERIFICATION_CACHE_MAX_SIZE,
+    ttl=settings.VERIFICATION_CACHE_TTL_SECONDS,
+)
+
+
+async def aget_cached_verification(ref: str) -> Optional[CachedVerification]:
+    return await verification_cache.aget(ref)
+
+
+async def acache_verification(record: DocumentVerification) -> CachedVerification:
+    signature = verification_signer.sign(record.model_dump(mode="json"))
+    body = verification_serializer.dumps(
+        SignedDocumentVerification(**record.model_dump(), signature=signature)
+    )
+    cached = CachedVerification(
+        etag='"{}"'.format(hashlib.sha256(body).hexdigest()[:32]), body=body
+    )
+    await verification_cache.aset(record.ref, cached)
+    return cached
+
+
+async def ainvalidate_verification(ref: Optional[str]) -> None:
+    if ref:
+        await verification_cache.adelete(ref)
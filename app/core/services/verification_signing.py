@@ -0,0 +1,72 @@
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from loguru import logger
+
+from app.core.settings.config import settings
+
+
+class VerificationSigner:
+    """Signs /verify records with a key of their own.
+
+    Ed25519 rather than the HMAC key behind auth tokens: anyone holding the
+    public half, served at /verify/signing-key, can check a record, and
+    nothing a verifier holds can mint a token. Every signature carries iat
+    and exp, so a stale printout or forwarded record stops checking out.
+    """
+
+    algorithm = "EdDSA"
+
+    def __init__(self, private_key_pem: Optional[str], ttl_seconds: int) -> None:
+        if private_key_pem:
+            # .env values are one line; accept the PEM with \n escapes.
+            self._private_key = serialization.load_pem_private_key(
+                private_key_pem.replace("\\n", "\n").encode(), password=None
+            )
+            if not isinstance(self._private_key, Ed25519PrivateKey):
+                raise ValueError("VERIFICATION_SIGNING_KEY must be an Ed25519 key")
+        else:
+            logger.warning(
+                "VERIFICATION_SIGNING_KEY is not set; signing /verify records with "
+                "a key generated for this process only"
+            )
+            self._private_key = Ed25519PrivateKey.generate()
+        self.ttl_seconds = ttl_seconds
+        self.public_key_pem = (
+            self._private_key.public_key()
+            .public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+            .decode()
+        )
+        self.key_id = hashlib.sha256(self.public_key_pem.encode()).hexdigest()[:16]
+
+    def sign(self, claims: Dict[str, Any]) -> str:
+        now = int(time.time())
+        return jwt.encode(
+            {**claims, "iat": now, "exp": now + self.ttl_seconds},
+            self._private_key,
+            algorithm=self.algorithm,
+            headers={"kid": self.key_id},
+        )
+
+    def verify(self, signature: str) -> Dict[str, Any]:
+        """The signed claims; raises jwt.PyJWTError if the signature is bad
+        or expired."""
+        return jwt.decode(
+            signature,
+            self.public_key_pem,
+            algorithms=[self.algorithm],
+            options={"require": ["iat", "exp"]},
+        )
+
+
+verification_signer = VerificationSigner(
+    settings.VERIFICATION_SIGNING_KEY,
+    ttl_seconds=settings.VERIFICATION_SIGNATURE_TTL_SECONDS,
+)
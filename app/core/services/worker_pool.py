@@ -0,0 +1,79 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.core.errors.exceptions import ServiceUnavailableException
+
+
+class BoundedProcessPool:
+    """A lazily started process pool with an async API and a bounded queue.
+
+    At most ``max_in_flight`` jobs may be queued or running at once. Beyond
+    that, ``run`` fails fast with a 503 so a burst of CPU-heavy requests is
+    shed instead of stalling every other endpoint behind it.
+    """
+
+    def __init__(self, *, max_workers: int, max_in_flight: int) -> None:
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn rather than fork: the parent runs an event loop and
+                # threadpool whose state must not leak into the workers.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                raise ServiceUnavailableException()
+            self._in_flight += 1
+
+    def _release(self, _: Optional[Future] = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run the picklable ``fn(*args)`` in a worker process."""
+        self._acquire()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            self._release()
+            self._reset()
+            raise ServiceUnavailableException()
+        except BaseException:
+            self._release()
+            raise
+        # The slot is held until the worker finishes, even if the awaiting
+        # request is cancelled, so the bound reflects real CPU work.
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._reset()
+            raise ServiceUnavailableException()
+
+    def _reset(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        self._reset()
@@ -28,6 +28,76 @@ class Settings(BaseSettings):
     SUPERUSER_USER_TYPE:str
     COMMISSIONER_USER_TYPE:str
     VERIFIER_USER_TYPE:str
+    DB_POOL_SIZE:int = 5
+    DB_POOL_MAX_OVERFLOW:int = 10
+    DB_POOL_RECYCLE_SECONDS:int = 1800
+    DB_POOL_TIMEOUT_SECONDS:int = 30
+    DB_POOL_USE_LIFO:bool = False
+    DB_POOL_PRE_PING:bool = True
+    # Used when DB_POOL_PRE_PING is off: a checked-out connection is only
+    # pinged if it has been idle longer than this. 0 disables the check.
+    DB_POOL_LIVENESS_INTERVAL_SECONDS:int = 0
+    # "memory" keeps each cache in its own worker; "redis" shares the ones
+    # built by make_cache through CACHE_REDIS_URL (install the redis extra).
+    CACHE_BACKEND:str = "memory"
+    CACHE_REDIS_URL:str = "redis://localhost:6379/0"
+    PRINCIPAL_CACHE_MAX_SIZE:int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS:int = 30
+    JWT_CACHE_MAX_SIZE:int = 10000
+    PASSWORD_HASHER_WORKERS:int = 2
+    PASSWORD_HASHER_MAX_IN_FLIGHT:int = 64
+    # Pick with `python -m app.core.services.password_calibration`; stored
+    # hashes with a different cost are rehashed on the next login.
+    BCRYPT_ROUNDS:int = 12
+    BCRYPT_TARGET_VERIFY_MS:int = 250
+    QR_IMAGE_FORMAT:str = "PNG"
+    QR_BOX_SIZE:int = 10
+    QR_BORDER:int = 5
+    QR_ERROR_CORRECTION:str = "M"
+    QR_RENDER_WORKERS:int = 1
+    QR_RENDER_MAX_IN_FLIGHT:int = 32
+    QR_RENDER_CACHE_SIZE:int = 1024
+    # "inline" keeps base64 in the image columns; "object_store" writes the
+    # bytes under OBJECT_STORE_PATH and stores only their content hash.
+    BINARY_STORAGE_MODE:str = "inline"
+    OBJECT_STORE_PATH:str = "object_store"
+    DEFAULT_PAGE_SIZE:int = 20
+    MAX_PAGE_SIZE:int = 100
+    BULK_BATCH_SIZE:int = 500
+    BULK_IMPORT_MAX_ROWS:int = 10000
+    # Each imported user is a bcrypt hash on the shared hashing pool, so a
+    # user import holds its request, and delays logins, for about
+    # rows * hash time / PASSWORD_HASHER_WORKERS.
+    USER_IMPORT_MAX_ROWS:int = 200
+    EXPORT_BATCH_SIZE:int = 1000
+    # Fresh refs to try when the pre-allocated pool is empty and a draw collides.
+    REF_ALLOCATION_ATTEMPTS:int = 5
+    # After finding the pool empty, a worker allocates fresh refs without
+    # asking the pool again for this long, unless it refills or returns refs
+    # itself. Reserves made by other workers are picked up after the wait.
+    REF_POOL_EMPTY_RECHECK_SECONDS:int = 30
+    REF_RESERVE_MAX:int = 100000
+    # /verify responses: cache built by make_cache, plus how long clients may
+    # reuse one before revalidating with its ETag. An attestation deletes the
+    # cached entry: with the memory backend only in its own worker, so the
+    # TTL bounds how stale the others can be; with redis in all of them. On
+    # either backend a request that read the record before the attestation
+    # can set its stale response after the delete, and only the TTL bounds
+    # that.
+    VERIFICATION_CACHE_MAX_SIZE:int = 50000
+    VERIFICATION_CACHE_TTL_SECONDS:int = 300
+    VERIFICATION_MAX_AGE_SECONDS:int = 60
+    # Ed25519 private key (PEM, \n escapes allowed) signing /verify records;
+    # unset means a throwaway key per process. Signatures expire after the
+    # TTL, which must outlast the cache TTL plus max-age above.
+    VERIFICATION_SIGNING_KEY:str = ""
+    VERIFICATION_SIGNATURE_TTL_SECONDS:int = 86400
+    USER_TYPE_REGISTRY_MAX_AGE_SECONDS:int = 300
+    USER_TYPE_REGISTRY_MIN_REFRESH_SECONDS:int = 5
+    # Debug aid: X-Query-Count header on every response, and a warning for
+    # requests running more statements than the threshold.
+    QUERY_COUNT_MIDDLEWARE:bool = False
+    QUERY_COUNT_WARN_ABOVE:int = 10
     # USER_TYPES:list
 
     # USER_TYPES = collections.defaultdict(lambda: REGULAR_USER_TYPE)
@@ -43,6 +113,12 @@ class Settings(BaseSettings):
 settings = Settings()
 
 
+def get_settings() -> Settings:
+    """The process-wide Settings. They are built, and the env file read, once
+    when this module is imported; every caller shares that instance."""
+    return settings
+
+
 
 
 
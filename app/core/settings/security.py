@@ -2,29 +2,73 @@ import binascii
 import hashlib
 import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from app.core.settings.config import settings
 from itsdangerous import URLSafeSerializer
-from passlib.context import CryptContext
-from passlib.hash import bcrypt
 from pydantic import EmailStr
 from fastapi import HTTPException
-from typing import Union, Optional
+from typing import Union, Optional, Tuple
 import base64
 import logging
 
 
 RESET_TOKEN_EXPIRE_MINUTES = settings.RESET_TOKEN_EXPIRE_MINUTES
 SECRET_KEY = settings.SECRET_KEY
+BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    # passlib is imported on first use: most processes that import this
+    # module (the web workers) never hash a password themselves.
+    from passlib.context import CryptContext
+
+    # Pinning min and max to the configured cost makes needs_update() flag any
+    # stored hash with a different cost, whether stronger or weaker.
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=BCRYPT_ROUNDS,
+        bcrypt__min_rounds=BCRYPT_ROUNDS,
+        bcrypt__max_rounds=BCRYPT_ROUNDS,
+    )
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+
+def verify_password_and_check_rehash(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, bool]:
+    """Whether the password matches, and whether the stored hash should be
+    redone at the configured cost. Both in one call, so a login needs a
+    single trip to the hashing pool and passlib stays out of the web process."""
+    pwd_context = get_pwd_context()
+    return (
+        pwd_context.verify(plain_password, hashed_password),
+        pwd_context.needs_update(hashed_password),
+    )
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float, *, min_rounds: int = 4, max_rounds: int = 16
+) -> int:
+    """Return the highest bcrypt cost whose hash time on this host fits target_ms."""
+    from passlib.hash import bcrypt
+
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        started = time.perf_counter()
+        bcrypt.using(rounds=rounds).hash("calibration")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms > target_ms:
+            break
+        chosen = rounds
+    return chosen
 
 
 def get_api_key_hash(api_key: str) -> str:
@@ -4,3 +4,5 @@ from app.models.user_model import User
 from app.models.user_type_model import UserType
 from app.models.attestation_model import Attestation
 from app.models.attested_document_model import AttestedDocuments
+from app.models.document_model import Document
+from app.models.document_ref_model import DocumentRef
@@ -0,0 +1,74 @@
+"""
+Apply or inspect database migrations.
+
+    python -m app.database.migrate upgrade              # to the latest revision
+    python -m app.database.migrate upgrade --sql        # print the SQL instead
+    python -m app.database.migrate downgrade 0001
+    python -m app.database.migrate stamp 0001           # adopt an existing database
+    python -m app.database.migrate current
+    python -m app.database.migrate revision -m "add x"  # autogenerate a new one
+
+The application never creates or alters tables itself; run ``upgrade`` as a
+release step before starting the workers.
+"""
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+from alembic import command
+from alembic.config import Config
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def alembic_config(database_url: Optional[str] = None) -> Config:
+    config = Config(str(ALEMBIC_INI))
+    if database_url:
+        config.set_main_option("sqlalchemy.url", database_url.replace("%", "%%"))
+    return config
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--database-url", help="migrate this database instead of the app's own"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    upgrade = commands.add_parser("upgrade")
+    upgrade.add_argument("revision", nargs="?", default="head")
+    upgrade.add_argument("--sql", action="store_true", help="offline: print SQL only")
+
+    downgrade = commands.add_parser("downgrade")
+    downgrade.add_argument("revision")
+    downgrade.add_argument("--sql", action="store_true", help="offline: print SQL only")
+
+    stamp = commands.add_parser("stamp")
+    stamp.add_argument("revision")
+
+    commands.add_parser("current")
+    commands.add_parser("history")
+
+    revision = commands.add_parser("revision")
+    revision.add_argument("-m", "--message", required=True)
+    revision.add_argument("--empty", action="store_true", help="skip autogenerate")
+
+    args = parser.parse_args(argv)
+    config = alembic_config(args.database_url)
+
+    if args.command == "upgrade":
+        command.upgrade(config, args.revision, sql=args.sql)
+    elif args.command == "downgrade":
+        command.downgrade(config, args.revision, sql=args.sql)
+    elif args.command == "stamp":
+        command.stamp(config, args.revision)
+    elif args.command == "current":
+        command.current(config, verbose=True)
+    elif args.command == "history":
+        command.history(config)
+    elif args.command == "revision":
+        command.revision(config, message=args.message, autogenerate=not args.empty)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""initial schema
+
+The tables as Base.metadata.create_all used to create them at startup.
+Databases that were built that way already match this revision: mark them
+with ``python -m app.database.migrate stamp 0001`` and then upgrade.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def timestamps():
+    return [
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usertype",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        *timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_index("ix_usertype_id", "usertype", ["id"])
+
+    op.create_table(
+        "user",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("first_name", sa.String(), nullable=False),
+        sa.Column("last_name", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("phone", sa.String(), nullable=True),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("address", sa.String(), nullable=True),
+        sa.Column("is_active", sa.String(), nullable=True),
+        sa.Column("image", sa.String(), nullable=True),
+        sa.Column("user_type_id", sa.String(), nullable=False),
+        *timestamps(),
+        sa.ForeignKeyConstraint(["user_type_id"], ["usertype.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("phone"),
+    )
+    op.create_index("ix_user_email", "user", ["email"], unique=True)
+    op.create_index("ix_user_id", "user", ["id"])
+
+    op.create_table(
+        "attestation",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("signature", sa.String(), nullable=False),
+        sa.Column("stamp", sa.String(), nullable=False),
+        *timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("signature"),
+        sa.UniqueConstraint("stamp"),
+    )
+    op.create_index("ix_attestation_id", "attestation", ["id"])
+    op.create_index("ix_attestation_user_id", "attestation", ["user_id"])
+
+    op.create_table(
+        "attested_documents",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("document_ref", sa.String(), nullable=False),
+        sa.Column("document", sa.String(), nullable=False),
+        sa.Column("commissioner_id", sa.String(), nullable=False),
+        *timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    op.create_table(
+        "document",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("template_name", sa.String(), nullable=False),
+        sa.Column("document_ref", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("document", sa.String(), nullable=False),
+        sa.Column("document_data", sa.String(), nullable=False),
+        sa.Column("qr_code", sa.String(), nullable=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        *timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("document_ref"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("document")
+    op.drop_table("attested_documents")
+    op.drop_index("ix_attestation_user_id", table_name="attestation")
+    op.drop_index("ix_attestation_id", table_name="attestation")
+    op.drop_table("attestation")
+    op.drop_index("ix_user_id", table_name="user")
+    op.drop_index("ix_user_email", table_name="user")
+    op.drop_table("user")
+    op.drop_index("ix_usertype_id", table_name="usertype")
+    op.drop_table("usertype")
@@ -0,0 +1,90 @@
+"""document_data as JSON, lookup indexes, one attestation per document
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+DUPLICATE_ATTESTATIONS = sa.text(
+    "SELECT document_ref, count(*) FROM attested_documents"
+    " GROUP BY document_ref HAVING count(*) > 1 ORDER BY document_ref"
+)
+
+
+def ensure_one_attestation_per_document() -> None:
+    """Refuse to build the unique index over duplicates. Which record of a
+    double attestation is the real one is not ours to decide, so they are
+    listed for an operator to resolve rather than deleted."""
+    if context.is_offline_mode():
+        return
+    duplicates = op.get_bind().execute(DUPLICATE_ATTESTATIONS).all()
+    if not duplicates:
+        return
+    listed = "".join(f"\n  {ref}: {count} records" for ref, count in duplicates[:20])
+    if len(duplicates) > 20:
+        listed += f"\n  ... and {len(duplicates) - 20} more"
+    raise RuntimeError(
+        f"{len(duplicates)} documents have more than one attested_documents "
+        "record, so ux_attested_documents_document_ref cannot be created. "
+        "Keep one record per document_ref, delete the others and run the "
+        f"migration again:{listed}"
+    )
+
+
+def upgrade() -> None:
+    ensure_one_attestation_per_document()
+    # Existing rows already hold JSON text, so Postgres can cast them in place.
+    # Elsewhere (SQLite) JSON is stored as text and only the declared type changes.
+    with op.batch_alter_table("document") as batch_op:
+        batch_op.alter_column(
+            "document_data",
+            existing_type=sa.String(),
+            type_=sa.JSON().with_variant(postgresql.JSONB(), "postgresql"),
+            existing_nullable=False,
+            postgresql_using="document_data::jsonb",
+        )
+    op.create_index(
+        "ix_document_user_id_created_at_id",
+        "document",
+        ["user_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ux_attested_documents_document_ref",
+        "attested_documents",
+        ["document_ref"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_attested_documents_commissioner_id",
+        "attested_documents",
+        ["commissioner_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_attested_documents_commissioner_id", table_name="attested_documents"
+    )
+    op.drop_index(
+        "ux_attested_documents_document_ref", table_name="attested_documents"
+    )
+    op.drop_index("ix_document_user_id_created_at_id", table_name="document")
+    with op.batch_alter_table("document") as batch_op:
+        batch_op.alter_column(
+            "document_data",
+            existing_type=sa.JSON().with_variant(postgresql.JSONB(), "postgresql"),
+            type_=sa.String(),
+            existing_nullable=False,
+            postgresql_using="document_data::text",
+        )
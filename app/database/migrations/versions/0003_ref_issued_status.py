@@ -0,0 +1,28 @@
+"""REF_ISSUED document status
+
+Documents used to keep status PAID after their ref was generated. Move those
+to REF_ISSUED so they can be attested under the new transition rules.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "UPDATE document SET status = 'REF_ISSUED' "
+        "WHERE status = 'PAID' AND document_ref IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.execute("UPDATE document SET status = 'PAID' WHERE status = 'REF_ISSUED'")
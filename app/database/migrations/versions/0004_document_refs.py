@@ -0,0 +1,51 @@
+"""document_refs: issued and pre-allocated document refs
+
+Backfills the refs already on documents as claimed, so new refs cannot
+collide with them.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_refs",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_document_refs_unclaimed",
+        "document_refs",
+        ["created_at"],
+        postgresql_where=sa.text("claimed_at IS NULL"),
+        sqlite_where=sa.text("claimed_at IS NULL"),
+    )
+    op.execute(
+        "INSERT INTO document_refs (id, claimed_at, created_at) "
+        "SELECT document_ref, created_at, created_at FROM document "
+        "WHERE document_ref IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_refs_unclaimed", table_name="document_refs")
+    op.drop_table("document_refs")
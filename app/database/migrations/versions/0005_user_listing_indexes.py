@@ -0,0 +1,38 @@
+"""user listing indexes
+
+Keyset pagination of users newest first, with and without a user type
+filter, and email prefix search on Postgres.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_user_user_type_id_created_at_id",
+        "user",
+        ["user_type_id", "created_at", "id"],
+    )
+    op.create_index("ix_user_created_at_id", "user", ["created_at", "id"])
+    op.create_index(
+        "ix_user_email_pattern",
+        "user",
+        ["email"],
+        postgresql_ops={"email": "text_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_email_pattern", table_name="user")
+    op.drop_index("ix_user_created_at_id", table_name="user")
+    op.drop_index("ix_user_user_type_id_created_at_id", table_name="user")
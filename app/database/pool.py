@@ -0,0 +1,157 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.settings.config import settings
+
+
+LAST_USED_KEY = "last_used_at"
+
+
+class PoolMetrics:
+    """Checkout-wait and occupancy counters for one engine's connection pool."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def record_checkout_wait(self, seconds: float, *, timed_out: bool) -> None:
+        with self._lock:
+            self.checkout_wait_total += seconds
+            self.checkout_wait_max = max(self.checkout_wait_max, seconds)
+            if timed_out:
+                self.checkout_timeouts += 1
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            data = {
+                "name": self.name,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "in_use": self.checkouts - self.checkins,
+                "invalidations": self.invalidations,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_total_seconds": round(self.checkout_wait_total, 6),
+                "checkout_wait_max_seconds": round(self.checkout_wait_max, 6),
+                "checkout_wait_avg_seconds": round(
+                    self.checkout_wait_total / self.checkouts, 6
+                )
+                if self.checkouts
+                else 0.0,
+            }
+        pool = self.engine.pool if self.engine is not None else None
+        if isinstance(pool, QueuePool):
+            data.update(
+                pool_size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return data
+
+
+pool_metrics = {
+    "sync": PoolMetrics("sync"),
+    "async": PoolMetrics("async"),
+}
+
+
+class _TimedCheckoutMixin:
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.metrics.record_checkout_wait(
+                time.perf_counter() - started, timed_out=timed_out
+            )
+
+
+def _instrumented_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    # metrics lives on the class so Pool.recreate(), which instantiates
+    # self.__class__, keeps reporting into the same counters.
+    return type(
+        "Instrumented" + base.__name__,
+        (_TimedCheckoutMixin, base),
+        {"metrics": metrics},
+    )
+
+
+def engine_pool_options(url: str, *, metrics: PoolMetrics, is_async: bool) -> Dict[str, Any]:
+    """Keyword arguments for create_engine/create_async_engine built from Settings."""
+    if url.startswith("sqlite"):
+        # SQLite uses its own single-file pools which take none of these.
+        return {}
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return dict(
+        poolclass=_instrumented_pool_class(base, metrics),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_use_lifo=settings.DB_POOL_USE_LIFO,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+
+def _ping(dbapi_connection) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    except Exception as e:
+        # The pool discards the connection and retries the checkout.
+        raise exc.DisconnectionError() from e
+    finally:
+        cursor.close()
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics) -> None:
+    """Attach counters and, if configured, the periodic liveness check."""
+    metrics.engine = engine
+    liveness_interval = settings.DB_POOL_LIVENESS_INTERVAL_SECONDS
+    check_liveness = not settings.DB_POOL_PRE_PING and liveness_interval > 0
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info[LAST_USED_KEY] = time.monotonic()
+        metrics.increment("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        if check_liveness:
+            idle_since = connection_record.info.get(LAST_USED_KEY, 0.0)
+            if time.monotonic() - idle_since > liveness_interval:
+                _ping(dbapi_connection)
+        metrics.increment("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        connection_record.info[LAST_USED_KEY] = time.monotonic()
+        metrics.increment("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.increment("invalidations")
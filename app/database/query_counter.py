@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """The SQL statements run inside one count_queries() block."""
+
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+# A ContextVar rather than a global, so concurrent requests each count their
+# own statements. The counter object itself is shared with the copies of the
+# context that tasks and threadpool calls inherit, so statements run there
+# are counted too.
+_current_counter: ContextVar[Optional[QueryCounter]] = ContextVar(
+    "query_counter", default=None
+)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    counter = QueryCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+def instrument_query_counting(engine: Engine) -> None:
+    """Record every statement ``engine`` runs in the active counter, if any.
+    Outside count_queries() the listener costs one ContextVar lookup."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        counter = _current_counter.get()
+        if counter is not None:
+            counter.statements.append(statement)
@@ -1,6 +1,9 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.settings.config import settings
+from app.database.pool import engine_pool_options, instrument_engine, pool_metrics
+from app.database.query_counter import instrument_query_counting
 
 
 DATABASE_URL = (
@@ -12,24 +15,63 @@ DATABASE_URL = (
     f"5432/Eaffidavit"
 )
 
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
 
+def make_async_url(url: str) -> str:
+    """Swap the blocking DBAPI driver in ``url`` for its asyncio counterpart."""
+    scheme, separator, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + separator + rest
 
 
+ASYNC_DATABASE_URL = make_async_url(DATABASE_URL)
+
 
 def create_database_engine():
     # if settings.DEBUG:
     #     DATABASE_URL = settings.DEVELOPMENT_DATABASE_URL
     # else:
     #     DATABASE_URL = settings.PRODUCTION_DATABASE_URL
-    return create_engine(DATABASE_URL, pool_pre_ping=True)
+    metrics = pool_metrics["sync"]
+    engine = create_engine(
+        DATABASE_URL,
+        **engine_pool_options(DATABASE_URL, metrics=metrics, is_async=False),
+    )
+    instrument_engine(engine, metrics)
+    instrument_query_counting(engine)
+    return engine
+
+
+def create_async_database_engine():
+    metrics = pool_metrics["async"]
+    engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        **engine_pool_options(ASYNC_DATABASE_URL, metrics=metrics, is_async=True),
+    )
+    instrument_engine(engine.sync_engine, metrics)
+    instrument_query_counting(engine.sync_engine)
+    return engine
 
 
 engine = create_database_engine()
+async_engine = create_async_database_engine()
 
 
 def create_session():
     return sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def create_async_session():
+    # expire_on_commit is off so attributes stay readable after commit without
+    # an implicit (and, under asyncio, illegal) lazy refresh.
+    return async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
 SessionLocal = create_session()
+AsyncSessionLocal = create_async_session()
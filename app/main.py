@@ -1,21 +1,24 @@
 from fastapi import FastAPI, APIRouter
+from fastapi.responses import ORJSONResponse
+from app.api.middleware import QueryCountMiddleware
 from app.api.routers.routes import router as global_router
-from app.database.session import create_session, engine
 from starlette.middleware.cors import CORSMiddleware
 import starlette.responses as _responses
-from app.core.settings.config import Settings
-from app.database.base import Base
+from app.core.settings.config import get_settings
+from app.core.services.password_hasher import password_hasher_pool
+from app.core.services.qr_renderer import qr_render_pool
+from app.core.services.user_type_registry import load_user_type_registry
 
 
-
-Base.metadata.create_all(bind=engine)
 origins = ["https://e-affidavit.vercel.app/","https://e-affidavit.vercel.app"]
 
-settings= Settings()
+settings = get_settings()
 
 
 def create_application_instance() -> FastAPI:
-    application = FastAPI(title=settings.PROJECT_NAME)
+    application = FastAPI(
+        title=settings.PROJECT_NAME, default_response_class=ORJSONResponse
+    )
     application.add_middleware(
         CORSMiddleware,
         allow_origins=origins,
@@ -23,7 +26,14 @@ def create_application_instance() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    if settings.QUERY_COUNT_MIDDLEWARE:
+        application.add_middleware(
+            QueryCountMiddleware, warn_above=settings.QUERY_COUNT_WARN_ABOVE
+        )
     application.include_router(global_router, prefix=settings.API_URL_PREFIX)
+    application.add_event_handler("startup", load_user_type_registry)
+    application.add_event_handler("shutdown", password_hasher_pool.shutdown)
+    application.add_event_handler("shutdown", qr_render_pool.shutdown)
     return application
 
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, Column, Boolean, String,LargeBinary
+from sqlalchemy import Integer, Column, Boolean, Index, String,LargeBinary
 from commonLib.models.base_class import Base
 
 
@@ -13,6 +13,13 @@ class AttestedDocuments(Base):
     document=Column(String,nullable=False)
     commissioner_id=Column(String,nullable=False)
 
+    __table_args__ = (
+        # A document can be attested once; the database enforces it so two
+        # concurrent attest requests cannot both succeed.
+        Index("ux_attested_documents_document_ref", "document_ref", unique=True),
+        Index("ix_attested_documents_commissioner_id", "commissioner_id"),
+    )
+
 
 
 
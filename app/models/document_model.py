@@ -1,16 +1,42 @@
+import enum
+
 from commonLib.models.base_class import Base
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import JSON, Column, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 
+class DocumentStatus(str, enum.Enum):
+    SAVED = "SAVED"
+    PAID = "PAID"
+    REF_ISSUED = "REF_ISSUED"
+    ATTESTED = "ATTESTED"
+
+
+# The only legal moves: target status -> the statuses it may be entered from.
+DOCUMENT_TRANSITIONS = {
+    DocumentStatus.PAID: (DocumentStatus.SAVED,),
+    DocumentStatus.REF_ISSUED: (DocumentStatus.PAID,),
+    DocumentStatus.ATTESTED: (DocumentStatus.REF_ISSUED,),
+}
+
+
 class Document(Base):
     id = Column(String, primary_key=True)
     template_name = Column(String, nullable=False)
     document_ref = Column(String, unique=True, nullable=True)
     status = Column(String, nullable=False)
     document = Column(String, nullable=False)
-    document_data = Column(String, nullable=False)
+    # JSONB on Postgres, plain JSON (text) elsewhere; either way the ORM
+    # hands back the decoded dict.
+    document_data = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
     qr_code = Column(String, nullable=True)
     user_id = Column(String, nullable=False)
 
+    __table_args__ = (
+        # Backs the keyset pagination of a user's documents.
+        # id is the keyset tiebreak, so the whole ORDER BY comes off the index.
+        Index("ix_document_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
 
@@ -0,0 +1,26 @@
+from commonLib.models.base_class import Base
+from sqlalchemy import Column, DateTime, Index, String
+
+
+class DocumentRef(Base):
+    """Every document ref ever handed out, plus a pool of pre-allocated ones.
+
+    The primary key is the ref itself, so inserting a row is what claims a
+    ref; a collision is a cheap failed insert, before any QR rendering.
+    Pre-allocated refs sit here with claimed_at unset until a document takes
+    one.
+    """
+
+    __tablename__ = "document_refs"
+    id = Column(String, primary_key=True)
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # The pool of unclaimed refs, oldest first.
+        Index(
+            "ix_document_refs_unclaimed",
+            "created_at",
+            postgresql_where=claimed_at.is_(None),
+            sqlite_where=claimed_at.is_(None),
+        ),
+    )
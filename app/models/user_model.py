@@ -6,8 +6,9 @@ from sqlalchemy.orm.session import Session
 from app.core.settings.config import settings
 from commonLib.models.base_class import Base
 from app.schemas.jwt import JWTUser
+from app.schemas.user_schema import is_active_value
 from app.core.settings import security
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 
@@ -33,6 +34,20 @@ class User(Base):
     image = Column(String, nullable=True)
     user_type_id = Column(String, ForeignKey("usertype.id"), nullable=False)
     user_type = relationship("UserType", back_populates="users")
+
+    __table_args__ = (
+        # Back the keyset pagination of the admin user listing, newest first,
+        # with and without a user type filter.
+        Index("ix_user_user_type_id_created_at_id", "user_type_id", "created_at", "id"),
+        Index("ix_user_created_at_id", "created_at", "id"),
+        # Lets Postgres serve email prefix searches (LIKE 'abc%') from an
+        # index whatever the database collation.
+        Index(
+            "ix_user_email_pattern",
+            "email",
+            postgresql_ops={"email": "text_pattern_ops"},
+        ),
+    )
     
 
 
@@ -48,7 +63,7 @@ class User(Base):
         return security.verify_password(password, self.hashed_password)
 
     def generate_jwt(self, expires_delta: timedelta = None):
-        if not self.is_active:
+        if not is_active_value(self.is_active):
             raise Exception("user is not active")
 
         jwt_content = JWTUser(id=self.id).dict()
@@ -2,13 +2,27 @@ from typing import List
 from app.models.attestation_model import Attestation
 from commonLib.repositories.repository_class import Base
 from app.schemas.attestation_schema import StampBase
+from sqlalchemy import exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
 class AttestationRepository(Base[Attestation]):
     def get_by_user_id(self, db, *, user_id: str):
-        return db.query(Attestation).filter(Attestation.user_id == user_id).first()
-        
+        return self.get_by_field(db, field_name="user_id", field_value=user_id)
+
+    async def ahas_image(self, db: AsyncSession, *, key: str, user_id: str) -> bool:
+        """Whether ``user_id``'s attestation has its signature or stamp
+        stored under object key ``key``."""
+        result = await db.execute(
+            select(
+                exists().where(
+                    Attestation.user_id == user_id,
+                    or_(Attestation.signature == key, Attestation.stamp == key),
+                )
+            )
+        )
+        return result.scalar()
 
     pass
 
@@ -0,0 +1,132 @@
+import time
+from typing import Iterable, Optional, Set
+
+from app.core.services.document_refs import generate_ref
+from app.core.settings.config import settings
+from app.models.document_model import Document
+from app.models.document_ref_model import DocumentRef
+from commonLib.repositories.repository_class import Base
+from sqlalchemy import exists, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class DocumentRefRepository(Base[DocumentRef]):
+    def __init__(self, *args, pool_recheck_seconds: float, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.pool_recheck_seconds = pool_recheck_seconds
+        # monotonic() time until which this process takes the pool to be
+        # empty, so allocating a fresh ref costs no failed claim first.
+        self._pool_empty_until = 0.0
+
+    async def aallocate(self, db: AsyncSession, *, attempts: int) -> Optional[str]:
+        """A ref no document has, claimed for the caller: the oldest
+        pre-allocated one if the pool has any, otherwise a fresh one, retried
+        up to ``attempts`` times on collision. None if every attempt collided."""
+        if time.monotonic() >= self._pool_empty_until:
+            ref = await self._aclaim_reserved(db)
+            if ref is not None:
+                return ref
+            self._pool_empty_until = time.monotonic() + self.pool_recheck_seconds
+        for _ in range(attempts):
+            ref = generate_ref()
+            # Refs issued before this table existed may only be in document,
+            # so that is checked in the same statement.
+            claim = insert(DocumentRef).from_select(
+                ["id", "claimed_at"],
+                select(literal(ref), func.now()).where(
+                    ~exists().where(Document.document_ref == ref)
+                ),
+            )
+            try:
+                result = await db.execute(claim)
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+                continue
+            if result.rowcount:
+                return ref
+        return None
+
+    async def _aclaim_reserved(self, db: AsyncSession) -> Optional[str]:
+        # SKIP LOCKED lets concurrent claims take different rows instead of
+        # queueing on the same one; SQLite serialises writers anyway.
+        oldest = (
+            select(DocumentRef.id)
+            .where(DocumentRef.claimed_at.is_(None))
+            .order_by(DocumentRef.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            update(DocumentRef)
+            .where(DocumentRef.id == oldest, DocumentRef.claimed_at.is_(None))
+            .values(claimed_at=func.now())
+            .returning(DocumentRef.id)
+            .execution_options(synchronize_session=False)
+        )
+        ref = result.scalar()
+        if ref is None:
+            # Nothing was written; there is nothing to commit.
+            await db.rollback()
+            return None
+        await db.commit()
+        return ref
+
+    async def arelease(self, db: AsyncSession, *, ref: str) -> None:
+        """Return a claimed ref that no document ended up with to the pool."""
+        await db.execute(
+            update(DocumentRef)
+            .where(DocumentRef.id == ref)
+            .values(claimed_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        self._pool_empty_until = 0.0
+
+    async def areserve(
+        self, db: AsyncSession, *, count: int, batch_size: int, attempts: int
+    ) -> int:
+        """Add ``count`` unclaimed refs to the pool, ``batch_size`` per insert.
+        Returns how many were added, which is short of ``count`` only if a
+        batch collided ``attempts`` times in a row."""
+        reserved = 0
+        failures = 0
+        while reserved < count and failures < attempts:
+            refs = {generate_ref() for _ in range(min(batch_size, count - reserved))}
+            refs -= await self._ataken(db, refs)
+            if not refs:
+                # Every draw was already taken; nothing raced us, so draw again.
+                continue
+            try:
+                await db.execute(insert(DocumentRef), [{"id": ref} for ref in refs])
+                await db.commit()
+            except IntegrityError:
+                # A concurrent allocation took one of them; draw a new batch.
+                await db.rollback()
+                failures += 1
+                continue
+            reserved += len(refs)
+            failures = 0
+        if reserved:
+            self._pool_empty_until = 0.0
+        return reserved
+
+    async def _ataken(self, db: AsyncSession, refs: Iterable[str]) -> Set[str]:
+        refs = list(refs)
+        claimed = await db.scalars(select(DocumentRef.id).where(DocumentRef.id.in_(refs)))
+        issued = await db.scalars(
+            select(Document.document_ref).where(Document.document_ref.in_(refs))
+        )
+        return set(claimed) | set(issued)
+
+    async def acount_available(self, db: AsyncSession) -> int:
+        return await db.scalar(
+            select(func.count()).where(DocumentRef.claimed_at.is_(None))
+        )
+
+
+document_ref_repo = DocumentRefRepository(
+    DocumentRef, pool_recheck_seconds=settings.REF_POOL_EMPTY_RECHECK_SECONDS
+)
@@ -1,18 +1,35 @@
+import datetime
 import uuid
 import json
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence
 from app.models.attested_document_model import AttestedDocuments
 from fastapi import HTTPException
-from app.models.document_model import Document
-from app.schemas.document_schema import AttestDocumentCreate, DocumentCreate, DocumentBase
+from app.core.services.verification_cache import ainvalidate_verification
+from app.models.document_model import DOCUMENT_TRANSITIONS, Document, DocumentStatus
+from app.models.user_model import User
+from app.schemas.document_schema import (
+    AttestDocumentCreate,
+    DocumentBase,
+    DocumentCreate,
+    DocumentVerification,
+)
+from commonLib.repositories.integrity import is_unique_violation
+from commonLib.repositories.pagination import Keyset, keyset_before
 from commonLib.repositories.repository_class import Base
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+
+
+# Violated when a concurrent request attested the same document first.
+ATTESTED_DOCUMENT_REF_INDEX = "ux_attested_documents_document_ref"
 
 
 class DocumentRepository(Base[Document]):
     def create(self, db: Session, *, obj_in):
         try:
-            db_obj = Document(**obj_in, id=str(uuid.uuid4()), status="SAVED")
+            db_obj = Document(**obj_in, id=str(uuid.uuid4()), status=DocumentStatus.SAVED.value)
             db.add(db_obj)
             db.commit()
             db.refresh(db_obj)
@@ -20,6 +37,13 @@ class DocumentRepository(Base[Document]):
         except Exception as e:
             raise HTTPException(status_code=503, detail="Database error") from e
 
+    def _prepare_row(self, obj_in) -> Dict[str, Any]:
+        return dict(
+            **super()._prepare_row(obj_in),
+            id=str(uuid.uuid4()),
+            status=DocumentStatus.SAVED.value,
+        )
+
     def get_by_user(self, db: Session, *, user_id: str):
         try:
             documents = db.query(Document).filter(Document.user_id == user_id).all()
@@ -59,4 +83,272 @@ class DocumentRepository(Base[Document]):
         # except Exception as e:
         #     raise HTTPException(status_code=503, detail="Database error") from e
 
+    async def acreate(self, db: AsyncSession, *, obj_in):
+        try:
+            db_obj = Document(**obj_in, id=str(uuid.uuid4()), status=DocumentStatus.SAVED.value)
+            db.add(db_obj)
+            await db.commit()
+            await db.refresh(db_obj)
+            return db_obj
+        except Exception as e:
+            raise HTTPException(status_code=503, detail="Database error") from e
+
+    async def aget_by_user(self, db: AsyncSession, *, user_id: str):
+        try:
+            result = await db.execute(
+                select(Document).filter(Document.user_id == user_id)
+            )
+            return result.scalars().all()
+        except Exception as e:
+            raise HTTPException(status_code=503, detail="Database error") from e
+
+    async def aget_page_by_user(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: str,
+        limit: int,
+        after: Optional[Keyset] = None,
+        status: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Document]:
+        """Newest-first page of a user's documents, fetching one extra row so the
+        caller can tell whether another page follows.
+
+        ``columns`` restricts the SELECT to those attributes (plus the keyset
+        columns); the rest are never fetched, so callers must not touch them.
+        """
+        query = select(Document).filter(Document.user_id == user_id)
+        if columns is not None:
+            loaded = {"id", "created_at", *columns}
+            query = query.options(
+                load_only(*(getattr(Document, column) for column in loaded))
+            )
+        if status is not None:
+            query = query.filter(Document.status == status)
+        if after is not None:
+            query = query.filter(keyset_before(Document.created_at, Document.id, after))
+        query = query.order_by(Document.created_at.desc(), Document.id.desc()).limit(
+            limit + 1
+        )
+        try:
+            result = await db.execute(query)
+            return result.scalars().all()
+        except Exception as e:
+            raise HTTPException(status_code=503, detail="Database error") from e
+
+    def export_query(
+        self,
+        *,
+        created_from: Optional[datetime.datetime] = None,
+        created_to: Optional[datetime.datetime] = None,
+        status: Optional[str] = None,
+    ):
+        # The QR image is left out of exports; it is derived from document_ref.
+        query = select(Document).options(
+            load_only(
+                *(
+                    getattr(Document, column)
+                    for column in self.column_keys
+                    if column != "qr_code"
+                )
+            )
+        )
+        if status is not None:
+            query = query.filter(Document.status == status)
+        return self._created_between(query, Document, created_from, created_to)
+
+    def attested_export_query(
+        self,
+        *,
+        created_from: Optional[datetime.datetime] = None,
+        created_to: Optional[datetime.datetime] = None,
+    ):
+        return self._created_between(
+            select(AttestedDocuments), AttestedDocuments, created_from, created_to
+        )
+
+    async def aget_by_ref(self, db: AsyncSession, *, ref: str):
+        try:
+            result = await db.execute(
+                select(Document).filter(Document.document_ref == ref)
+            )
+            return result.scalars().first()
+        except Exception as e:
+            raise HTTPException(status_code=503, detail="Database error") from e
+
+    async def ahas_qr_code(
+        self, db: AsyncSession, *, key: str, user_id: Optional[str] = None
+    ) -> bool:
+        """Whether a document (of ``user_id``, when given) has the QR code
+        stored under object key ``key``."""
+        criteria = [Document.qr_code == key]
+        if user_id is not None:
+            criteria.append(Document.user_id == user_id)
+        result = await db.execute(select(exists().where(*criteria)))
+        return result.scalar()
+
+    async def aget_verification(
+        self, db: AsyncSession, *, ref: str
+    ) -> Optional[DocumentVerification]:
+        """The public verification record for a ref, in one query: the
+        document's status and, once attested, when and by whom."""
+        result = await db.execute(
+            select(
+                Document.document_ref.label("ref"),
+                Document.status,
+                AttestedDocuments.created_at.label("attested_at"),
+                User.first_name,
+                User.last_name,
+            )
+            .outerjoin(
+                AttestedDocuments,
+                AttestedDocuments.document_ref == Document.document_ref,
+            )
+            .outerjoin(User, User.id == AttestedDocuments.commissioner_id)
+            .where(Document.document_ref == ref)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        commissioner = " ".join(name for name in (row.first_name, row.last_name) if name)
+        return DocumentVerification(
+            ref=row.ref,
+            status=row.status,
+            attested_at=row.attested_at,
+            commissioner=commissioner or None,
+        )
+
+    async def aupdate(self, db: AsyncSession, *, db_obj: Document, obj_in) -> Document:
+        document = await super().aupdate(db, db_obj=db_obj, obj_in=obj_in)
+        await ainvalidate_verification(document.document_ref)
+        return document
+
+    async def aupdate_field(
+        self, db: AsyncSession, *, db_obj: Document, field_value: str, field_name: str
+    ):
+        return await self.aupdate(db, db_obj=db_obj, obj_in={field_name: field_value})
+
+    async def aget_attested_document(self, db: AsyncSession, *, document_ref: str):
+        try:
+            result = await db.execute(
+                select(AttestedDocuments).filter(
+                    AttestedDocuments.document_ref == document_ref
+                )
+            )
+            return result.scalars().first()
+        except Exception as e:
+            raise HTTPException(status_code=503, detail="Database error") from e
+
+    # State transitions. Each is a single UPDATE ... WHERE status IN (...)
+    # RETURNING, so checking the current status and moving on from it happen
+    # in one round trip and concurrent callers cannot both succeed. A None
+    # result means no row matched; callers re-read the document only then, to
+    # explain why.
+
+    def _transition(self, to_status: DocumentStatus, *criteria, **values):
+        return (
+            update(Document)
+            .where(
+                *criteria,
+                Document.status.in_(
+                    [status.value for status in DOCUMENT_TRANSITIONS[to_status]]
+                ),
+            )
+            .values(status=to_status.value, **values)
+            .returning(Document)
+            # "fetch" matches the returned primary keys against the session,
+            # so a copy of the document loaded earlier in the request (say,
+            # for a precondition check) gets the new values too; RETURNING
+            # means no extra query.
+            .execution_options(synchronize_session="fetch")
+        )
+
+    async def amark_paid(
+        self, db: AsyncSession, *, document_id: str, user_id: str
+    ) -> Optional[Document]:
+        result = await db.execute(
+            self._transition(
+                DocumentStatus.PAID,
+                Document.id == document_id,
+                Document.user_id == user_id,
+            )
+        )
+        await db.commit()
+        return result.scalars().first()
+
+    async def aissue_ref(
+        self,
+        db: AsyncSession,
+        *,
+        document_id: str,
+        user_id: str,
+        document_ref: str,
+        qr_code: Optional[str],
+    ) -> Optional[Document]:
+        result = await db.execute(
+            self._transition(
+                DocumentStatus.REF_ISSUED,
+                Document.id == document_id,
+                Document.user_id == user_id,
+                Document.document_ref.is_(None),
+                document_ref=document_ref,
+                qr_code=qr_code,
+            )
+        )
+        await db.commit()
+        return result.scalars().first()
+
+    async def aattest(
+        self, db: AsyncSession, *, document_ref: str, document: str, commissioner_id: str
+    ) -> Optional[Document]:
+        """Mark the document ATTESTED and record the attestation in the same
+        transaction. The unique index on attested_documents.document_ref backs
+        the status check up."""
+        result = await db.execute(
+            self._transition(
+                DocumentStatus.ATTESTED,
+                Document.document_ref == document_ref,
+                document=document,
+            )
+        )
+        attested = result.scalars().first()
+        if attested is None:
+            await db.rollback()
+            return None
+        db.add(
+            AttestedDocuments(
+                id=str(uuid.uuid4()),
+                document_ref=document_ref,
+                document=document,
+                commissioner_id=commissioner_id,
+            )
+        )
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            if not is_unique_violation(
+                e, AttestedDocuments.__table__, ATTESTED_DOCUMENT_REF_INDEX
+            ):
+                raise
+            return None
+        await ainvalidate_verification(document_ref)
+        return attested
+
+    async def acreate_attested_document(self, db: AsyncSession, *, obj_in):
+        db_obj = AttestedDocuments(**obj_in, id=str(uuid.uuid4()))
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    def _created_between(self, query, model, created_from, created_to):
+        if created_from is not None:
+            query = query.filter(model.created_at >= created_from)
+        if created_to is not None:
+            query = query.filter(model.created_at < created_to)
+        return query.order_by(model.created_at, model.id)
+
+
 document_repo = DocumentRepository(Document)
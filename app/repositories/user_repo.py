@@ -1,27 +1,142 @@
+import asyncio
+import datetime
 import uuid
 from app.models.user_type_model import UserType
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
 from app.core.settings.config import settings
 from app.models.user_model import User
-from commonLib.repositories.repository_class import Base
+from commonLib.repositories.repository_class import (
+    BULK_BATCH_SIZE,
+    Base,
+    LoaderOptions,
+    batched,
+)
 from app.repositories.user_type_repo import user_type_repo
-from app.schemas.user_schema import UserCreate, UserUpdate
+from app.schemas.user_schema import (
+    ACTIVE_VALUES,
+    UserCreate,
+    UserUpdate,
+    active_flag,
+    is_active_value,
+)
+from commonLib.repositories.pagination import Keyset, keyset_before
 
 from app.core.settings.security import get_password_hash
-from sqlalchemy.orm import Session
+from app.core.services.password_hasher import (
+    hash_password,
+    verify_password_and_check_rehash,
+)
+from app.core.services.principal_cache import ainvalidate_principal, invalidate_principal
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.sql.elements import ColumnElement
 
 REGULAR_USER_TYPE = settings.REGULAR_USER_TYPE
 SUPERUSER_USER_TYPE = settings.SUPERUSER_USER_TYPE
 
+LISTING_COLUMNS = (
+    User.id,
+    User.first_name,
+    User.last_name,
+    User.email,
+    User.is_active,
+    User.image,
+    User.user_type_id,
+    User.created_at,
+)
+EXPORT_COLUMNS = (*LISTING_COLUMNS, User.updated_at)
+
 
 
 
 class UserRepository(Base[User]):
-    def get_by_email(self, db: Session, *, email: str) -> User:
-        user = db.query(User).filter(User.email == email).first()
-        return user
+    # user.user_type is only loaded when asked for through ``options``; most
+    # callers resolve user_type_id through the user type registry instead.
+
+    def get_by_email(
+        self, db: Session, *, email: str, options: LoaderOptions = ()
+    ) -> User:
+        return self.get_by_field(
+            db, field_name="email", field_value=email, options=options
+        )
+
+    async def aget_by_email(
+        self, db: AsyncSession, *, email: str, options: LoaderOptions = ()
+    ) -> Optional[User]:
+        return await self.aget_by_field(
+            db, field_name="email", field_value=email, options=options
+        )
+
+    async def aget_existing_emails(
+        self, db: AsyncSession, *, emails: Iterable[str]
+    ) -> Set[str]:
+        result = await db.execute(select(User.email).where(User.email.in_(set(emails))))
+        return set(result.scalars().all())
+
+    async def aget_existing_ids(self, db: AsyncSession, *, ids: Iterable[str]) -> Set[str]:
+        result = await db.execute(select(User.id).where(User.id.in_(set(ids))))
+        return set(result.scalars().all())
+
+    def listing_filters(
+        self,
+        *,
+        user_type_id: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        email_prefix: Optional[str] = None,
+        created_from: Optional[datetime.datetime] = None,
+        created_to: Optional[datetime.datetime] = None,
+    ) -> List[ColumnElement]:
+        """WHERE clauses for the admin user listing, shared by the page, its
+        total and the export so all three count the same users."""
+        filters = []
+        if user_type_id is not None:
+            filters.append(User.user_type_id == user_type_id)
+        if is_active is not None:
+            active = func.lower(User.is_active).in_(ACTIVE_VALUES)
+            filters.append(active if is_active else or_(~active, User.is_active.is_(None)))
+        if email_prefix:
+            filters.append(User.email.startswith(email_prefix, autoescape=True))
+        if created_from is not None:
+            filters.append(User.created_at >= created_from)
+        if created_to is not None:
+            filters.append(User.created_at < created_to)
+        return filters
+
+    async def aget_page(
+        self,
+        db: AsyncSession,
+        *,
+        filters: Sequence[ColumnElement],
+        limit: int,
+        after: Optional[Keyset] = None,
+    ) -> List[User]:
+        """Newest-first page of the users matching ``filters``, fetching one
+        extra row so the caller can tell whether another page follows. Only
+        the columns UserInResponse needs are read."""
+        query = select(User).options(load_only(*LISTING_COLUMNS)).filter(*filters)
+        if after is not None:
+            query = query.filter(keyset_before(User.created_at, User.id, after))
+        query = query.order_by(User.created_at.desc(), User.id.desc()).limit(limit + 1)
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    async def acount(self, db: AsyncSession, *, filters: Sequence[ColumnElement]) -> int:
+        result = await db.execute(
+            select(func.count()).select_from(User).filter(*filters)
+        )
+        return result.scalar_one()
+
+    def export_query(self, *, filters: Sequence[ColumnElement]):
+        # Never export password hashes.
+        return (
+            select(User)
+            .options(load_only(*EXPORT_COLUMNS))
+            .filter(*filters)
+            .order_by(User.created_at, User.id)
+        )
 
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
         db_obj = User(
@@ -30,7 +145,7 @@ class UserRepository(Base[User]):
             last_name=obj_in.last_name,
             email=obj_in.email,
             user_type_id=obj_in.user_type_id,
-            is_active=True
+            is_active=active_flag(True)
         )
 
         
@@ -43,19 +158,117 @@ class UserRepository(Base[User]):
 
 
 
+    async def acreate(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        db_obj = User(**self._user_row(obj_in, await hash_password(obj_in.password)))
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    def _user_row(self, obj_in: UserCreate, hashed_password: str) -> Dict[str, Any]:
+        return dict(
+            id=str(uuid.uuid4()),
+            first_name=obj_in.first_name,
+            last_name=obj_in.last_name,
+            email=obj_in.email,
+            user_type_id=obj_in.user_type_id,
+            is_active=active_flag(True),
+            hashed_password=hashed_password,
+        )
+
+    def _prepare_row(self, obj_in: UserCreate) -> Dict[str, Any]:
+        return self._user_row(obj_in, get_password_hash(obj_in.password))
+
+    async def _aprepare_rows(self, objs_in: Sequence[UserCreate]) -> List[Dict[str, Any]]:
+        # Hash a few passwords at a time: enough to keep every hasher worker
+        # busy without taking all of the pool's slots away from logins.
+        hashed_passwords: List[str] = []
+        for chunk in batched(objs_in, max(1, settings.PASSWORD_HASHER_WORKERS * 2)):
+            hashed_passwords.extend(
+                await asyncio.gather(*(hash_password(obj.password) for obj in chunk))
+            )
+        return [
+            self._user_row(obj_in, hashed_password)
+            for obj_in, hashed_password in zip(objs_in, hashed_passwords)
+        ]
+
     def update(
         self, db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
     ) -> User:
         if isinstance(obj_in, dict):
-            update_data = obj_in
+            update_data = _normalise(obj_in)
         else:
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = _normalise(obj_in.dict(exclude_unset=True))
         if update_data.get("password"):
             hashed_password = get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
         return super().update(db, db_obj=db_obj, obj_in=update_data)
 
+    async def aupdate(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: User,
+        obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        if isinstance(obj_in, dict):
+            update_data = _normalise(obj_in)
+        else:
+            update_data = _normalise(obj_in.dict(exclude_unset=True))
+        if update_data.get("password"):
+            hashed_password = await hash_password(update_data["password"])
+            del update_data["password"]
+            update_data["hashed_password"] = hashed_password
+        return await super().aupdate(db, db_obj=db_obj, obj_in=update_data)
+
+    def update_by_ids(
+        self, db: Session, *, ids: Sequence[Any], obj_in: Dict[str, Any]
+    ) -> int:
+        return super().update_by_ids(db, ids=ids, obj_in=_normalise(obj_in))
+
+    async def aupdate_by_ids(
+        self, db: AsyncSession, *, ids: Sequence[Any], obj_in: Dict[str, Any]
+    ) -> int:
+        return await super().aupdate_by_ids(db, ids=ids, obj_in=_normalise(obj_in))
+
+    def update_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Iterable[Dict[str, Any]],
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> int:
+        return super().update_many(
+            db, objs_in=map(_normalise, objs_in), batch_size=batch_size
+        )
+
+    async def aupdate_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Iterable[Dict[str, Any]],
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> int:
+        return await super().aupdate_many(
+            db, objs_in=map(_normalise, objs_in), batch_size=batch_size
+        )
+
+    # Every write in Base, single-row or bulk, calls these once its commit
+    # has returned, with the ids it touched. Cached principals go with them.
+
+    def _invalidate(self, ids: Iterable[Any]) -> None:
+        ids = list(ids)
+        super()._invalidate(ids)
+        for id in ids:
+            invalidate_principal(id)
+
+    async def _ainvalidate(self, ids: Iterable[Any]) -> None:
+        ids = list(ids)
+        await super()._ainvalidate(ids)
+        for id in ids:
+            await ainvalidate_principal(id)
+
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
         user = self.get_by_email(db, email=email)
         if not user:
@@ -64,6 +277,34 @@ class UserRepository(Base[User]):
             return None
         return user
 
+    async def aauthenticate(
+        self, db: AsyncSession, *, email: str, password: str
+    ) -> Tuple[Optional[User], bool]:
+        """The user, if the password matches, and whether their stored hash
+        should be redone at the configured cost."""
+        user = await self.aget_by_email(db, email=email)
+        if not user:
+            return None, False
+        valid, needs_rehash = await verify_password_and_check_rehash(
+            password, user.hashed_password
+        )
+        if not valid:
+            return None, False
+        return user, needs_rehash
+
+    async def arehash_password(
+        self, db: AsyncSession, *, user_id: str, old_hash: str, password: str
+    ) -> bool:
+        """Re-hash with the configured bcrypt cost, unless the hash changed meanwhile."""
+        new_hash = await hash_password(password)
+        result = await db.execute(
+            update(User)
+            .where(User.id == user_id, User.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+        )
+        await db.commit()
+        return result.rowcount == 1
+
     def activate(self, db: Session, *, db_obj: User) -> User:
         return self._set_activation_status(db=db, db_obj=db_obj, status=True)
 
@@ -73,9 +314,9 @@ class UserRepository(Base[User]):
     def _set_activation_status(
         self, db: Session, *, db_obj: User, status: bool
     ) -> User:
-        if db_obj.is_active == status:
+        if is_active_value(db_obj.is_active) == status:
             return db_obj
-        return super().update(db, db_obj=db_obj, obj_in={"is_active": status})
+        return self.update(db, db_obj=db_obj, obj_in={"is_active": status})
 
     def set_as_superuser(self, db: Session, db_obj: User) -> User:
         superuser_type = user_type_repo.get_by_name(
@@ -88,4 +329,10 @@ class UserRepository(Base[User]):
         return super().update(db, db_obj=db_obj, obj_in={})
 
 
+def _normalise(values: Dict[str, Any]) -> Dict[str, Any]:
+    if "is_active" in values and values["is_active"] is not None:
+        return {**values, "is_active": active_flag(is_active_value(values["is_active"]))}
+    return values
+
+
 user_repo = UserRepository(User)
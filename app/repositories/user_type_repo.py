@@ -1,17 +1,26 @@
 import uuid
-from typing import List
+from typing import Any, Dict, List
+from app.models.user_model import User
 from app.models.user_type_model import UserType
 from commonLib.repositories.repository_class import Base
 from app.schemas.user_type_schema import UserTypeCreate, UserTypeUpdate
+from sqlalchemy import exists
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
 class UserTypeRepository(Base[UserType]):
     def get_by_name(self, db: Session, *, name: str) -> UserType:
-        return db.query(UserType).filter(UserType.name == name).first()
+        return self.get_by_field(db, field_name="name", field_value=name)
+
+    async def aget_by_name(self, db: AsyncSession, *, name: str) -> UserType:
+        return await self.aget_by_field(db, field_name="name", field_value=name)
 
     def get_by_id(self, db: Session, *, id: int) -> UserType:
-        return db.query(UserType).filter(UserType.id == id).first()
+        return self.get(db, id)
+
+    def has_users(self, db: Session, *, id: str) -> bool:
+        return db.query(exists().where(User.user_type_id == id)).scalar()
 
     def create(self, db: Session, *, obj_in: UserType) -> UserType:
         db_obj = UserType(id=str(uuid.uuid4()), name=str(obj_in.name))
@@ -20,5 +29,9 @@ class UserTypeRepository(Base[UserType]):
         db.refresh(db_obj)
         return db_obj
 
+    def _prepare_row(self, obj_in: UserTypeCreate) -> Dict[str, Any]:
+        return dict(id=str(uuid.uuid4()), name=str(obj_in.name))
+
 
+# No read-through cache: reads go through user_type_registry instead.
 user_type_repo = UserTypeRepository(UserType)
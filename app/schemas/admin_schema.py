@@ -0,0 +1,17 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class BulkImportResult(BaseModel):
+    created: int
+    ids: List[str]
+
+
+class RefPool(BaseModel):
+    reserved: int
+    available: int
+
+
+class RefPoolStatus(BaseModel):
+    available: int
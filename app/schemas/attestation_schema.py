@@ -27,6 +27,7 @@ class AttestationCreate(AttestationBase):
     user_id: str
 
 class AttestationInResponse(AttestationCreate):
-    pass
+    signature_url: Optional[str] = None
+    stamp_url: Optional[str] = None
 
 
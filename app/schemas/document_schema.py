@@ -1,6 +1,6 @@
 import datetime
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class DocumentBase(BaseModel):
@@ -9,15 +9,48 @@ class DocumentBase(BaseModel):
     document_data: dict
 
 
+class DocumentImport(DocumentBase):
+    user_id: str
+
+
 class DocumentInResponse(DocumentBase):
     id: str
     user_id: str
     document_ref: Optional[str]
     created_at: datetime.datetime
     qr_code:Optional[str]
+    qr_code_url:Optional[str] = None
     status:str
 
 
+class DocumentSummary(BaseModel):
+    id: str
+    template_name: str
+    status: str
+    document_ref: Optional[str]
+    created_at: datetime.datetime
+
+
+class DocumentFields(BaseModel):
+    """The columns picked with ``fields=``, whichever they are."""
+
+    model_config = ConfigDict(extra="allow")
+
+
+DOCUMENT_FIELDS = (
+    "id",
+    "template_name",
+    "status",
+    "document_ref",
+    "created_at",
+    "user_id",
+    "document",
+    "document_data",
+    "qr_code",
+)
+DOCUMENT_SUMMARY_FIELDS = tuple(DocumentSummary.model_fields)
+
+
 class DocumentCreate(BaseModel):
     document: str
     document_ref: Optional[str]
@@ -59,3 +92,50 @@ class AttestDocument(BaseModel):
     document: str
 class AttestDocumentCreate(AttestDocument):
     commissioner_id:str
+
+
+class DocumentExport(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    user_id: str
+    template_name: str
+    status: str
+    document_ref: Optional[str]
+    document: str
+    document_data: dict
+    created_at: datetime.datetime
+    updated_at: Optional[datetime.datetime]
+
+
+class AttestedDocumentExport(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    document_ref: str
+    document: str
+    commissioner_id: str
+    created_at: datetime.datetime
+
+
+class DocumentVerification(BaseModel):
+    """What a verifier sees after scanning an affidavit's QR code."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    ref: str
+    status: str
+    attested_at: Optional[datetime.datetime]
+    commissioner: Optional[str]
+
+
+class SignedDocumentVerification(DocumentVerification):
+    # A JWT over the other fields plus iat/exp, so a printed or forwarded
+    # record can be checked against the key served at /verify/signing-key.
+    signature: str
+
+
+class VerificationKey(BaseModel):
+    algorithm: str
+    key_id: str
+    public_key: str
@@ -1,14 +1,32 @@
+import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator, validator
 
 from app.schemas.user_type_schema import UserTypeInDB
 from commonLib.models.base_class import Base
+from commonLib.schemas.response_model import CursorPage
 
 
 from app.core.services.validators import phone as phone_validators
 
 
+# user.is_active is a String column. Depending on the driver and the code
+# path that wrote it, an active user holds one of these, in any case.
+ACTIVE_VALUES = ("true", "t", "1")
+
+
+def is_active_value(value) -> bool:
+    """Read a user.is_active column value; "false" is a truthy string."""
+    return value is not None and str(value).lower() in ACTIVE_VALUES
+
+
+def active_flag(active: bool) -> str:
+    """The value written to user.is_active. Always a string, since asyncpg
+    will not bind a bool to a String column."""
+    return "true" if active else "false"
+
+
 class User(BaseModel):
     first_name: str
     last_name: str
@@ -60,12 +78,47 @@ class UserInResponse(User):
     user_type: UserTypeInDB
 
 
+class UserPage(CursorPage[UserInResponse]):
+    # Only filled in when the caller asks for it; counting costs a query.
+    total: Optional[int] = None
+
+
+class UserExport(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    first_name: str
+    last_name: str
+    email: str
+    is_active: Optional[bool]
+    user_type_id: str
+    created_at: datetime.datetime
+    updated_at: Optional[datetime.datetime]
+
+
 class SlimUserInResponse(BaseModel):
     id: str
     email: EmailStr
     user_type: UserTypeInDB
 
 
+class Principal(BaseModel):
+    """The slice of a user that authentication and permission checks need."""
+
+    model_config = ConfigDict(frozen=True)
+
+    id: str
+    is_active: bool
+    user_type_id: str
+    user_type_name: str
+
+    @field_validator("is_active", mode="before")
+    @classmethod
+    def coerce_is_active(cls, value) -> bool:
+        # user.is_active is a String column, so Postgres hands back "true"/"false".
+        return is_active_value(value)
+
+
 class ResetPasswordSchema(BaseModel):
     token: str
     password: str
@@ -0,0 +1,72 @@
+"""
+Import-time report and budget check for app.main.
+
+Imports the app in fresh interpreters under ``python -X importtime``, prints
+the slowest modules, and exits non-zero if the median import exceeds the
+budget or if a module that should load lazily was imported at startup:
+
+    python -m benchmarks.bench_import_time --budget-ms 2500
+
+tests/test_import_time.py runs it with the same budget, so an import-time
+regression fails the test suite.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Loaded on first use only: QR rendering and password hashing run in worker
+# processes, so the web process should never pay for these.
+DEFERRED_MODULES = ("qrcode", "PIL", "passlib")
+
+
+def import_profile() -> Dict[str, Tuple[int, int]]:
+    """module -> (self us, cumulative us) for one fresh ``import app.main``."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    profile = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header row
+        profile[module.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def main(args: argparse.Namespace) -> int:
+    profiles = [import_profile() for _ in range(args.samples)]
+    totals_ms = [profile["app.main"][1] / 1000 for profile in profiles]
+    median_ms = statistics.median(totals_ms)
+
+    slowest = sorted(profiles[-1].items(), key=lambda item: item[1][0], reverse=True)
+    print("slowest modules by self time (last sample):")
+    for module, (self_us, cumulative_us) in slowest[: args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {cumulative_us / 1000:8.1f} ms  {module}")
+    print(f"import app.main: median {median_ms:.1f} ms over {args.samples} runs")
+
+    failures: List[str] = []
+    if median_ms > args.budget_ms:
+        failures.append(f"median import {median_ms:.1f} ms exceeds {args.budget_ms} ms")
+    eager = sorted(
+        {module.split(".")[0] for module in profiles[-1]} & set(DEFERRED_MODULES)
+    )
+    if eager:
+        failures.append("imported at startup: " + ", ".join(eager))
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=2500)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    sys.exit(main(parser.parse_args()))
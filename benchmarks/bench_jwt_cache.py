@@ -0,0 +1,49 @@
+"""
+Per-request JWT verification cost with and without the verified-token cache.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_jwt_cache [iterations]
+"""
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+
+import jwt
+
+from app.core.services.jwt import (
+    JWT_ALGORITHM,
+    SECRET_KEY,
+    decode_token,
+    get_id_from_token,
+    verified_token_cache,
+)
+
+
+def make_token() -> str:
+    now = datetime.now()
+    payload = {
+        "id": str(uuid.uuid4()),
+        "iat": now.timestamp(),
+        "exp": (now + timedelta(hours=1)).timestamp(),
+    }
+    return jwt.encode(payload=payload, key=str(SECRET_KEY), algorithm=JWT_ALGORITHM)
+
+
+def main(iterations: int) -> None:
+    token = make_token()
+    verified_token_cache.clear()
+    get_id_from_token(token)
+
+    uncached = timeit.timeit(lambda: decode_token(token), number=iterations)
+    cached = timeit.timeit(lambda: get_id_from_token(token), number=iterations)
+
+    print(f"iterations:      {iterations}")
+    print(f"uncached decode: {uncached / iterations * 1e6:8.2f} us/request")
+    print(f"cached lookup:   {cached / iterations * 1e6:8.2f} us/request")
+    print(f"speedup:         {uncached / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,84 @@
+"""
+Latency of a non-login endpoint while /auth/login is being flooded.
+
+Point it at a running server and an existing account:
+
+    python -m benchmarks.bench_login_flood --base-url http://localhost:8000 \\
+        --email user@example.com --password secret
+
+It first measures GET /user_type/ on an idle server, then again while
+--concurrency clients hammer /auth/login. With password hashing in the
+worker pool the probe percentiles should barely move; surplus logins are
+rejected with 503 instead of queueing.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from typing import List
+
+import httpx
+
+from app.core.settings.config import settings
+
+
+async def probe(client: httpx.AsyncClient, url: str, samples: int) -> List[float]:
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        response = await client.get(url)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def flood(
+    client: httpx.AsyncClient, url: str, body: dict, stop: asyncio.Event, statuses: Counter
+) -> None:
+    while not stop.is_set():
+        response = await client.post(url, json=body)
+        statuses[response.status_code] += 1
+
+
+def report(label: str, latencies: List[float]) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<14} p50={statistics.median(ordered) * 1000:7.1f}ms "
+        f"p95={p95 * 1000:7.1f}ms max={ordered[-1] * 1000:7.1f}ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    prefix = args.base_url.rstrip("/") + settings.API_URL_PREFIX
+    probe_url = f"{prefix}/user_type/"
+    login_url = f"{prefix}/auth/login"
+    body = {"email": args.email, "password": args.password}
+
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        report("idle", await probe(client, probe_url, args.samples))
+
+        stop = asyncio.Event()
+        statuses: Counter = Counter()
+        flooders = [
+            asyncio.create_task(flood(client, login_url, body, stop, statuses))
+            for _ in range(args.concurrency)
+        ]
+        await asyncio.sleep(1)
+        report("login flood", await probe(client, probe_url, args.samples))
+        stop.set()
+        await asyncio.gather(*flooders)
+
+    print("login responses:", dict(statuses))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--samples", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
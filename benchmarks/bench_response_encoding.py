@@ -0,0 +1,95 @@
+"""
+Encode time per /document/my_documents response for each serialization path.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_response_encoding --page-size 20 --page-size 100
+
+Paths compared, all producing the same JSON body:
+  jsonable_encoder + json     route without response_model, JSONResponse
+  jsonable_encoder + orjson   route without response_model, ORJSONResponse
+  response_model + orjson     FastAPI re-validates and serializes the model
+  precompiled serializer      JSONSerializer.response(), as the routes now do
+"""
+import argparse
+import asyncio
+import timeit
+import uuid
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.schemas.document_schema import DocumentInResponse
+from commonLib.schemas.response_model import CursorPage
+from commonLib.schemas.serializers import JSONSerializer
+
+Page = CursorPage[DocumentInResponse]
+page_serializer = JSONSerializer(Page)
+page_field = create_response_field(name="Response_bench", type_=Page)
+
+
+def make_page(size: int) -> Page:
+    user_id = str(uuid.uuid4())
+    items = [
+        DocumentInResponse(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            document="<p>I solemnly swear...</p>",
+            template_name="affidavit",
+            document_data={
+                "deponent": f"Deponent {index}",
+                "address": {"street": f"{index} Marina Road", "city": "Lagos"},
+                "statements": [f"Statement {n}" for n in range(5)],
+            },
+            document_ref="ABCDEFGHJ",
+            created_at=datetime.now(),
+            qr_code=None,
+            qr_code_url=f"/api/objects/{uuid.uuid4().hex * 2}",
+            status="REF_ISSUED",
+        )
+        for index in range(size)
+    ]
+    return Page(items=items, next_cursor="WyIyMDI2LTAxLTAxVDAwOjAwOjAwIiwgIngiXQ")
+
+
+def encoders(page: Page, loop: asyncio.AbstractEventLoop):
+    def via_response_model():
+        content = loop.run_until_complete(
+            serialize_response(field=page_field, response_content=page, is_coroutine=True)
+        )
+        return ORJSONResponse(content).body
+
+    return {
+        "jsonable_encoder + json": lambda: JSONResponse(jsonable_encoder(page)).body,
+        "jsonable_encoder + orjson": lambda: ORJSONResponse(jsonable_encoder(page)).body,
+        "response_model + orjson": via_response_model,
+        "precompiled serializer": lambda: page_serializer.response(page).body,
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    loop = asyncio.new_event_loop()
+    try:
+        for size in args.page_size:
+            page = make_page(size)
+            print(f"page size {size}:")
+            for name, encode in encoders(page, loop).items():
+                seconds = min(
+                    timeit.repeat(encode, number=args.iterations, repeat=args.repeats)
+                )
+                print(f"  {name:<27} {seconds / args.iterations * 1e6:10.1f} us/response")
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, action="append")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    args.page_size = args.page_size or [20, 100]
+    main(args)
@@ -0,0 +1,62 @@
+"""
+Worker boot time: importing app.main, with and without the startup DDL.
+
+Each sample is a fresh interpreter, as a new uvicorn/gunicorn worker would be:
+
+    python -m benchmarks.bench_worker_boot --database-url postgresql+psycopg2://...
+
+"import only" is what a worker pays now. "import + create_all" adds the
+Base.metadata.create_all(checkfirst) that app.main used to run on import, which
+inspects every table over the network before the worker can serve. With the
+default in-memory SQLite the second figure is only a lower bound.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+CHILD = """
+import time
+started = time.perf_counter()
+import app.main
+{ddl}
+print(time.perf_counter() - started)
+"""
+
+CREATE_ALL = """
+from sqlalchemy import create_engine
+from app.database.base import Base
+Base.metadata.create_all(bind=create_engine({url!r}))
+"""
+
+
+def boot_times(code: str, samples: int) -> list:
+    times = []
+    for _ in range(samples):
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return times
+
+
+def main(args: argparse.Namespace) -> None:
+    variants = {
+        "import only": CHILD.format(ddl=""),
+        "import + create_all": CHILD.format(
+            ddl=CREATE_ALL.format(url=args.database_url)
+        ),
+    }
+    for name, code in variants.items():
+        times = boot_times(code, args.samples)
+        print(
+            f"{name:<20} median {statistics.median(times) * 1e3:8.1f} ms"
+            f"   max {max(times) * 1e3:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--samples", type=int, default=10)
+    main(parser.parse_args())
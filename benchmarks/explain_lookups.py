@@ -0,0 +1,135 @@
+"""
+Check that the lookups the routes depend on are served by an index.
+
+Calls the repository methods the routes use, records the SQL they send, and
+runs EXPLAIN on every SELECT among it against the given database, which must
+already have the schema. Exits non-zero if any of them falls back to a full
+table scan:
+
+    python -m benchmarks.explain_lookups --database-url postgresql+asyncpg://...
+
+Because the statements are captured from the repositories rather than
+written out here, a change to a repository query is checked as it ships.
+On Postgres sequential scans are disabled for the session first, so a plan
+that still contains one means no index can serve the query at all, however
+small the table. The default is a throwaway in-memory SQLite database built
+from the models.
+"""
+import argparse
+import asyncio
+import datetime
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from app.database.base import Base
+from app.repositories.attesatation_repo import attestation_repo
+from app.repositories.document_repo import document_repo
+from app.repositories.user_repo import user_repo
+
+Lookup = Callable[[AsyncSession], Awaitable[Any]]
+
+AFTER = (datetime.datetime(2026, 1, 1), "id")
+
+LOOKUPS: Dict[str, Lookup] = {
+    "documents by user, newest first (/document/my_documents)": lambda db: (
+        document_repo.aget_page_by_user(db, user_id="user", limit=20, after=AFTER)
+    ),
+    "document by ref (/document/search_by_ref)": lambda db: (
+        document_repo.aget_by_ref(db, ref="REF")
+    ),
+    "verification record by ref (/verify/{ref})": lambda db: (
+        document_repo.aget_verification(db, ref="REF")
+    ),
+    "attestation record by ref (/document/attest_document)": lambda db: (
+        document_repo.aget_attested_document(db, document_ref="REF")
+    ),
+    "attestation by user (/attestation)": lambda db: (
+        attestation_repo.aget_by_field(db, field_name="user_id", field_value="user")
+    ),
+    "user by email (/auth/login)": lambda db: (
+        user_repo.aget_by_email(db, email="a@example.com")
+    ),
+    "users of a type, newest first (/admin/users)": lambda db: user_repo.aget_page(
+        db, filters=user_repo.listing_filters(user_type_id="type"), limit=20, after=AFTER
+    ),
+}
+
+
+async def capture(
+    connection: AsyncConnection, lookup: Lookup
+) -> List[Tuple[str, Any]]:
+    """The SELECT statements ``lookup`` sends, with their parameters."""
+    statements: List[Tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(connection.sync_connection, "before_cursor_execute", record)
+    try:
+        async with AsyncSession(bind=connection) as db:
+            await lookup(db)
+    finally:
+        event.remove(connection.sync_connection, "before_cursor_execute", record)
+    return statements
+
+
+async def explain(
+    connection: AsyncConnection, statement: str, parameters: Any
+) -> List[str]:
+    if connection.dialect.name == "sqlite":
+        result = await connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + statement, parameters
+        )
+        return [row[-1] for row in result]
+    result = await connection.exec_driver_sql("EXPLAIN " + statement, parameters)
+    return [row[0] for row in result]
+
+
+def is_full_scan(dialect: str, plan: List[str]) -> bool:
+    if dialect == "sqlite":
+        return any(
+            line.startswith("SCAN ") and "INDEX" not in line for line in plan
+        )
+    return any("Seq Scan" in line for line in plan)
+
+
+async def explain_all(connection: AsyncConnection) -> Dict[str, List[List[str]]]:
+    """The plan of every SELECT each lookup sends, by lookup name. The
+    connection must already have the schema."""
+    if connection.dialect.name == "postgresql":
+        await connection.exec_driver_sql("SET enable_seqscan = off")
+    return {
+        name: [
+            await explain(connection, statement, parameters)
+            for statement, parameters in await capture(connection, lookup)
+        ]
+        for name, lookup in LOOKUPS.items()
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    engine = create_async_engine(args.database_url)
+    dialect = engine.dialect.name
+    failures: Dict[str, List[str]] = {}
+    async with engine.connect() as connection:
+        if dialect == "sqlite" and engine.url.database in (None, "", ":memory:"):
+            await connection.run_sync(Base.metadata.create_all)
+        for name, plans in (await explain_all(connection)).items():
+            for plan in plans:
+                full_scan = is_full_scan(dialect, plan)
+                print(f"{'FULL SCAN' if full_scan else 'index':<9}  {name}")
+                for line in plan:
+                    print(f"           {line}")
+                if full_scan:
+                    failures[name] = plan
+    await engine.dispose()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite://")
+    sys.exit(asyncio.run(main(parser.parse_args())))
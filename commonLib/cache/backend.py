@@ -0,0 +1,62 @@
+import abc
+from typing import Any, Hashable, Iterable, Optional
+
+
+class Cache(abc.ABC):
+    """Key-value cache with per-entry time-to-live and tag invalidation.
+
+    ``ttl`` is in seconds; ``None`` falls back to the backend's default, and a
+    backend default of ``None`` means entries only leave through eviction or
+    invalidation. Tagging an entry lets every entry derived from the same
+    source be dropped together with ``invalidate_tags``.
+
+    The ``a``-prefixed methods are for async code. Backends that never block
+    (MemoryCache) just call the sync ones; network backends override them.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        ...
+
+    @abc.abstractmethod
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        ...
+
+    @abc.abstractmethod
+    def delete(self, key: Hashable) -> None:
+        ...
+
+    @abc.abstractmethod
+    def invalidate_tags(self, *tags: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        ...
+
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        return self.get(key, default)
+
+    async def aset(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        self.set(key, value, ttl=ttl, tags=tags)
+
+    async def adelete(self, key: Hashable) -> None:
+        self.delete(key)
+
+    async def ainvalidate_tags(self, *tags: str) -> None:
+        self.invalidate_tags(*tags)
+
+    async def aclear(self) -> None:
+        self.clear()
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from commonLib.cache.backend import Cache
+
+
+class MemoryCache(Cache):
+    """Thread-safe in-process LRU whose entries also expire after a TTL.
+
+    Holds at most ``max_size`` entries, evicting the least recently used.
+    Values are stored as-is, not copied, so callers must not mutate what
+    they put in or get back.
+    """
+
+    def __init__(self, *, max_size: int, ttl: Optional[float] = None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        # key -> (expires_at, value, tags)
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], Any, Tuple[str, ...]]]" = (
+            OrderedDict()
+        )
+        self._tagged: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value, _ = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._pop(key)
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        tags = tuple(tags)
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (expires_at, value, tags)
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._pop(next(iter(self._entries)))
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def invalidate_tags(self, *tags: str) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in self._tagged.pop(tag, ()):
+                    self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tagged.clear()
+
+    def _pop(self, key: Hashable) -> None:
+        # Caller holds the lock.
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,145 @@
+import pickle
+from typing import Any, Hashable, Iterable, List, Optional
+
+from commonLib.cache.backend import Cache
+
+
+class RedisCache(Cache):
+    """Cache shared by every process pointed at the same Redis-compatible
+    server, so an invalidation in one worker is seen by all of them.
+
+    Keys live under ``namespace``; values are pickled, so only point this at
+    a server you trust. Each tag is a set of the keys tagged with it, kept
+    alive as long as its longest-lived entry (the NX/GT expiry flags need
+    Redis 7). ``client`` and ``async_client`` default to connections opened
+    from ``url`` on first use; pass them in to share a pool or to test.
+    """
+
+    def __init__(
+        self,
+        *,
+        namespace: str,
+        url: Optional[str] = None,
+        ttl: Optional[float] = None,
+        client: Any = None,
+        async_client: Any = None,
+    ) -> None:
+        self.namespace = namespace
+        self.url = url
+        self.ttl = ttl
+        self._client = client
+        self._async_client = async_client
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            # Optional dependency: only deployments with a shared cache need it.
+            import redis
+
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    @property
+    def async_client(self) -> Any:
+        if self._async_client is None:
+            import redis.asyncio
+
+            self._async_client = redis.asyncio.Redis.from_url(self.url)
+        return self._async_client
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.namespace}:v:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:t:{tag}"
+
+    def _queue_set(
+        self, pipe: Any, key: Hashable, value: Any, ttl: Optional[float], tags: Iterable[str]
+    ) -> bool:
+        ttl = self.ttl if ttl is None else ttl
+        px = int(ttl * 1000) if ttl is not None else None
+        if px is not None and px <= 0:
+            return False
+        name = self._key(key)
+        pipe.set(name, pickle.dumps(value), px=px)
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            pipe.sadd(tag_key, name)
+            if px is None:
+                pipe.persist(tag_key)
+            else:
+                pipe.pexpire(tag_key, px, nx=True)
+                pipe.pexpire(tag_key, px, gt=True)
+        return True
+
+    @staticmethod
+    def _load(raw: Optional[bytes], default: Any) -> Any:
+        return default if raw is None else pickle.loads(raw)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self._load(self.client.get(self._key(key)), default)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        pipe = self.client.pipeline()
+        if self._queue_set(pipe, key, value, ttl, tags):
+            pipe.execute()
+
+    def delete(self, key: Hashable) -> None:
+        self.client.delete(self._key(key))
+
+    def invalidate_tags(self, *tags: str) -> None:
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        if not tag_keys:
+            return
+        pipe = self.client.pipeline()
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        keys = self._tagged_keys(pipe.execute())
+        self.client.delete(*keys, *tag_keys)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.namespace}:*"))
+        if keys:
+            self.client.delete(*keys)
+
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        return self._load(await self.async_client.get(self._key(key)), default)
+
+    async def aset(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        pipe = self.async_client.pipeline()
+        if self._queue_set(pipe, key, value, ttl, tags):
+            await pipe.execute()
+
+    async def adelete(self, key: Hashable) -> None:
+        await self.async_client.delete(self._key(key))
+
+    async def ainvalidate_tags(self, *tags: str) -> None:
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        if not tag_keys:
+            return
+        pipe = self.async_client.pipeline()
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        keys = self._tagged_keys(await pipe.execute())
+        await self.async_client.delete(*keys, *tag_keys)
+
+    async def aclear(self) -> None:
+        keys = [key async for key in self.async_client.scan_iter(match=f"{self.namespace}:*")]
+        if keys:
+            await self.async_client.delete(*keys)
+
+    @staticmethod
+    def _tagged_keys(members: List[Iterable[bytes]]) -> List[bytes]:
+        return [key for keys in members for key in keys]
@@ -0,0 +1,34 @@
+from typing import Any, Dict, List, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+LineModelType = TypeVar("LineModelType", bound=BaseModel)
+
+
+def parse_ndjson(
+    body: bytes, model: Type[LineModelType]
+) -> Tuple[List[Tuple[int, LineModelType]], List[Dict[str, Any]]]:
+    """
+    Validate each non-blank line of an NDJSON body as ``model``.
+
+    Returns the parsed ``(line number, item)`` pairs and, separately, one
+    ``{"line": n, "errors": [...]}`` entry per line that failed, so callers can
+    report every bad line at once instead of stopping at the first.
+    """
+    items: List[Tuple[int, LineModelType]] = []
+    errors: List[Dict[str, Any]] = []
+    for number, line in enumerate(body.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            items.append((number, model.model_validate_json(line)))
+        except ValidationError as e:
+            # Never echo the input back: import lines can carry passwords.
+            line_errors = [
+                {key: value for key, value in error.items() if key != "input"}
+                for error in e.errors(include_url=False, include_context=False)
+            ]
+            errors.append({"line": number, "errors": line_errors})
+    return items, errors
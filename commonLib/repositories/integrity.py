@@ -0,0 +1,29 @@
+from typing import Optional
+
+from sqlalchemy import Table
+from sqlalchemy.exc import IntegrityError
+
+
+def constraint_name(error: IntegrityError) -> Optional[str]:
+    """The name of the constraint or unique index ``error`` violated, where
+    the driver reports it: psycopg2 on ``diag``, asyncpg on the exception
+    the SQLAlchemy adapter wraps. SQLite does not name it."""
+    orig = error.orig
+    name = getattr(getattr(orig, "diag", None), "constraint_name", None)
+    if name is None:
+        name = getattr(orig.__cause__, "constraint_name", None)
+    return name
+
+
+def is_unique_violation(error: IntegrityError, table: Table, name: str) -> bool:
+    """Whether ``error`` was raised by the unique index or constraint ``name``
+    on ``table``, rather than by any other constraint."""
+    reported = constraint_name(error)
+    if reported is not None:
+        return reported == name
+    # SQLite lists the columns instead: "UNIQUE constraint failed: t.a, t.b".
+    for candidate in (*table.indexes, *table.constraints):
+        if candidate.name == name:
+            columns = ", ".join(f"{table.name}.{column.name}" for column in candidate.columns)
+            return str(error.orig) == f"UNIQUE constraint failed: {columns}"
+    raise ValueError(f"{table.name} has no index or constraint {name}")
@@ -0,0 +1,44 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+Keyset = Tuple[datetime, str]
+
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """Opaque cursor for the row at keyset position (created_at, id)."""
+    payload = json.dumps([created_at.isoformat(), id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Keyset:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), str(id)
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise ValueError("invalid cursor") from e
+
+
+def keyset_before(created_at_column, id_column, keyset: Keyset) -> ColumnElement:
+    """Rows strictly after ``keyset`` when ordering by (created_at, id) descending."""
+    created_at, id = keyset
+    return or_(
+        created_at_column < created_at,
+        and_(created_at_column == created_at, id_column < id),
+    )
+
+
+def paginate(rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Split a ``limit + 1`` row fetch into the page and the next page's cursor."""
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor(last.created_at, last.id)
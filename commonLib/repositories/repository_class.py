@@ -1,33 +1,102 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from sqlalchemy.orm import Session
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Tuple,
+    Union,
+)
+from sqlalchemy import bindparam, delete, insert, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.sql.base import ExecutableOption
 from pydantic import BaseModel
 from fastapi.encoders import jsonable_encoder
+from commonLib.cache.backend import Cache
 from commonLib.models.base_class import Base as BaseDeclarativeClass
 from sqlalchemy.exc import IntegrityError
 
 ModelType = TypeVar("ModelType", bound=BaseDeclarativeClass)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+# Loader options (joinedload, selectinload, ...) that the read methods apply
+# to their query, so callers load the relationships they are about to touch
+# in the same round trip instead of one lazy load per row.
+LoaderOptions = Sequence[ExecutableOption]
+
+BULK_BATCH_SIZE = 500
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _matched(result, params: Sequence[Dict[str, Any]]) -> int:
+    # Drivers without a reliable executemany rowcount (asyncpg) may report
+    # anything for several rows; count every row then, as nothing better is
+    # known.
+    sane = len(params) == 1 or result.supports_sane_multi_rowcount()
+    if sane and result.rowcount >= 0:
+        return result.rowcount
+    return len(params)
 
 
 class Base(Generic[ModelType]):
-    def __init__(self, model: Type[ModelType]) -> None:
+    def __init__(self, model: Type[ModelType], *, cache: Optional[Cache] = None) -> None:
         self.model = model
+        # Opt-in read-through cache for get/get_by_field and their async
+        # twins, meant for lookups on unique columns. Entries hold column
+        # values only and are tagged with the row's id, so every write made
+        # through this repository drops all entries for the rows it touched.
+        # Writes that bypass the repository are not seen; only cache models
+        # that are written through it.
+        self.cache = cache
+        self._column_keys: Optional[FrozenSet[str]] = None
+
+    @property
+    def column_keys(self) -> FrozenSet[str]:
+        # Resolved on first use rather than in __init__: inspecting the mapper
+        # configures it, which needs every related model to be imported.
+        if self._column_keys is None:
+            self._column_keys = frozenset(
+                attr.key for attr in inspect(self.model).column_attrs
+            )
+        return self._column_keys
 
-    def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        return db.query(self.model).filter(self.model.id == id).first()
+    def get(
+        self, db: Session, id: Any, *, options: LoaderOptions = ()
+    ) -> Optional[ModelType]:
+        return self.get_by_field(db, field_name="id", field_value=id, options=options)
 
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        options: LoaderOptions = (),
     ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return db.query(self.model).options(*options).offset(skip).limit(limit).all()
 
-    def get_multi_by_ids(self, db: Session, *, ids: List[int]) -> List[ModelType]:
+    def get_multi_by_ids(
+        self, db: Session, *, ids: List[int], options: LoaderOptions = ()
+    ) -> List[ModelType]:
         in_condition = self.model.id.in_(ids)
-        return db.query(self.model).filter(in_condition)
+        return db.query(self.model).options(*options).filter(in_condition)
 
-    def get_all(self, db: Session) -> List[ModelType]:
-        return db.query(self.model).all()
+    def get_all(self, db: Session, *, options: LoaderOptions = ()) -> List[ModelType]:
+        return db.query(self.model).options(*options).all()
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
@@ -43,15 +112,29 @@ class Base(Generic[ModelType]):
         return db_obj
 
     def get_by_field(
-        self, db: Session, *, field_name: str, field_value: str
-    ) -> ModelType:
-        return (
+        self,
+        db: Session,
+        *,
+        field_name: str,
+        field_value: Any,
+        options: LoaderOptions = (),
+    ) -> Optional[ModelType]:
+        key = self._cache_key(field_name, field_value)
+        cache = self._cache_for(options)
+        if cache is not None:
+            row = cache.get(key)
+            if row is not None:
+                return db.merge(self._from_cached_row(row), load=False)
+        obj = (
             db.query(self.model)
+            .options(*options)
             .filter(getattr(self.model, field_name) == field_value)
             .first()
-        )   
-              
-        
+        )
+        if obj is not None and cache is not None:
+            cache.set(key, self._cached_row(obj), tags=(self._row_tag(obj.id),))
+        return obj
+
     def update(
         self,
         db: Session,
@@ -59,14 +142,7 @@ class Base(Generic[ModelType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        self._apply_update(db_obj, obj_in)
         db.add(db_obj)
         try:
             db.commit()
@@ -75,10 +151,363 @@ class Base(Generic[ModelType]):
             e.add_detail(
                 "An error occured while trying to update " + str(e.params))
             raise e
+        self._invalidate([db_obj.id])
         return db_obj
 
+    def update_by_ids(
+        self, db: Session, *, ids: Sequence[Any], obj_in: Dict[str, Any]
+    ) -> int:
+        """Set the same column values on every row in ``ids`` with a single
+        UPDATE statement. Returns the number of rows matched."""
+        if not ids:
+            return 0
+        try:
+            result = db.execute(self._update_by_ids_statement(ids, obj_in))
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            e.add_detail(
+                "An error occured while trying to update " + str(e.params))
+            raise e
+        self._invalidate(ids)
+        return result.rowcount
+
     def remove(self, db: Session, *, id: int) -> ModelType:
         obj = db.query(self.model).get(id)
         db.delete(obj)
         db.commit()
+        self._invalidate([id])
+        return obj
+
+    # Bulk variants. Each batch is one multi-row INSERT ... RETURNING (or an
+    # executemany UPDATE/DELETE) followed by one commit, so a failure part way
+    # leaves the earlier batches committed.
+
+    def create_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Iterable[Union[CreateSchemaType, Dict[str, Any]]],
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> List[ModelType]:
+        created: List[ModelType] = []
+        for batch in batched(objs_in, batch_size):
+            rows = [self._prepare_row(obj_in) for obj_in in batch]
+            try:
+                created.extend(
+                    db.scalars(insert(self.model).returning(self.model), rows).all()
+                )
+                db.commit()
+            except IntegrityError as e:
+                db.rollback()
+                e.add_detail("an error occured while trying to bulk create")
+                raise e
+        return created
+
+    def update_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Iterable[Dict[str, Any]],
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> int:
+        """Update rows by primary key; every dict must carry ``id`` plus the
+        columns to set on that row. Returns the number of rows matched; ids
+        with no row are skipped."""
+        updated = 0
+        for batch in batched(objs_in, batch_size):
+            try:
+                for statement, params in self._update_many_statements(batch):
+                    updated += _matched(db.execute(statement, params), params)
+                db.commit()
+            except IntegrityError as e:
+                db.rollback()
+                e.add_detail("An error occured while trying to bulk update")
+                raise e
+            self._invalidate([row["id"] for row in batch])
+        return updated
+
+    def remove_many(
+        self, db: Session, *, ids: Iterable[Any], batch_size: int = BULK_BATCH_SIZE
+    ) -> int:
+        removed = 0
+        for batch in batched(ids, batch_size):
+            result = db.execute(delete(self.model).where(self.model.id.in_(batch)))
+            db.commit()
+            self._invalidate(batch)
+            removed += result.rowcount
+        return removed
+
+    def _prepare_row(
+        self, obj_in: Union[CreateSchemaType, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Column values for one row of create_many. Repositories whose create()
+        fills in ids or defaults override this to do the same."""
+        if isinstance(obj_in, dict):
+            return obj_in
+        return obj_in.dict()
+
+    def _check_columns(self, rows: Sequence[Dict[str, Any]]) -> None:
+        for row in rows:
+            unknown = set(row) - self.column_keys
+            if unknown:
+                raise ValueError(
+                    f"{self.model.__name__} has no columns {', '.join(sorted(unknown))}"
+                )
+
+    def _apply_update(
+        self, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> None:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        column_keys = self.column_keys
+        for field, value in update_data.items():
+            if field in column_keys:
+                setattr(db_obj, field, value)
+
+    def _update_many_statements(
+        self, rows: Sequence[Dict[str, Any]]
+    ) -> List[Tuple[Any, List[Dict[str, Any]]]]:
+        """Core executemany UPDATEs for update_many, one per distinct set of
+        columns in ``rows``. Core rather than the ORM's bulk update, whose
+        result carries no rowcount."""
+        self._check_columns(rows)
+        table = self.model.__table__
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            columns = tuple(sorted(set(row) - {"id"}))
+            # Bound names must differ from the column names they set.
+            groups.setdefault(columns, []).append(
+                {f"_{key}": value for key, value in row.items()}
+            )
+        return [
+            (
+                update(table)
+                .where(table.c.id == bindparam("_id"))
+                .values({column: bindparam(f"_{column}") for column in columns}),
+                params,
+            )
+            for columns, params in groups.items()
+        ]
+
+    def _update_by_ids_statement(self, ids: Sequence[Any], obj_in: Dict[str, Any]):
+        self._check_columns([obj_in])
+        return (
+            update(self.model)
+            .where(self.model.id.in_(ids))
+            .values(**obj_in)
+        )
+
+    def _cache_for(self, options: LoaderOptions) -> Optional[Cache]:
+        # Cached entries hold columns only, so a read asking for relationships
+        # goes to the database.
+        return None if options else self.cache
+
+    def _cache_key(self, field_name: str, field_value: Any) -> str:
+        return f"{self.model.__tablename__}:{field_name}:{field_value}"
+
+    def _row_tag(self, id: Any) -> str:
+        return f"{self.model.__tablename__}:{id}"
+
+    def _cached_row(self, obj: ModelType) -> Dict[str, Any]:
+        return {key: getattr(obj, key) for key in self.column_keys}
+
+    def _from_cached_row(self, row: Dict[str, Any]) -> ModelType:
+        # Marked as already persisted, so merge(load=False) puts it in the
+        # session without a query.
+        obj = self.model(**row)
+        make_transient_to_detached(obj)
+        return obj
+
+    def _invalidate(self, ids: Iterable[Any]) -> None:
+        if self.cache is not None:
+            self.cache.invalidate_tags(*(self._row_tag(id) for id in ids))
+
+    async def _ainvalidate(self, ids: Iterable[Any]) -> None:
+        if self.cache is not None:
+            await self.cache.ainvalidate_tags(*(self._row_tag(id) for id in ids))
+
+    # Async counterparts of the methods above, for routes running on an
+    # AsyncSession. They must never touch unloaded relationships: under
+    # asyncio a lazy load raises instead of issuing a blocking query.
+
+    async def aget(
+        self, db: AsyncSession, id: Any, *, options: LoaderOptions = ()
+    ) -> Optional[ModelType]:
+        return await self.aget_by_field(
+            db, field_name="id", field_value=id, options=options
+        )
+
+    async def aget_multi(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        options: LoaderOptions = (),
+    ) -> List[ModelType]:
+        result = await db.execute(
+            select(self.model).options(*options).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def aget_all(
+        self, db: AsyncSession, *, options: LoaderOptions = ()
+    ) -> List[ModelType]:
+        result = await db.execute(select(self.model).options(*options))
+        return list(result.scalars().all())
+
+    async def aget_by_field(
+        self,
+        db: AsyncSession,
+        *,
+        field_name: str,
+        field_value: Any,
+        options: LoaderOptions = (),
+    ) -> Optional[ModelType]:
+        key = self._cache_key(field_name, field_value)
+        cache = self._cache_for(options)
+        if cache is not None:
+            row = await cache.aget(key)
+            if row is not None:
+                return await db.merge(self._from_cached_row(row), load=False)
+        result = await db.execute(
+            select(self.model)
+            .options(*options)
+            .filter(getattr(self.model, field_name) == field_value)
+        )
+        obj = result.scalars().first()
+        if obj is not None and cache is not None:
+            await cache.aset(key, self._cached_row(obj), tags=(self._row_tag(obj.id),))
+        return obj
+
+    async def acreate(
+        self, db: AsyncSession, *, obj_in: CreateSchemaType
+    ) -> ModelType:
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)  # type: ignore
+        db.add(db_obj)
+        try:
+            await db.commit()
+            await db.refresh(db_obj)
+        except IntegrityError as e:
+            e.add_detail(
+                "an error occured while trying to create " + str(e.params))
+            raise e
+        return db_obj
+
+    async def aupdate(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        self._apply_update(db_obj, obj_in)
+        db.add(db_obj)
+        try:
+            await db.commit()
+            await db.refresh(db_obj)
+        except IntegrityError as e:
+            e.add_detail(
+                "An error occured while trying to update " + str(e.params))
+            raise e
+        await self._ainvalidate([db_obj.id])
+        return db_obj
+
+    async def aupdate_by_ids(
+        self, db: AsyncSession, *, ids: Sequence[Any], obj_in: Dict[str, Any]
+    ) -> int:
+        if not ids:
+            return 0
+        try:
+            result = await db.execute(self._update_by_ids_statement(ids, obj_in))
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            e.add_detail(
+                "An error occured while trying to update " + str(e.params))
+            raise e
+        await self._ainvalidate(ids)
+        return result.rowcount
+
+    async def aremove(self, db: AsyncSession, *, id: Any) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        await self._ainvalidate([id])
         return obj
+
+    async def astream(
+        self, db: AsyncSession, query, *, batch_size: int = BULK_BATCH_SIZE
+    ) -> AsyncIterator[ModelType]:
+        """Yield the entities selected by ``query`` from a server-side cursor,
+        ``batch_size`` rows at a time, so memory stays flat for any table size."""
+        result = await db.stream_scalars(query.execution_options(yield_per=batch_size))
+        async for obj in result:
+            yield obj
+
+    async def acreate_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Iterable[Union[CreateSchemaType, Dict[str, Any]]],
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> List[ModelType]:
+        created: List[ModelType] = []
+        for batch in batched(objs_in, batch_size):
+            rows = await self._aprepare_rows(batch)
+            try:
+                result = await db.scalars(insert(self.model).returning(self.model), rows)
+                created.extend(result.all())
+                await db.commit()
+            except IntegrityError as e:
+                await db.rollback()
+                e.add_detail("an error occured while trying to bulk create")
+                raise e
+        return created
+
+    async def aupdate_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Iterable[Dict[str, Any]],
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> int:
+        updated = 0
+        for batch in batched(objs_in, batch_size):
+            try:
+                for statement, params in self._update_many_statements(batch):
+                    updated += _matched(await db.execute(statement, params), params)
+                await db.commit()
+            except IntegrityError as e:
+                await db.rollback()
+                e.add_detail("An error occured while trying to bulk update")
+                raise e
+            await self._ainvalidate([row["id"] for row in batch])
+        return updated
+
+    async def aremove_many(
+        self,
+        db: AsyncSession,
+        *,
+        ids: Iterable[Any],
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> int:
+        removed = 0
+        for batch in batched(ids, batch_size):
+            result = await db.execute(
+                delete(self.model).where(self.model.id.in_(batch))
+            )
+            await db.commit()
+            await self._ainvalidate(batch)
+            removed += result.rowcount
+        return removed
+
+    async def _aprepare_rows(
+        self, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        # Overridden where preparing a row needs to await (password hashing).
+        return [self._prepare_row(obj_in) for obj_in in objs_in]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Type, TypeVar, Generic
+from typing import List, Optional, Type, TypeVar, Generic
 
 
 DataModelType = TypeVar("DataModelType", bound=BaseModel)
@@ -10,3 +10,8 @@ class ResponseWrapper(Generic[DataModelType], BaseModel):
     message: str
     data: Optional[DataModelType]
     page: Optional[int]
+
+
+class CursorPage(BaseModel, Generic[DataModelType]):
+    items: List[DataModelType]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,45 @@
+from typing import Generic, Mapping, Optional, Type, TypeVar
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+SerializedType = TypeVar("SerializedType")
+
+
+class JSONSerializer(Generic[SerializedType]):
+    """
+    Encodes values of one declared type straight to JSON bytes.
+
+    The pydantic-core serializer for the type is built once, so a route that
+    returns ``serializer.response(value)`` skips FastAPI's per-request
+    re-validation of the response model and the generic jsonable_encoder walk.
+    Declare the same type as the route's response_model to keep the OpenAPI
+    schema.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, type_: Type[SerializedType]) -> None:
+        self.type = type_
+        self._adapter = TypeAdapter(type_)
+
+    def dumps(self, value: SerializedType) -> bytes:
+        return self._adapter.dump_json(value)
+
+    def response(
+        self,
+        value: SerializedType,
+        *,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Response:
+        return Response(
+            content=self.dumps(value),
+            status_code=status_code,
+            headers=headers,
+            media_type=self.media_type,
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.type!r})"
+
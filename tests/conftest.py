@@ -0,0 +1,142 @@
+import os
+import uuid
+from typing import Dict
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+# Read when the settings are first loaded: cheap hashes for the test users,
+# and a signing key for /verify records so none is generated with a warning.
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault(
+    "VERIFICATION_SIGNING_KEY",
+    Ed25519PrivateKey.generate()
+    .private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    .decode(),
+)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app.database.session as session
+from app.core.services import object_store as object_store_module
+from app.core.services.jwt import verified_token_cache
+from app.core.services.principal_cache import principal_cache
+from app.core.services.user_type_registry import user_type_registry
+from app.core.services.verification_cache import verification_cache
+from app.core.settings.config import settings
+from app.database.base import Base
+from app.database.query_counter import instrument_query_counting
+from app.main import create_application_instance
+from app.models.user_model import User
+from app.models.user_type_model import UserType
+from app.repositories.document_ref_repo import document_ref_repo
+
+
+P = settings.API_URL_PREFIX
+
+USER_TYPES = (
+    settings.REGULAR_USER_TYPE,
+    settings.SUPERUSER_USER_TYPE,
+    settings.COMMISSIONER_USER_TYPE,
+    settings.VERIFIER_USER_TYPE,
+)
+
+CACHES = (
+    principal_cache,
+    verification_cache,
+    verified_token_cache,
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def database(tmp_path, monkeypatch) -> Dict[str, str]:
+    """A fresh SQLite database per test, bound to the app's session makers,
+    with the default user types. Returns their ids by name.
+
+    The async engine is aiosqlite with no pool: the TestClient runs the app
+    on its own event loop, and pooled aiosqlite connections are tied to the
+    loop that opened them.
+    """
+    path = tmp_path / "test.db"
+    sync_engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 60}
+    )
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        poolclass=NullPool,
+        connect_args={"timeout": 60},
+    )
+    instrument_query_counting(sync_engine)
+    instrument_query_counting(async_engine.sync_engine)
+    Base.metadata.create_all(bind=sync_engine)
+    monkeypatch.setattr(session.SessionLocal, "kw", {**session.SessionLocal.kw})
+    monkeypatch.setattr(session.AsyncSessionLocal, "kw", {**session.AsyncSessionLocal.kw})
+    session.SessionLocal.configure(bind=sync_engine)
+    session.AsyncSessionLocal.configure(bind=async_engine)
+    monkeypatch.setattr(
+        object_store_module.object_store, "root", tmp_path / "object_store"
+    )
+
+    for cache in CACHES:
+        cache.clear()
+    monkeypatch.setattr(document_ref_repo, "_pool_empty_until", 0.0)
+    ids = {name: str(uuid.uuid4()) for name in USER_TYPES}
+    with session.SessionLocal() as db:
+        db.add_all(UserType(id=id, name=name) for name, id in ids.items())
+        db.commit()
+        user_type_registry.refresh(db)
+
+    yield ids
+
+    sync_engine.dispose()
+
+
+@pytest.fixture
+async def db():
+    async with session.AsyncSessionLocal() as db:
+        yield db
+
+
+@pytest.fixture
+def client(database):
+    # Per test, so the startup hooks see this test's database.
+    with TestClient(create_application_instance()) as client:
+        yield client
+
+
+def sign_up(client: TestClient, kind: str = "user_create") -> Dict[str, str]:
+    """Create a user through ``/user/<kind>`` and log in. Returns auth headers,
+    with the email alongside for tests that need to find the user."""
+    email = f"{uuid.uuid4().hex[:12]}@example.com"
+    user = {
+        "first_name": "a",
+        "last_name": "b",
+        "email": email,
+        "password": "pw",
+        "user_type": kind,
+    }
+    client.post(f"{P}/user/{kind}", json=user).raise_for_status()
+    response = client.post(f"{P}/auth/login", json={"email": email, "password": "pw"})
+    response.raise_for_status()
+    return {"Authorization": "Token " + response.json()["token"], "email": email}
+
+
+def make_superuser(headers: Dict[str, str], user_types: Dict[str, str]) -> None:
+    with session.SessionLocal() as db:
+        db.query(User).filter(User.email == headers["email"]).update(
+            {"user_type_id": user_types[settings.SUPERUSER_USER_TYPE]}
+        )
+        db.commit()
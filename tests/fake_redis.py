@@ -0,0 +1,112 @@
+import fnmatch
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class FakeRedis:
+    """Just enough of redis.Redis for RedisCache, in memory."""
+
+    def __init__(self) -> None:
+        self.values: Dict[str, Any] = {}
+        self.expires: Dict[str, float] = {}
+
+    def _live(self, name: str) -> bool:
+        expires_at = self.expires.get(name)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.values.pop(name, None)
+            self.expires.pop(name, None)
+        return name in self.values
+
+    def get(self, name: str) -> Optional[bytes]:
+        return self.values[name] if self._live(name) else None
+
+    def set(self, name: str, value: bytes, px: Optional[int] = None) -> bool:
+        self.values[name] = value
+        self.expires.pop(name, None)
+        if px is not None:
+            self.expires[name] = time.monotonic() + px / 1000
+        return True
+
+    def delete(self, *names: str) -> int:
+        deleted = 0
+        for name in names:
+            name = name.decode() if isinstance(name, bytes) else name
+            deleted += self._live(name)
+            self.values.pop(name, None)
+            self.expires.pop(name, None)
+        return deleted
+
+    def sadd(self, name: str, *members: str) -> int:
+        if not self._live(name):
+            self.values[name] = set()
+        before = len(self.values[name])
+        self.values[name].update(member.encode() for member in members)
+        return len(self.values[name]) - before
+
+    def smembers(self, name: str) -> set:
+        return set(self.values[name]) if self._live(name) else set()
+
+    def pexpire(self, name: str, ms: int, nx: bool = False, gt: bool = False) -> bool:
+        if not self._live(name):
+            return False
+        current = self.expires.get(name)
+        expires_at = time.monotonic() + ms / 1000
+        if nx and current is not None:
+            return False
+        if gt and (current is None or expires_at <= current):
+            return False
+        self.expires[name] = expires_at
+        return True
+
+    def persist(self, name: str) -> bool:
+        return self.expires.pop(name, None) is not None
+
+    def scan_iter(self, match: str = "*"):
+        for name in list(self.values):
+            if self._live(name) and fnmatch.fnmatchcase(name, match):
+                yield name.encode()
+
+    def pipeline(self) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._calls: List[Callable[[], Any]] = []
+
+    def __getattr__(self, command: str) -> Callable[..., "FakePipeline"]:
+        def queue(*args, **kwargs) -> "FakePipeline":
+            self._calls.append(lambda: getattr(self._redis, command)(*args, **kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> List[Any]:
+        calls, self._calls = self._calls, []
+        return [call() for call in calls]
+
+
+class FakeAsyncRedis:
+    """redis.asyncio.Redis over the same FakeRedis data."""
+
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+
+    async def get(self, name: str):
+        return self._redis.get(name)
+
+    async def delete(self, *names: str):
+        return self._redis.delete(*names)
+
+    async def scan_iter(self, match: str = "*"):
+        for name in self._redis.scan_iter(match):
+            yield name
+
+    def pipeline(self) -> "FakeAsyncPipeline":
+        return FakeAsyncPipeline(self._redis)
+
+
+class FakeAsyncPipeline(FakePipeline):
+    async def execute(self) -> List[Any]:
+        return FakePipeline.execute(self)
@@ -0,0 +1,57 @@
+from passlib.hash import bcrypt
+
+from app.core.settings import security
+from app.database.session import SessionLocal
+from app.repositories.user_repo import user_repo
+from tests.conftest import P, sign_up
+
+
+def test_sign_up_and_login(client):
+    headers = sign_up(client)
+    response = client.get(f"{P}/document/my_documents", headers=headers)
+    assert response.status_code == 200
+
+
+def test_login_with_wrong_password(client):
+    headers = sign_up(client)
+    response = client.post(
+        f"{P}/auth/login", json={"email": headers["email"], "password": "wrong"}
+    )
+    assert response.status_code >= 400
+
+
+def test_deactivated_user_cannot_log_in(client):
+    headers = sign_up(client)
+    with SessionLocal() as db:
+        user = user_repo.get_by_email(db, email=headers["email"])
+        user_repo.deactivate(db, db_obj=user)
+        assert user.is_active == "false"
+
+    response = client.post(
+        f"{P}/auth/login", json={"email": headers["email"], "password": "pw"}
+    )
+    assert response.status_code >= 400
+    # The token issued before deactivation stops working as well.
+    response = client.get(f"{P}/document/my_documents", headers=headers)
+    assert response.status_code >= 400
+
+
+def test_login_rehashes_a_stale_cost_without_passlib_in_the_web_process(client):
+    headers = sign_up(client)
+    stale = bcrypt.using(rounds=security.BCRYPT_ROUNDS + 1).hash("pw")
+    with SessionLocal() as db:
+        user = user_repo.get_by_email(db, email=headers["email"])
+        user_repo.update(db, db_obj=user, obj_in={"hashed_password": stale})
+
+    security.get_pwd_context.cache_clear()
+    response = client.post(
+        f"{P}/auth/login", json={"email": headers["email"], "password": "pw"}
+    )
+    assert response.status_code == 200
+    # Verifying and the rehash check both ran in the hashing pool.
+    assert security.get_pwd_context.cache_info().misses == 0
+
+    with SessionLocal() as db:
+        rehashed = user_repo.get_by_email(db, email=headers["email"]).hashed_password
+    assert rehashed != stale
+    assert rehashed.startswith(f"$2b${security.BCRYPT_ROUNDS:02d}$")
@@ -0,0 +1,157 @@
+import os
+import time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.core.services.cache import make_cache
+from app.core.settings.config import settings
+from app.models.user_type_model import UserType
+from commonLib.cache.memory import MemoryCache
+from commonLib.cache.redis_backend import RedisCache
+from commonLib.repositories.repository_class import Base
+from tests.fake_redis import FakeAsyncRedis, FakeRedis
+
+
+# Set to run the RedisCache tests against a real server instead of FakeRedis.
+REDIS_URL = os.environ.get("TEST_REDIS_URL")
+
+
+def make_redis(namespace: str = "test", **kwargs) -> RedisCache:
+    if REDIS_URL:
+        return RedisCache(namespace=namespace, url=REDIS_URL, **kwargs)
+    fake = FakeRedis()
+    return RedisCache(
+        namespace=namespace, client=fake, async_client=FakeAsyncRedis(fake), **kwargs
+    )
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    if request.param == "memory":
+        cache = MemoryCache(max_size=100)
+    else:
+        cache = make_redis()
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+def test_get_set_delete(cache):
+    assert cache.get("missing", "default") == "default"
+    cache.set("a", {"value": 1})
+    assert cache.get("a") == {"value": 1}
+    cache.delete("a")
+    assert cache.get("a") is None
+
+
+def test_entries_expire(cache):
+    cache.set("short", 1, ttl=0.05)
+    cache.set("long", 2, ttl=60)
+    time.sleep(0.1)
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_tag_invalidation(cache):
+    cache.set("row:1", "by id", tags=("user:1",))
+    cache.set("row:name", "by name", tags=("user:1", "names"))
+    cache.set("row:2", "other", tags=("user:2",))
+
+    cache.invalidate_tags("user:1")
+    assert cache.get("row:1") is None
+    assert cache.get("row:name") is None
+    assert cache.get("row:2") == "other"
+
+    cache.invalidate_tags("user:1", "never-used")
+    cache.invalidate_tags()
+
+
+def test_tag_outlives_its_shorter_entries(cache):
+    cache.set("tagged", 1, ttl=0.05, tags=("t",))
+    cache.set("tagged-longer", 2, ttl=60, tags=("t",))
+    time.sleep(0.1)
+    cache.invalidate_tags("t")
+    assert cache.get("tagged-longer") is None
+
+
+def test_clear(cache):
+    cache.set("x", 1)
+    cache.clear()
+    assert cache.get("x") is None
+
+
+@pytest.mark.anyio
+async def test_async_twins(cache):
+    await cache.aset("b", [1, 2], tags=("tb",))
+    assert await cache.aget("b") == [1, 2]
+    await cache.ainvalidate_tags("tb")
+    assert await cache.aget("b") is None
+
+    await cache.aset("c", 3)
+    await cache.adelete("c")
+    assert await cache.aget("c", "gone") == "gone"
+
+    await cache.aset("d", 4)
+    await cache.aclear()
+    assert await cache.aget("d") is None
+
+
+def test_memory_cache_evicts_least_recently_used():
+    lru = MemoryCache(max_size=2)
+    lru.set("a", 1, tags=("t",))
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    # Eviction keeps the tag index in step.
+    assert "t" in lru._tagged
+    assert len(lru) == 2
+
+
+def test_redis_namespaces_are_isolated():
+    fake = FakeRedis()
+    other = RedisCache(namespace="other", client=fake, async_client=FakeAsyncRedis(fake))
+    mine = RedisCache(namespace="mine", client=fake, async_client=FakeAsyncRedis(fake))
+    other.set("key", "theirs")
+    mine.clear()
+    assert mine.get("key") is None
+    assert other.get("key") == "theirs"
+
+
+def test_repository_read_through(cache):
+    engine = create_engine("sqlite://")
+    UserType.__table__.create(engine)
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    repo = Base(UserType, cache=cache)
+    with Session(engine) as db:
+        db.add(UserType(id="t1", name="REGULAR"))
+        db.commit()
+
+    for lookup in (
+        lambda db: repo.get(db, "t1"),
+        lambda db: repo.get_by_field(db, field_name="name", field_value="REGULAR"),
+    ):
+        with Session(engine) as db:
+            assert lookup(db).name == "REGULAR"
+        queries.clear()
+        with Session(engine) as db:
+            user_type = lookup(db)
+            assert user_type.name == "REGULAR"
+            assert user_type in db
+        assert queries == []
+
+    with Session(engine) as db:
+        repo.update(db, db_obj=repo.get(db, "t1"), obj_in={"name": "RENAMED"})
+    with Session(engine) as db:
+        assert repo.get(db, "t1").name == "RENAMED"
+        assert repo.get_by_field(db, field_name="name", field_value="REGULAR") is None
+
+
+def test_make_cache_rejects_unknown_backends(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memcached")
+    with pytest.raises(ValueError, match="memcached"):
+        make_cache("test", max_size=1)
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+import app.database.session as session
+import app.repositories.document_ref_repo as document_ref_repo_module
+from app.api.routers import document_route
+from app.core.services.document_refs import ALPHABET, generate_ref, is_valid_ref
+from app.core.settings.config import settings
+from app.database.query_counter import count_queries
+from app.models.document_ref_model import DocumentRef
+from app.repositories.document_ref_repo import document_ref_repo
+from tests.conftest import P, make_superuser, sign_up
+from tests.test_documents import create_document, issue_ref, pay
+
+
+def test_check_character_catches_typos_and_swaps():
+    for _ in range(200):
+        ref = generate_ref()
+        assert is_valid_ref(ref)
+        for i, original in enumerate(ref):
+            for replacement in ALPHABET:
+                if replacement != original:
+                    assert not is_valid_ref(ref[:i] + replacement + ref[i + 1 :])
+        for i in range(len(ref) - 1):
+            swapped = ref[:i] + ref[i + 1] + ref[i] + ref[i + 2 :]
+            if swapped != ref:
+                assert not is_valid_ref(swapped)
+
+
+@pytest.mark.anyio
+async def test_concurrent_allocations_drain_the_pool_then_stay_distinct(db):
+    reserved = await document_ref_repo.areserve(db, count=20, batch_size=8, attempts=5)
+    assert reserved == 20
+    pool = set(await db.scalars(select(DocumentRef.id)))
+
+    async def allocate() -> str:
+        async with session.AsyncSessionLocal() as own_db:
+            return await document_ref_repo.aallocate(own_db, attempts=5)
+
+    refs = await asyncio.gather(*(allocate() for _ in range(40)))
+    assert None not in refs
+    assert len(set(refs)) == 40
+    assert pool <= set(refs)
+    assert all(is_valid_ref(ref) for ref in refs)
+    assert await document_ref_repo.acount_available(db) == 0
+
+
+@pytest.mark.anyio
+async def test_empty_pool_is_not_asked_again(db):
+    assert await document_ref_repo.aallocate(db, attempts=5)
+
+    # The first allocation found the pool empty; the next one only inserts.
+    with count_queries() as counter:
+        assert await document_ref_repo.aallocate(db, attempts=5)
+    assert counter.count == 1
+
+    await document_ref_repo.areserve(db, count=1, batch_size=1, attempts=5)
+    [reserved] = await db.scalars(
+        select(DocumentRef.id).where(DocumentRef.claimed_at.is_(None))
+    )
+    assert await document_ref_repo.aallocate(db, attempts=5) == reserved
+
+
+@pytest.mark.anyio
+async def test_released_ref_goes_back_to_the_pool(db):
+    ref = await document_ref_repo.aallocate(db, attempts=5)
+    await document_ref_repo.arelease(db, ref=ref)
+
+    assert await document_ref_repo.acount_available(db) == 1
+    assert await document_ref_repo.aallocate(db, attempts=5) == ref
+
+
+@pytest.mark.anyio
+async def test_reserve_redraws_when_every_draw_is_taken(db, monkeypatch):
+    taken = await document_ref_repo.aallocate(db, attempts=5)
+    fresh = generate_ref()
+    # More all-taken batches than attempts, then one fresh ref.
+    draws = iter([taken] * 10 + [fresh])
+    monkeypatch.setattr(document_ref_repo_module, "generate_ref", lambda: next(draws))
+
+    assert await document_ref_repo.areserve(db, count=1, batch_size=1, attempts=2) == 1
+    assert await document_ref_repo.acount_available(db) == 1
+
+
+def test_lost_race_returns_the_ref_and_drops_the_qr_code(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "BINARY_STORAGE_MODE", "object_store")
+
+    async def lost_race(*args, **kwargs):
+        return None
+
+    # As if another request issued a ref between the checks and the UPDATE.
+    monkeypatch.setattr(document_route.document_repo, "aissue_ref", lost_race)
+    headers = sign_up(client)
+    document_id = create_document(client, headers)["id"]
+    pay(client, headers, document_id).raise_for_status()
+
+    response = issue_ref(client, headers, document_id)
+    assert response.status_code == 409
+
+    with session.SessionLocal() as db:
+        [row] = db.scalars(select(DocumentRef)).all()
+        assert row.claimed_at is None
+    stored = tmp_path / "object_store"
+    assert not any(path.is_file() for path in stored.rglob("*"))
+
+
+def test_admin_reserves_and_reads_the_pool(client, database):
+    admin = sign_up(client)
+    make_superuser(admin, database)
+
+    response = client.post(
+        f"{P}/admin/document_refs/reserve", params={"count": 3}, headers=admin
+    )
+    assert response.json() == {"reserved": 3, "available": 3}
+    response = client.get(f"{P}/admin/document_refs", headers=admin)
+    assert response.json() == {"available": 3}
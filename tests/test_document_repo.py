@@ -0,0 +1,108 @@
+import asyncio
+import uuid
+from collections import Counter
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+import app.database.session as session
+
+from app.models.attested_document_model import AttestedDocuments
+from app.models.document_model import Document, DocumentStatus
+from app.repositories.document_repo import document_repo
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def add_document(db, status=DocumentStatus.REF_ISSUED, ref="REF1") -> Document:
+    document = Document(
+        id=str(uuid.uuid4()),
+        template_name="t",
+        document="<p>x</p>",
+        document_data={},
+        user_id="user",
+        status=status.value,
+        document_ref=ref,
+    )
+    db.add(document)
+    await db.commit()
+    return document
+
+
+async def test_aattest(db):
+    document = await add_document(db)
+
+    attested = await document_repo.aattest(
+        db, document_ref="REF1", document="<p>signed</p>", commissioner_id="c"
+    )
+    assert attested.id == document.id
+    assert attested.status == DocumentStatus.ATTESTED.value
+    record = await document_repo.aget_attested_document(db, document_ref="REF1")
+    assert record.commissioner_id == "c"
+
+
+async def test_aattest_loses_to_an_existing_attestation_record(db):
+    await add_document(db)
+    # As if a concurrent request recorded its attestation first.
+    db.add(
+        AttestedDocuments(
+            id=str(uuid.uuid4()),
+            document_ref="REF1",
+            document="d",
+            commissioner_id="c1",
+        )
+    )
+    await db.commit()
+
+    attested = await document_repo.aattest(
+        db, document_ref="REF1", document="d", commissioner_id="c2"
+    )
+    assert attested is None
+    db.expunge_all()
+    document = await document_repo.aget_by_ref(db, ref="REF1")
+    assert document.status == DocumentStatus.REF_ISSUED.value
+
+
+async def test_aattest_reraises_other_integrity_errors(db):
+    await add_document(db)
+
+    with pytest.raises(IntegrityError):
+        await document_repo.aattest(
+            db, document_ref="REF1", document="d", commissioner_id=None
+        )
+
+
+async def test_aattest_needs_an_issued_ref(db):
+    await add_document(db, status=DocumentStatus.PAID)
+
+    attested = await document_repo.aattest(
+        db, document_ref="REF1", document="d", commissioner_id="c"
+    )
+    assert attested is None
+
+
+async def test_concurrent_attestations_have_one_winner(db):
+    # Each attempt on its own session and connection, as concurrent requests.
+    await add_document(db)
+
+    async def attempt(number: int) -> str:
+        async with session.AsyncSessionLocal() as own_db:
+            attested = await document_repo.aattest(
+                own_db,
+                document_ref="REF1",
+                document=f"attested by commissioner {number}",
+                commissioner_id=f"commissioner-{number}",
+            )
+        return "attested" if attested else "rejected"
+
+    outcomes = Counter(await asyncio.gather(*(attempt(n) for n in range(20))))
+    assert outcomes == {"attested": 1, "rejected": 19}
+
+    records = await db.scalar(
+        select(func.count()).where(AttestedDocuments.document_ref == "REF1")
+    )
+    assert records == 1
+    status = await db.scalar(select(Document.status).where(Document.document_ref == "REF1"))
+    assert status == DocumentStatus.ATTESTED.value
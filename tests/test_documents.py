@@ -0,0 +1,172 @@
+import pytest
+
+from tests.conftest import P, sign_up
+
+
+def create_document(client, headers, n=0) -> dict:
+    response = client.post(
+        f"{P}/document/create_document",
+        json={"document": f"<p>{n}</p>", "template_name": "t", "document_data": {"n": n}},
+        headers=headers,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def my_documents(client, headers, **params):
+    return client.get(f"{P}/document/my_documents", params=params, headers=headers)
+
+
+def test_my_documents_only_lists_own_documents(client):
+    owner, other = sign_up(client), sign_up(client)
+    created = create_document(client, owner)
+    create_document(client, other)
+
+    page = my_documents(client, owner).json()
+    assert [item["id"] for item in page["items"]] == [created["id"]]
+    assert page["items"][0]["document_data"] == {"n": 0}
+    assert page["next_cursor"] is None
+
+
+def test_my_documents_fields(client):
+    headers = sign_up(client)
+    created = create_document(client, headers)
+
+    response = my_documents(client, headers, fields="id, status")
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"id": created["id"], "status": "SAVED"}]
+
+
+def test_my_documents_summary_view(client):
+    headers = sign_up(client)
+    create_document(client, headers)
+
+    item = my_documents(client, headers, view="summary").json()["items"][0]
+    assert set(item) == {"id", "template_name", "status", "document_ref", "created_at"}
+
+
+@pytest.mark.parametrize("fields", ["", ",", " , "])
+def test_my_documents_empty_fields(client, fields):
+    headers = sign_up(client)
+    create_document(client, headers)
+
+    assert my_documents(client, headers, fields=fields).status_code == 400
+
+
+def test_my_documents_unknown_fields(client):
+    response = my_documents(client, sign_up(client), fields="id,hashed_password")
+    assert response.status_code == 400
+    assert "hashed_password" in response.json()["detail"]
+
+
+def test_my_documents_invalid_cursor(client):
+    assert my_documents(client, sign_up(client), cursor="nope").status_code == 400
+
+
+def test_create_document_response(client):
+    response = client.post(
+        f"{P}/document/create_document",
+        json={"document": "<p>x</p>", "template_name": "t", "document_data": {"a": 1}},
+        headers=sign_up(client),
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {
+        "id",
+        "user_id",
+        "document",
+        "template_name",
+        "document_data",
+        "document_ref",
+        "created_at",
+        "qr_code",
+        "qr_code_url",
+        "status",
+    }
+    assert (body["status"], body["document_ref"], body["document_data"]) == (
+        "SAVED",
+        None,
+        {"a": 1},
+    )
+
+
+def pay(client, headers, document_id):
+    return client.get(
+        f"{P}/document/pay_for_document",
+        params={"document_id": document_id},
+        headers=headers,
+    )
+
+
+def issue_ref(client, headers, document_id):
+    return client.post(
+        f"{P}/document/document_ref",
+        params={"document_id": document_id},
+        headers=headers,
+    )
+
+
+def attest(client, headers, document_ref):
+    return client.post(
+        f"{P}/document/attest_document",
+        json={"document_ref": document_ref, "document": "<p>signed</p>"},
+        headers=headers,
+    )
+
+
+def test_document_lifecycle(client):
+    owner = sign_up(client)
+    commissioner = sign_up(client, "commissioner_create")
+    document_id = create_document(client, owner)["id"]
+
+    assert issue_ref(client, owner, document_id).status_code == 403
+    assert pay(client, owner, document_id).status_code == 200
+    # Paying again is a no-op, not a step back.
+    assert pay(client, owner, document_id).status_code == 200
+
+    issued = issue_ref(client, owner, document_id)
+    assert issued.status_code == 200
+    document_ref = issued.json()["document_ref"]
+    assert issued.json()["status"] == "REF_ISSUED"
+    assert issue_ref(client, owner, document_id).status_code == 403
+    assert pay(client, owner, document_id).status_code == 200
+
+    assert attest(client, commissioner, document_ref).status_code == 200
+    assert attest(client, commissioner, document_ref).status_code == 403
+    assert attest(client, commissioner, "NOSUCHREF").status_code == 404
+
+    document = client.get(
+        f"{P}/document/document", params={"document_id": document_id}, headers=owner
+    ).json()
+    assert (document["status"], document["document"]) == ("ATTESTED", "<p>signed</p>")
+
+
+def test_only_the_owner_can_issue_a_ref(client):
+    owner, other = sign_up(client), sign_up(client)
+    document_id = create_document(client, owner)["id"]
+    pay(client, owner, document_id).raise_for_status()
+
+    assert issue_ref(client, other, document_id).status_code == 403
+    assert issue_ref(client, owner, "missing").status_code == 404
+
+
+def test_update_cannot_change_status_or_ref(client):
+    headers = sign_up(client)
+    created = create_document(client, headers)
+
+    response = client.put(
+        f"{P}/document/document_update",
+        json={
+            **created,
+            "document": "<p>edited</p>",
+            "status": "ATTESTED",
+            "document_ref": "FORGED",
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert (response.json()["document"], response.json()["status"]) == (
+        "<p>edited</p>",
+        "SAVED",
+    )
+    assert response.json()["document_ref"] is None
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks import bench_import_time
+
+
+BUDGET_MS = 2500
+
+
+def test_app_imports_within_budget_without_deferred_modules():
+    # Fresh interpreters, so modules this test session already loaded do
+    # not hide a slow or eager import.
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            bench_import_time.__name__,
+            "--budget-ms",
+            str(BUDGET_MS),
+            "--samples",
+            "3",
+        ],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,13 @@
+from tests.conftest import P, make_superuser, sign_up
+
+
+def test_pool_metrics_are_for_superusers_only(client, database):
+    assert client.get(f"{P}/metrics/db-pool").status_code in (401, 403)
+    user = sign_up(client)
+    assert client.get(f"{P}/metrics/db-pool", headers=user).status_code == 403
+
+    admin = sign_up(client)
+    make_superuser(admin, database)
+    response = client.get(f"{P}/metrics/db-pool", headers=admin)
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
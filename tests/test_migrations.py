@@ -0,0 +1,43 @@
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect, text
+
+from app.database.base import Base
+from app.database.migrate import alembic_config
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'migrations.db'}"
+
+
+def test_upgrade_matches_models_and_downgrades(database_url):
+    config = alembic_config(database_url)
+    command.upgrade(config, "head")
+
+    engine = create_engine(database_url)
+    tables = set(inspect(engine).get_table_names()) - {"alembic_version"}
+    assert tables == set(Base.metadata.tables)
+    engine.dispose()
+
+    command.downgrade(config, "base")
+
+
+def test_duplicate_attestations_stop_the_unique_index(database_url):
+    config = alembic_config(database_url)
+    command.upgrade(config, "0001")
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        for id in ("a", "b"):
+            connection.execute(
+                text(
+                    "INSERT INTO attested_documents"
+                    " (id, document_ref, document, commissioner_id)"
+                    " VALUES (:id, 'REF1', 'doc', 'c')"
+                ),
+                {"id": id},
+            )
+    engine.dispose()
+
+    with pytest.raises(RuntimeError, match="REF1: 2 records"):
+        command.upgrade(config, "0002")
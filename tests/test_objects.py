@@ -0,0 +1,83 @@
+import base64
+
+import pytest
+
+from app.core.settings.config import settings
+from tests.conftest import P, sign_up
+
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 16
+
+
+@pytest.fixture(autouse=True)
+def object_store_mode(monkeypatch):
+    monkeypatch.setattr(settings, "BINARY_STORAGE_MODE", "object_store")
+
+
+def add_attestation(client, headers) -> dict:
+    response = client.post(
+        f"{P}/attestation/attestation_create",
+        json={
+            "signature": base64.b64encode(PNG).decode(),
+            "stamp": base64.b64encode(PNG + b"stamp").decode(),
+        },
+        headers=headers,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def issue_ref(client, headers) -> dict:
+    document_id = client.post(
+        f"{P}/document/create_document",
+        json={"document": "<p>x</p>", "template_name": "t", "document_data": {}},
+        headers=headers,
+    ).json()["id"]
+    client.get(
+        f"{P}/document/pay_for_document",
+        params={"document_id": document_id},
+        headers=headers,
+    ).raise_for_status()
+    response = client.post(
+        f"{P}/document/document_ref",
+        params={"document_id": document_id},
+        headers=headers,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def test_commissioner_reads_own_signature(client):
+    commissioner = sign_up(client, "commissioner_create")
+    url = add_attestation(client, commissioner)["signature_url"]
+
+    response = client.get(url, headers=commissioner)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert response.content == PNG
+
+    etag = response.headers["etag"]
+    cached = client.get(url, headers={**commissioner, "If-None-Match": etag})
+    assert cached.status_code == 304
+
+
+def test_others_cannot_read_a_signature(client):
+    url = add_attestation(client, sign_up(client, "commissioner_create"))["stamp_url"]
+
+    assert client.get(url, headers=sign_up(client)).status_code == 404
+    assert client.get(url, headers=sign_up(client, "commissioner_create")).status_code == 404
+
+
+def test_qr_code_is_visible_to_owner_and_commissioners_only(client):
+    owner = sign_up(client)
+    url = issue_ref(client, owner)["qr_code_url"]
+
+    assert client.get(url, headers=owner).status_code == 200
+    assert client.get(url, headers=sign_up(client, "commissioner_create")).status_code == 200
+    assert client.get(url, headers=sign_up(client)).status_code == 404
+
+
+def test_unknown_and_malformed_keys(client):
+    headers = sign_up(client)
+    assert client.get(f"{P}/objects/{'0' * 64}", headers=headers).status_code == 404
+    assert client.get(f"{P}/objects/not-a-key", headers=headers).status_code == 404
@@ -0,0 +1,147 @@
+"""Each route stays within its budget of SQL statements.
+
+Tables are seeded with ROWS users of one type and ROWS documents for one
+user first, so a relationship loaded once per row (an N+1) overshoots its
+budget by about that many statements instead of by one. Each route is
+called once to warm the principal and read-through caches, then measured
+on the second call. When a route legitimately needs more, raise its budget
+here in the same change.
+"""
+import sys
+import uuid
+from typing import Callable, Dict, NamedTuple
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import Response
+
+import app.database.session as session
+from app.api.middleware import QUERY_COUNT_HEADER, QueryCountMiddleware
+from app.core.settings.config import settings
+from app.main import create_application_instance
+from app.models.document_model import Document, DocumentStatus
+from app.models.user_model import User
+from tests.conftest import P, make_superuser, sign_up
+
+
+ROWS = 25
+
+
+class Route(NamedTuple):
+    budget: int
+    call: Callable[[TestClient, Dict], Response]
+
+
+ROUTES = {
+    "login": Route(
+        1,
+        lambda c, s: c.post(
+            f"{P}/auth/login", json={"email": s["user"]["email"], "password": "pw"}
+        ),
+    ),
+    "user types": Route(1, lambda c, s: c.get(f"{P}/user_type/")),
+    "users of a type": Route(
+        2, lambda c, s: c.get(f"{P}/user_type/{s['regular_type_id']}/all_users")
+    ),
+    "list users with total": Route(
+        2,
+        lambda c, s: c.get(
+            f"{P}/admin/users",
+            params={"user_type": settings.REGULAR_USER_TYPE, "include_total": True},
+            headers=s["admin"],
+        ),
+    ),
+    "my documents": Route(
+        1, lambda c, s: c.get(f"{P}/document/my_documents", headers=s["user"])
+    ),
+    "one document": Route(
+        1,
+        lambda c, s: c.get(
+            f"{P}/document/document",
+            params={"document_id": s["document_id"]},
+            headers=s["user"],
+        ),
+    ),
+    "create document": Route(
+        2,
+        lambda c, s: c.post(
+            f"{P}/document/create_document",
+            json={"document": "<p>x</p>", "template_name": "t", "document_data": {}},
+            headers=s["user"],
+        ),
+    ),
+    "get attestation": Route(
+        1,
+        lambda c, s: c.get(f"{P}/attestation/get_attestation", headers=s["commissioner"]),
+    ),
+}
+
+
+@pytest.fixture
+def counted_client(database):
+    application = create_application_instance()
+    application.add_middleware(QueryCountMiddleware, warn_above=sys.maxsize)
+    with TestClient(application) as client:
+        yield client
+
+
+@pytest.fixture
+def seeded(counted_client, database) -> Dict:
+    client = counted_client
+    user = sign_up(client)
+    commissioner = sign_up(client, "commissioner_create")
+    admin = sign_up(client)
+    make_superuser(admin, database)
+    with session.SessionLocal() as db:
+        user_id = db.query(User.id).filter(User.email == user["email"]).scalar()
+        db.add_all(
+            User(
+                id=str(uuid.uuid4()),
+                first_name="seed",
+                last_name=str(n),
+                email=f"seed{n}@example.com",
+                hashed_password="!",
+                is_active="true",
+                user_type_id=database[settings.REGULAR_USER_TYPE],
+            )
+            for n in range(ROWS)
+        )
+        db.add_all(
+            Document(
+                id=str(uuid.uuid4()),
+                template_name="affidavit",
+                document="<p>x</p>",
+                document_data={"n": n},
+                user_id=user_id,
+                status=DocumentStatus.SAVED.value,
+            )
+            for n in range(ROWS)
+        )
+        db.commit()
+    client.post(
+        f"{P}/attestation/attestation_create",
+        json={"signature": "c2ln", "stamp": "c3Rh"},
+        headers=commissioner,
+    ).raise_for_status()
+    document_id = client.post(
+        f"{P}/document/create_document",
+        json={"document": "<p>x</p>", "template_name": "t", "document_data": {}},
+        headers=user,
+    ).json()["id"]
+    return {
+        "user": user,
+        "commissioner": commissioner,
+        "admin": admin,
+        "document_id": document_id,
+        "regular_type_id": database[settings.REGULAR_USER_TYPE],
+    }
+
+
+@pytest.mark.parametrize("name", ROUTES)
+def test_route_stays_within_its_query_budget(counted_client, seeded, name):
+    route = ROUTES[name]
+    route.call(counted_client, seeded)
+    response = route.call(counted_client, seeded)
+    assert response.status_code < 400, response.text
+    count = int(response.headers[QUERY_COUNT_HEADER])
+    assert count <= route.budget, f"{name}: {count} statements (budget {route.budget})"
@@ -0,0 +1,119 @@
+import uuid
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core.services.cache import make_cache
+from app.models.user_type_model import UserType
+from app.schemas.user_type_schema import UserTypeUpdate
+from commonLib.repositories.repository_class import Base
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def repo():
+    return Base(UserType)
+
+
+@pytest.fixture
+def cached_repo():
+    return Base(UserType, cache=make_cache("test_user_type", max_size=16, ttl=60))
+
+
+async def test_acreate_and_aget(db, repo):
+    created = await repo.acreate(db, obj_in={"id": "t1", "name": "tester"})
+    assert (created.id, created.name) == ("t1", "tester")
+
+    db.expunge_all()
+    fetched = await repo.aget(db, "t1")
+    assert fetched.name == "tester"
+    assert await repo.aget(db, "missing") is None
+
+
+async def test_acreate_duplicate_raises_integrity_error(db, repo):
+    await repo.acreate(db, obj_in={"id": "t1", "name": "tester"})
+    with pytest.raises(IntegrityError):
+        await repo.acreate(db, obj_in={"id": "t2", "name": "tester"})
+
+
+async def test_aget_by_field(db, repo):
+    await repo.acreate(db, obj_in={"id": "t1", "name": "tester"})
+    assert (await repo.aget_by_field(db, field_name="name", field_value="tester")).id == "t1"
+    assert await repo.aget_by_field(db, field_name="name", field_value="nobody") is None
+
+
+async def test_aget_multi_and_aget_all(db, repo, database):
+    everything = await repo.aget_all(db)
+    assert {t.id for t in everything} == set(database.values())
+
+    first = await repo.aget_multi(db, skip=0, limit=2)
+    rest = await repo.aget_multi(db, skip=2, limit=100)
+    assert len(first) == 2
+    assert {t.id for t in first + rest} == set(database.values())
+
+
+async def test_aupdate(db, repo):
+    obj = await repo.acreate(db, obj_in={"id": "t1", "name": "tester"})
+    await repo.aupdate(db, db_obj=obj, obj_in=UserTypeUpdate(name="renamed"))
+
+    db.expunge_all()
+    assert (await repo.aget(db, "t1")).name == "renamed"
+
+
+async def test_aupdate_ignores_unknown_fields(db, repo):
+    obj = await repo.acreate(db, obj_in={"id": "t1", "name": "tester"})
+    await repo.aupdate(db, db_obj=obj, obj_in={"name": "renamed", "nope": 1})
+    assert obj.name == "renamed"
+    assert not hasattr(obj, "nope")
+
+
+async def test_aremove(db, repo):
+    await repo.acreate(db, obj_in={"id": "t1", "name": "tester"})
+    removed = await repo.aremove(db, id="t1")
+    assert removed.id == "t1"
+
+    db.expunge_all()
+    assert await repo.aget(db, "t1") is None
+
+
+async def test_aupdate_by_ids_and_aremove_many(db, repo):
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    await repo.acreate_many(
+        db, objs_in=[{"id": id, "name": f"n{n}"} for n, id in enumerate(ids)]
+    )
+
+    assert await repo.aupdate_by_ids(db, ids=ids[:1], obj_in={"name": "x"}) == 1
+    db.expunge_all()
+    assert (await repo.aget(db, ids[0])).name == "x"
+
+    assert await repo.aremove_many(db, ids=ids, batch_size=2) == 3
+    assert await repo.aget(db, ids[0]) is None
+
+
+async def test_cached_aget_sees_aupdate(db, cached_repo):
+    obj = await cached_repo.acreate(db, obj_in={"id": "t1", "name": "tester"})
+    assert (await cached_repo.aget(db, "t1")).name == "tester"
+
+    await cached_repo.aupdate(db, db_obj=obj, obj_in={"name": "renamed"})
+    db.expunge_all()
+    assert (await cached_repo.aget(db, "t1")).name == "renamed"
+
+    await cached_repo.aremove(db, id="t1")
+    db.expunge_all()
+    assert await cached_repo.aget(db, "t1") is None
+
+
+async def test_aupdate_by_ids_integrity_error_rolls_back(db, repo):
+    await repo.acreate_many(
+        db, objs_in=[{"id": "t1", "name": "one"}, {"id": "t2", "name": "two"}]
+    )
+
+    with pytest.raises(IntegrityError) as excinfo:
+        await repo.aupdate_by_ids(db, ids=["t1", "t2"], obj_in={"name": "same"})
+    assert "An error occured while trying to update" in str(excinfo.value)
+
+    # The session is usable again and nothing was changed.
+    db.expunge_all()
+    assert (await repo.aget(db, "t1")).name == "one"
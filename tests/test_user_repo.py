@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core.services.principal_cache import acache_principal, principal_cache
+from app.core.settings.config import settings
+from app.repositories.user_repo import user_repo
+from app.schemas.user_schema import UserCreate
+
+
+pytestmark = pytest.mark.anyio
+
+
+def user_create(database, email="a@example.com") -> UserCreate:
+    return UserCreate(
+        first_name="a",
+        last_name="b",
+        email=email,
+        password="pw",
+        user_type_id=database[settings.REGULAR_USER_TYPE],
+    )
+
+
+async def test_aupdate_drops_cached_principal(db, database):
+    user = await user_repo.acreate(db, obj_in=user_create(database))
+    await acache_principal(user, user_type_name=settings.REGULAR_USER_TYPE)
+
+    await user_repo.aupdate(db, db_obj=user, obj_in={"first_name": "c"})
+    assert await principal_cache.aget(user.id) is None
+
+
+async def test_failed_aupdate_keeps_cached_principal(db, database):
+    await user_repo.acreate(db, obj_in=user_create(database, "taken@example.com"))
+    user = await user_repo.acreate(db, obj_in=user_create(database))
+    principal = await acache_principal(user, user_type_name=settings.REGULAR_USER_TYPE)
+
+    with pytest.raises(IntegrityError):
+        await user_repo.aupdate(db, db_obj=user, obj_in={"email": "taken@example.com"})
+    assert await principal_cache.aget(principal.id) == principal
+
+
+async def cached_users(db, database, count: int):
+    users = []
+    for n in range(count):
+        user = await user_repo.acreate(db, obj_in=user_create(database, f"u{n}@example.com"))
+        await acache_principal(user, user_type_name=settings.REGULAR_USER_TYPE)
+        users.append(user)
+    return [user.id for user in users]
+
+
+async def test_bulk_writes_drop_cached_principals(db, database):
+    ids = await cached_users(db, database, 3)
+
+    await user_repo.aupdate_by_ids(db, ids=ids[:1], obj_in={"is_active": False})
+    await user_repo.aupdate_many(db, objs_in=[{"id": ids[1], "first_name": "c"}])
+    assert await principal_cache.aget(ids[0]) is None
+    assert await principal_cache.aget(ids[1]) is None
+    assert await principal_cache.aget(ids[2]) is not None
+
+    await user_repo.aremove_many(db, ids=ids[2:])
+    assert await principal_cache.aget(ids[2]) is None
+
+
+async def test_aupdate_many_counts_matched_rows(db, database):
+    ids = await cached_users(db, database, 2)
+
+    updated = await user_repo.aupdate_many(
+        db,
+        objs_in=[
+            {"id": ids[0], "first_name": "c"},
+            {"id": ids[1], "last_name": "d"},
+            {"id": "missing", "first_name": "e"},
+        ],
+    )
+    assert updated == 2
+    db.expunge_all()
+    assert (await user_repo.aget(db, ids[0])).first_name == "c"
+    assert (await user_repo.aget(db, ids[1])).last_name == "d"
+
+
+@pytest.mark.parametrize("value, stored", [(True, "true"), (False, "false"), ("1", "true")])
+async def test_is_active_is_written_as_a_string(db, database, value, stored):
+    user = await user_repo.acreate(db, obj_in=user_create(database))
+    assert user.is_active == "true"
+
+    await user_repo.aupdate(db, db_obj=user, obj_in={"is_active": value})
+    assert user.is_active == stored
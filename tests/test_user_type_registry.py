@@ -0,0 +1,44 @@
+import pytest
+
+from app.core.services.user_type_registry import user_type_registry
+from app.core.settings.config import settings
+from app.database.session import SessionLocal
+from app.models.user_model import User
+from app.models.user_type_model import UserType
+from tests.conftest import P, sign_up
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_lookups_come_from_the_loaded_snapshot(db, database):
+    name = settings.REGULAR_USER_TYPE
+    id = database[name]
+    assert await user_type_registry.aget_by_id(db, id) == (id, name)
+    assert await user_type_registry.aget_by_name(db, name) == (id, name)
+    assert {t.id for t in await user_type_registry.aget_all(db)} == set(database.values())
+    assert await user_type_registry.aget_by_name(db, "NOPE") is None
+
+
+async def test_type_created_elsewhere_is_found_by_id(db):
+    # The fixture just refreshed the registry, so it will not reload yet.
+    db.add(UserType(id="new", name="NEW"))
+    await db.commit()
+
+    assert await user_type_registry.aget_by_id(db, "new") == ("new", "NEW")
+    assert (await user_type_registry.aget_by_name(db, "NEW")).id == "new"
+    assert await user_type_registry.aget_by_id(db, "missing") is None
+
+
+def test_login_with_an_unknown_user_type_is_refused(client):
+    headers = sign_up(client)
+    with SessionLocal() as session:
+        session.query(User).filter(User.email == headers["email"]).update(
+            {"user_type_id": "deleted"}
+        )
+        session.commit()
+
+    response = client.post(
+        f"{P}/auth/login", json={"email": headers["email"], "password": "pw"}
+    )
+    assert response.status_code == 401
@@ -0,0 +1,66 @@
+import jwt
+
+from app.core.settings.config import settings
+from tests.conftest import P, sign_up
+from tests.test_documents import attest, create_document, issue_ref, pay
+
+
+def issued_ref(client, headers) -> str:
+    document_id = create_document(client, headers)["id"]
+    pay(client, headers, document_id).raise_for_status()
+    response = issue_ref(client, headers, document_id)
+    response.raise_for_status()
+    return response.json()["document_ref"]
+
+
+def test_verification_record_is_signed_with_the_published_key(client):
+    ref = issued_ref(client, sign_up(client))
+
+    record = client.get(f"{P}/verify/{ref}").json()
+    assert (record["ref"], record["status"], record["commissioner"]) == (
+        ref,
+        "REF_ISSUED",
+        None,
+    )
+
+    key = client.get(f"{P}/verify/signing-key").json()
+    assert key["algorithm"] == "EdDSA"
+    assert jwt.get_unverified_header(record["signature"])["kid"] == key["key_id"]
+    claims = jwt.decode(
+        record["signature"], key["public_key"], algorithms=[key["algorithm"]]
+    )
+    assert claims["exp"] - claims["iat"] == settings.VERIFICATION_SIGNATURE_TTL_SECONDS
+    assert {name: claims[name] for name in ("ref", "status", "attested_at")} == {
+        name: record[name] for name in ("ref", "status", "attested_at")
+    }
+
+
+def test_signature_is_not_an_auth_token(client):
+    ref = issued_ref(client, sign_up(client))
+    signature = client.get(f"{P}/verify/{ref}").json()["signature"]
+
+    response = client.get(
+        f"{P}/document/my_documents", headers={"Authorization": f"Token {signature}"}
+    )
+    assert response.status_code >= 400
+
+
+def test_attestation_shows_up_and_etags_revalidate(client):
+    owner, commissioner = sign_up(client), sign_up(client, "commissioner_create")
+    ref = issued_ref(client, owner)
+
+    first = client.get(f"{P}/verify/{ref}")
+    etag = first.headers["etag"]
+    revalidated = client.get(f"{P}/verify/{ref}", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+
+    attest(client, commissioner, ref).raise_for_status()
+    second = client.get(f"{P}/verify/{ref}", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.json()["status"] == "ATTESTED"
+    assert second.json()["commissioner"] == "a b"
+
+
+def test_unknown_and_malformed_refs(client):
+    assert client.get(f"{P}/verify/not-a-ref").status_code == 404
+    assert client.get(f"{P}/verify/ABCDEFGHI").status_code == 404